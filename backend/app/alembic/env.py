@@ -1,3 +1,4 @@
+import logging
 import os
 from logging.config import fileConfig
 
@@ -22,7 +23,9 @@ from app.models import SQLModel  # noqa
 from app.core.config import settings # noqa
 
 target_metadata = SQLModel.metadata
-print("target_metadata in env:", SQLModel.metadata.tables)
+logging.getLogger("alembic.env").debug(
+    "target metadata loaded tables=%s", len(target_metadata.tables)
+)
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
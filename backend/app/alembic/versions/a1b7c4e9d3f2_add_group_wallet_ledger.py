@@ -0,0 +1,58 @@
+"""Add group wallet ledger and store wallet amounts as numeric
+
+Revision ID: a1b7c4e9d3f2
+Revises: f7c3d9a1e4b8
+Create Date: 2026-10-18 18:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = 'a1b7c4e9d3f2'
+down_revision = 'f7c3d9a1e4b8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.alter_column('group_wallet', 'balance', existing_type=sa.Float(), type_=sa.Numeric(precision=12, scale=2), postgresql_using='round(balance::numeric, 2)', existing_nullable=False)
+    op.create_table('group_wallet_ledger',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('group_wallet_id', sa.Uuid(), nullable=False),
+    sa.Column('kind', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('amount', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('balance_after', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('reference_id', sa.Uuid(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['group_wallet_id'], ['group_wallet.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_group_wallet_ledger_wallet_created_at', 'group_wallet_ledger', ['group_wallet_id', 'created_at'], unique=False)
+
+    # Existing top-ups become ledger entries
+    op.execute(sa.text(
+        "INSERT INTO group_wallet_ledger (id, group_wallet_id, kind, amount, balance_after, reference_id, created_at) "
+        "SELECT gen_random_uuid(), group_wallet_id, 'topup', round(amount::numeric, 2), "
+        "sum(round(amount::numeric, 2)) OVER (PARTITION BY group_wallet_id ORDER BY topup_time, id), id, topup_time "
+        "FROM groupwallettopup"
+    ))
+    # Spends were never recorded, so one adjustment per wallet brings its
+    # ledger total to its current balance
+    op.execute(sa.text(
+        "INSERT INTO group_wallet_ledger (id, group_wallet_id, kind, amount, balance_after, created_at) "
+        "SELECT gen_random_uuid(), w.id, 'adjustment', w.balance - coalesce(l.total, 0), w.balance, now() "
+        "FROM group_wallet w LEFT JOIN (SELECT group_wallet_id, sum(amount) AS total FROM group_wallet_ledger GROUP BY group_wallet_id) l "
+        "ON l.group_wallet_id = w.id "
+        "WHERE w.balance <> coalesce(l.total, 0)"
+    ))
+    op.create_check_constraint('ck_group_wallet_balance_non_negative', 'group_wallet', 'balance >= 0')
+
+
+def downgrade():
+    op.drop_index('ix_group_wallet_ledger_wallet_created_at', table_name='group_wallet_ledger')
+    op.drop_table('group_wallet_ledger')
+    op.drop_constraint('ck_group_wallet_balance_non_negative', 'group_wallet', type_='check')
+    op.alter_column('group_wallet', 'balance', existing_type=sa.Numeric(precision=12, scale=2), type_=sa.Float(), existing_nullable=False)
@@ -0,0 +1,43 @@
+"""Add full-text and trigram search over menu items
+
+Revision ID: a9b3d6f2c8e1
+Revises: f8a2c5e1b9d3
+Create Date: 2026-10-19 01:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'a9b3d6f2c8e1'
+down_revision = 'f8a2c5e1b9d3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    # Rewrites menu_item once to fill the column in
+    op.add_column('menu_item', sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed("setweight(to_tsvector('english', coalesce(name, '')), 'A') || setweight(to_tsvector('english', coalesce(ingredients, '')), 'B') || setweight(to_tsvector('english', coalesce(description, '')), 'C')", persisted=True), nullable=True))
+
+    with op.get_context().autocommit_block():
+        op.create_index('ix_menu_item_search_vector', 'menu_item', ['search_vector'], unique=False, postgresql_using='gin', postgresql_concurrently=True)
+        op.create_index('ix_menu_item_name_trgm', 'menu_item', ['name'], unique=False, postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}, postgresql_concurrently=True)
+        # The menu tree is joined from a venue down to its items
+        op.create_index(op.f('ix_menu_venue_id'), 'menu', ['venue_id'], unique=False, postgresql_concurrently=True)
+        op.create_index(op.f('ix_menu_category_menu_id'), 'menu_category', ['menu_id'], unique=False, postgresql_concurrently=True)
+        op.create_index(op.f('ix_menu_subcategory_category_id'), 'menu_subcategory', ['category_id'], unique=False, postgresql_concurrently=True)
+        op.create_index(op.f('ix_menu_item_subcategory_id'), 'menu_item', ['subcategory_id'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(op.f('ix_menu_item_subcategory_id'), table_name='menu_item', postgresql_concurrently=True)
+        op.drop_index(op.f('ix_menu_subcategory_category_id'), table_name='menu_subcategory', postgresql_concurrently=True)
+        op.drop_index(op.f('ix_menu_category_menu_id'), table_name='menu_category', postgresql_concurrently=True)
+        op.drop_index(op.f('ix_menu_venue_id'), table_name='menu', postgresql_concurrently=True)
+        op.drop_index('ix_menu_item_name_trgm', table_name='menu_item', postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}, postgresql_concurrently=True)
+        op.drop_index('ix_menu_item_search_vector', table_name='menu_item', postgresql_using='gin', postgresql_concurrently=True)
+    op.drop_column('menu_item', 'search_vector')
@@ -0,0 +1,37 @@
+"""Add time-limited holds to event bookings
+
+Revision ID: b2c8d5f1a7e3
+Revises: a1b7c4e9d3f2
+Create Date: 2026-10-18 19:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b2c8d5f1a7e3'
+down_revision = 'a1b7c4e9d3f2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Offerings are created before anyone books them
+    op.alter_column('event_offering', 'event_booking_id', existing_type=sa.Uuid(), nullable=True)
+    op.create_check_constraint('ck_event_offering_availability_non_negative', 'event_offering', 'availability >= 0')
+    op.add_column('event_booking', sa.Column('offering_id', sa.Uuid(), nullable=True))
+    op.add_column('event_booking', sa.Column('quantity', sa.Integer(), server_default='1', nullable=False))
+    op.add_column('event_booking', sa.Column('hold_expires_at', sa.DateTime(), nullable=True))
+    op.create_foreign_key('event_booking_offering_id_fkey', 'event_booking', 'event_offering', ['offering_id'], ['id'])
+    op.create_index('ix_event_booking_held_expires_at', 'event_booking', ['hold_expires_at'], unique=False, postgresql_where=sa.text("status = 'held'"))
+
+
+def downgrade():
+    op.drop_index('ix_event_booking_held_expires_at', table_name='event_booking', postgresql_where=sa.text("status = 'held'"))
+    op.drop_constraint('event_booking_offering_id_fkey', 'event_booking', type_='foreignkey')
+    op.drop_column('event_booking', 'hold_expires_at')
+    op.drop_column('event_booking', 'quantity')
+    op.drop_column('event_booking', 'offering_id')
+    op.drop_constraint('ck_event_offering_availability_non_negative', 'event_offering', type_='check')
+    op.alter_column('event_offering', 'event_booking_id', existing_type=sa.Uuid(), nullable=False)
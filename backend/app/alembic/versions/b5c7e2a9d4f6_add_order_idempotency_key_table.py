@@ -0,0 +1,48 @@
+"""Make order idempotency keys unique across venue types
+
+Revision ID: b5c7e2a9d4f6
+Revises: a9b3d6f2c8e1
+Create Date: 2026-10-19 09:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = 'b5c7e2a9d4f6'
+down_revision = 'a9b3d6f2c8e1'
+branch_labels = None
+depends_on = None
+
+ORDER_TABLES = {'nightclub_order': 'nightclub', 'restaurant_order': 'restaurant', 'qsr_order': 'qsr'}
+
+
+def upgrade():
+    op.create_table('order_idempotency_key',
+    sa.Column('user_id', sa.Uuid(), nullable=False),
+    sa.Column('idempotency_key', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False),
+    sa.Column('venue_type', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('order_id', sa.Uuid(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user_public.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'idempotency_key')
+    )
+    # Keys already used under several venue types keep their oldest order
+    op.execute(
+        sa.text(
+            "INSERT INTO order_idempotency_key (user_id, idempotency_key, venue_type, order_id, created_at) "
+            "SELECT user_id, idempotency_key, venue_type, id, order_time FROM ("
+            + " UNION ALL ".join(
+                f"SELECT user_id, idempotency_key, '{venue_type}' AS venue_type, id, order_time FROM {table} WHERE idempotency_key IS NOT NULL"
+                for table, venue_type in ORDER_TABLES.items()
+            )
+            + ") AS keyed ORDER BY order_time "
+            "ON CONFLICT (user_id, idempotency_key) DO NOTHING"
+        )
+    )
+
+
+def downgrade():
+    op.drop_table('order_idempotency_key')
@@ -0,0 +1,53 @@
+"""Add payment webhook events and gateway retry tracking
+
+Revision ID: c3d9e6a2b8f4
+Revises: b2c8d5f1a7e3
+Create Date: 2026-10-18 21:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3d9e6a2b8f4'
+down_revision = 'b2c8d5f1a7e3'
+branch_labels = None
+depends_on = None
+
+PAYMENT_TABLES = ('payment_source_nightclub', 'payment_source_qsr', 'payment_source_restaurant', 'payment_event')
+
+
+def upgrade():
+    op.add_column('payment_event', sa.Column('retry_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('payment_event', sa.Column('last_attempt_time', sa.DateTime(), nullable=True))
+    for table in PAYMENT_TABLES:
+        op.create_unique_constraint(f'{table}_gateway_transaction_id_key', table, ['gateway_transaction_id'])
+        op.create_index(f'ix_{table}_pending_last_attempt', table, ['last_attempt_time'], unique=False, postgresql_where=sa.text("status = 'pending'"))
+
+    op.create_table('payment_webhook_event',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('gateway_event_id', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False),
+    sa.Column('source_type', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('gateway_transaction_id', sa.Uuid(), nullable=False),
+    sa.Column('status', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('received_at', sa.DateTime(), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('next_attempt_at', sa.DateTime(), nullable=False),
+    sa.Column('processed_at', sa.DateTime(), nullable=True),
+    sa.Column('outcome', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('gateway_event_id')
+    )
+    op.create_index('ix_payment_webhook_event_due', 'payment_webhook_event', ['next_attempt_at'], unique=False, postgresql_where=sa.text('processed_at IS NULL'))
+
+
+def downgrade():
+    op.drop_index('ix_payment_webhook_event_due', table_name='payment_webhook_event', postgresql_where=sa.text('processed_at IS NULL'))
+    op.drop_table('payment_webhook_event')
+    for table in PAYMENT_TABLES:
+        op.drop_index(f'ix_{table}_pending_last_attempt', table_name=table, postgresql_where=sa.text("status = 'pending'"))
+        op.drop_constraint(f'{table}_gateway_transaction_id_key', table, type_='unique')
+    op.drop_column('payment_event', 'last_attempt_time')
+    op.drop_column('payment_event', 'retry_count')
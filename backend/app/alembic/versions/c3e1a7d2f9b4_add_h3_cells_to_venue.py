@@ -0,0 +1,52 @@
+"""Add multi-resolution H3 cells to venue
+
+Revision ID: c3e1a7d2f9b4
+Revises: 15b7e49466ec
+Create Date: 2026-10-18 09:10:00.000000
+
+"""
+from alembic import op
+import h3
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3e1a7d2f9b4'
+down_revision = '15b7e49466ec'
+branch_labels = None
+depends_on = None
+
+RESOLUTIONS = (5, 7, 9)
+
+
+def upgrade():
+    for resolution in RESOLUTIONS:
+        op.add_column('venue', sa.Column(f'h3_res{resolution}', sqlmodel.sql.sqltypes.AutoString(), nullable=True))
+        op.create_index(op.f(f'ix_venue_h3_res{resolution}'), 'venue', [f'h3_res{resolution}'], unique=False)
+
+    # Backfill the cells of existing venues from their coordinates
+    connection = op.get_bind()
+    venue = sa.table(
+        'venue',
+        sa.column('id', sa.Uuid()),
+        sa.column('latitude', sa.Float()),
+        sa.column('longitude', sa.Float()),
+        *(sa.column(f'h3_res{resolution}', sa.String()) for resolution in RESOLUTIONS),
+    )
+    rows = connection.execute(sa.select(venue.c.id, venue.c.latitude, venue.c.longitude)).all()
+    for venue_id, latitude, longitude in rows:
+        connection.execute(
+            venue.update()
+            .where(venue.c.id == venue_id)
+            .values({
+                f'h3_res{resolution}': h3.geo_to_h3(latitude, longitude, resolution)
+                for resolution in RESOLUTIONS
+            })
+        )
+
+
+def downgrade():
+    for resolution in RESOLUTIONS:
+        op.drop_index(op.f(f'ix_venue_h3_res{resolution}'), table_name='venue')
+        op.drop_column('venue', f'h3_res{resolution}')
@@ -0,0 +1,30 @@
+"""Add (user_id, order_time, id) indexes for the order history
+
+Revision ID: d4e0f7b3c9a5
+Revises: c3d9e6a2b8f4
+Create Date: 2026-10-18 22:10:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4e0f7b3c9a5'
+down_revision = 'c3d9e6a2b8f4'
+branch_labels = None
+depends_on = None
+
+TABLES = ('nightclub_order', 'restaurant_order', 'qsr_order')
+
+
+def upgrade():
+    # Built concurrently so that ordering stays open meanwhile
+    with op.get_context().autocommit_block():
+        for table in TABLES:
+            op.create_index(f'ix_{table}_user_id_order_time', table, ['user_id', 'order_time', 'id'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for table in TABLES:
+            op.drop_index(f'ix_{table}_user_id_order_time', table_name=table, postgresql_concurrently=True)
@@ -0,0 +1,55 @@
+"""Add parent H3 cells and expiry indexes to carousel_poster
+
+Revision ID: d4f2b8e3a1c5
+Revises: c3e1a7d2f9b4
+Create Date: 2026-10-18 11:40:00.000000
+
+"""
+from alembic import op
+import h3
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4f2b8e3a1c5'
+down_revision = 'c3e1a7d2f9b4'
+branch_labels = None
+depends_on = None
+
+PARENT_RESOLUTIONS = (5, 6, 7, 8)
+
+
+def upgrade():
+    for resolution in PARENT_RESOLUTIONS:
+        op.add_column('carousel_poster', sa.Column(f'h3_res{resolution}', sqlmodel.sql.sqltypes.AutoString(), nullable=True))
+        op.create_index(f'ix_carousel_poster_h3_res{resolution}_expires_at', 'carousel_poster', [f'h3_res{resolution}', 'expires_at'], unique=False)
+    op.create_index('ix_carousel_poster_h3_index_expires_at', 'carousel_poster', ['h3_index', 'expires_at'], unique=False)
+
+    # Backfill the parent cells of existing posters
+    connection = op.get_bind()
+    poster = sa.table(
+        'carousel_poster',
+        sa.column('id', sa.Uuid()),
+        sa.column('h3_index', sa.String()),
+        *(sa.column(f'h3_res{resolution}', sa.String()) for resolution in PARENT_RESOLUTIONS),
+    )
+    rows = connection.execute(
+        sa.select(poster.c.id, poster.c.h3_index).where(poster.c.h3_index.is_not(None))
+    ).all()
+    for poster_id, h3_index in rows:
+        connection.execute(
+            poster.update()
+            .where(poster.c.id == poster_id)
+            .values({
+                f'h3_res{resolution}': h3.h3_to_parent(h3_index, resolution)
+                for resolution in PARENT_RESOLUTIONS
+            })
+        )
+
+
+def downgrade():
+    op.drop_index('ix_carousel_poster_h3_index_expires_at', table_name='carousel_poster')
+    for resolution in PARENT_RESOLUTIONS:
+        op.drop_index(f'ix_carousel_poster_h3_res{resolution}_expires_at', table_name='carousel_poster')
+        op.drop_column('carousel_poster', f'h3_res{resolution}')
@@ -0,0 +1,37 @@
+"""Add (created_at, id) indexes for keyset pagination
+
+Revision ID: e5a9c1f7b2d6
+Revises: d4f2b8e3a1c5
+Create Date: 2026-10-18 14:05:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5a9c1f7b2d6'
+down_revision = 'd4f2b8e3a1c5'
+branch_labels = None
+depends_on = None
+
+TABLES = ('user_public', 'user_business', 'foodcourt', 'qsr', 'restaurant', 'nightclub')
+
+
+def upgrade():
+    # Rows without created_at would fall out of the keyset order
+    for table in TABLES:
+        op.execute(
+            sa.text(f'UPDATE {table} SET created_at = COALESCE(updated_at, now()) WHERE created_at IS NULL')
+        )
+
+    # Built concurrently so that large tables stay writable meanwhile
+    with op.get_context().autocommit_block():
+        for table in TABLES:
+            op.create_index(f'ix_{table}_created_at_id', table, ['created_at', 'id'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for table in TABLES:
+            op.drop_index(f'ix_{table}_created_at_id', table_name=table, postgresql_concurrently=True)
@@ -0,0 +1,65 @@
+"""Add hourly and daily sales rollups
+
+Revision ID: e6f1a8c4d0b7
+Revises: d4e0f7b3c9a5
+Create Date: 2026-10-18 23:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = 'e6f1a8c4d0b7'
+down_revision = 'd4e0f7b3c9a5'
+branch_labels = None
+depends_on = None
+
+ORDER_TABLES = ('nightclub_order', 'restaurant_order', 'qsr_order')
+ORDER_ITEM_COLUMNS = ('nightclub_order_id', 'restaurant_order_id', 'qsr_order_id')
+
+
+def upgrade():
+    # Filled by the sales-rollups job, which rolls up every existing order
+    # on its first run
+    op.create_table('venue_sales_rollup',
+    sa.Column('venue_id', sa.Uuid(), nullable=False),
+    sa.Column('granularity', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('bucket_start', sa.DateTime(), nullable=False),
+    sa.Column('order_count', sa.Integer(), nullable=False),
+    sa.Column('revenue', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.PrimaryKeyConstraint('venue_id', 'granularity', 'bucket_start')
+    )
+    op.create_table('menu_item_sales_rollup',
+    sa.Column('venue_id', sa.Uuid(), nullable=False),
+    sa.Column('granularity', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('bucket_start', sa.DateTime(), nullable=False),
+    sa.Column('item_id', sa.Uuid(), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('revenue', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.PrimaryKeyConstraint('venue_id', 'granularity', 'bucket_start', 'item_id')
+    )
+    op.create_table('sales_rollup_watermark',
+    sa.Column('name', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('rolled_up_to', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+    # The job selects orders by order_time and joins their items
+    with op.get_context().autocommit_block():
+        for table in ORDER_TABLES:
+            op.create_index(op.f(f'ix_{table}_order_time'), table, ['order_time'], unique=False, postgresql_concurrently=True)
+        for column in ORDER_ITEM_COLUMNS:
+            op.create_index(op.f(f'ix_orderitem_{column}'), 'orderitem', [column], unique=False, postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for column in ORDER_ITEM_COLUMNS:
+            op.drop_index(op.f(f'ix_orderitem_{column}'), table_name='orderitem', postgresql_concurrently=True)
+        for table in ORDER_TABLES:
+            op.drop_index(op.f(f'ix_{table}_order_time'), table_name=table, postgresql_concurrently=True)
+    op.drop_table('sales_rollup_watermark')
+    op.drop_table('menu_item_sales_rollup')
+    op.drop_table('venue_sales_rollup')
@@ -0,0 +1,36 @@
+"""Add idempotency keys to orders and unit prices to order items
+
+Revision ID: f7c3d9a1e4b8
+Revises: e5a9c1f7b2d6
+Create Date: 2026-10-18 16:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = 'f7c3d9a1e4b8'
+down_revision = 'e5a9c1f7b2d6'
+branch_labels = None
+depends_on = None
+
+ORDER_TABLES = ('nightclub_order', 'restaurant_order', 'qsr_order')
+
+
+def upgrade():
+    for table in ORDER_TABLES:
+        op.add_column(table, sa.Column('idempotency_key', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=True))
+        op.create_unique_constraint(f'uq_{table}_user_idempotency_key', table, ['user_id', 'idempotency_key'])
+    op.add_column('orderitem', sa.Column('unit_price', sa.Float(), nullable=True))
+    # QSR orders are placed before they are paid for
+    op.alter_column('qsr_order', 'payment_id', existing_type=sa.Uuid(), nullable=True)
+
+
+def downgrade():
+    op.alter_column('qsr_order', 'payment_id', existing_type=sa.Uuid(), nullable=False)
+    op.drop_column('orderitem', 'unit_price')
+    for table in ORDER_TABLES:
+        op.drop_constraint(f'uq_{table}_user_idempotency_key', table, type_='unique')
+        op.drop_column(table, 'idempotency_key')
@@ -0,0 +1,44 @@
+"""Add live nightclub occupancy counters
+
+Revision ID: f8a2c5e1b9d3
+Revises: e6f1a8c4d0b7
+Create Date: 2026-10-18 23:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f8a2c5e1b9d3'
+down_revision = 'e6f1a8c4d0b7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('nightclub_occupancy',
+    sa.Column('nightclub_id', sa.Uuid(), nullable=False),
+    sa.Column('occupancy', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.CheckConstraint('occupancy >= 0', name='ck_nightclub_occupancy_non_negative'),
+    sa.ForeignKeyConstraint(['nightclub_id'], ['nightclub.id'], ),
+    sa.PrimaryKeyConstraint('nightclub_id')
+    )
+    # Start from the visits open now
+    op.execute(
+        sa.text(
+            "INSERT INTO nightclub_occupancy (nightclub_id, occupancy, updated_at) "
+            "SELECT nightclub_id, count(*), now() AT TIME ZONE 'utc' FROM clubvisit "
+            "WHERE exit_time IS NULL GROUP BY nightclub_id"
+        )
+    )
+
+    with op.get_context().autocommit_block():
+        op.create_index('ix_clubvisit_open_nightclub_id', 'clubvisit', ['nightclub_id'], unique=False, postgresql_where=sa.text('exit_time IS NULL'), postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_clubvisit_open_nightclub_id', table_name='clubvisit', postgresql_where=sa.text('exit_time IS NULL'), postgresql_concurrently=True)
+    op.drop_table('nightclub_occupancy')
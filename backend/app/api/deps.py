@@ -1,4 +1,5 @@
-from collections.abc import Generator
+import uuid
+from collections.abc import AsyncGenerator, Generator
 from typing import Annotated
 
 from fastapi import Depends, HTTPException, status
@@ -6,51 +7,114 @@ from fastapi.security import (
     HTTPAuthorizationCredentials,
     HTTPBearer,
 )
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy.orm.attributes import manager_of_class
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.core.db import engine
+from app.constants import PrincipalKind
+from app.core.db import get_async_session_maker, get_engine
 from app.core.security import get_jwt_payload
+from app.models.auth import CachedPrincipal, TokenModel
 from app.models.user import UserBusiness, UserPublic
+from app.services.principal_cache import get_principal_cache
 
 # OAuth2PasswordBearer to extract the token from the request header
 bearer_scheme = HTTPBearer()
 
+
 def get_db() -> Generator[Session, None, None]:
-    with Session(engine) as session:
+    with Session(get_engine()) as session:
         yield session
 
 
 SessionDep = Annotated[Session, Depends(get_db)]
 
-# Dependency to get the current user
-async def get_current_user(
-    credentials: Annotated[HTTPAuthorizationCredentials, Depends(bearer_scheme)],
-    session: SessionDep
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with get_async_session_maker()() as session:
+        yield session
+
+
+AsyncSessionDep = Annotated[AsyncSession, Depends(get_async_db)]
+
+
+def attach_cached_user(
+    session: Session, principal: CachedPrincipal
 ) -> UserPublic | UserBusiness:
-    # print('credentials.credentials ', credentials.credentials)
+    """
+    Build a persistent user instance from a cached principal without a query.
+
+    Only the primary key and the cached flags are loaded; every other column
+    is expired and lazy-loads on first access, so handlers that only check
+    the user's ID or role never touch the user tables.
+    """
+    model = UserBusiness if principal.user_type == "business" else UserPublic
+    existing = session.identity_map.get(session.identity_key(model, principal.id))
+    if existing is not None:
+        return existing
+
+    user = manager_of_class(model).new_instance()
+    user.id = principal.id
+    user.is_active = principal.is_active
+    user.is_superuser = principal.is_superuser
+    make_transient_to_detached(user)
+    session.add(user)
+    return user
+
+
+def get_token_data(credentials: HTTPAuthorizationCredentials) -> TokenModel:
+    """
+    Decode the bearer token, turning any failure into a 401.
+    """
     try:
-        print('credentials.credentials ', credentials.credentials)
         # Verify and decode the token (ensure this is as fast as possible)
-        token_data = get_jwt_payload(credentials.credentials)
-        user_id = token_data.sub
-        print('hhuuuser_id ',    user_id)
-        # Query both user types in a single call, using a union if possible
-        user = (
-            session.query(UserPublic)
-            .filter(UserPublic.id == user_id)
-            .first()
-        ) or (
-            session.query(UserBusiness)
-            .filter(UserBusiness.id == user_id)
-            .first()
+        return get_jwt_payload(credentials.credentials)
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
         )
 
-        # If no user is found or the user is inactive, raise an error
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="User not found",
-            )
+
+def load_token_user(
+    session: Session, token_data: TokenModel
+) -> UserPublic | UserBusiness:
+    """
+    Resolve the active user a decoded token belongs to.
+
+    Served from the principal cache when possible. On a miss the token's
+    ``user_type`` claim routes the lookup to the right table; tokens issued
+    before the claim existed fall back to trying both tables.
+    """
+    try:
+        user_id = token_data.sub
+
+        principal_cache = get_principal_cache()
+        principal = principal_cache.get(user_id)
+        if principal is not None:
+            user = attach_cached_user(session, principal)
+        else:
+            if token_data.user_type == PrincipalKind.PUBLIC:
+                user = session.get(UserPublic, uuid.UUID(user_id))
+            elif token_data.user_type is not None:
+                user = session.get(UserBusiness, uuid.UUID(user_id))
+            else:
+                user = (
+                    session.query(UserPublic).filter(UserPublic.id == user_id).first()
+                ) or (
+                    session.query(UserBusiness)
+                    .filter(UserBusiness.id == user_id)
+                    .first()
+                )
+
+            # If no user is found or the user is inactive, raise an error
+            if not user:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="User not found",
+                )
+            principal_cache.store(user)
+
         if not user.is_active:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -62,15 +126,43 @@ async def get_current_user(
     except Exception:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials"
+            detail="Could not validate credentials",
         )
 
+
+def require_user_type(
+    token_data: TokenModel, *allowed: PrincipalKind, detail: str
+) -> None:
+    """
+    Reject a token whose ``user_type`` claim is not one of ``allowed`` without
+    touching the database. Tokens without the claim are let through and are
+    checked against the loaded user instead.
+    """
+    if token_data.user_type is not None and token_data.user_type not in allowed:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=detail)
+
+
+# Dependency to get the current user
+async def get_current_user(
+    credentials: Annotated[HTTPAuthorizationCredentials, Depends(bearer_scheme)],
+    session: SessionDep,
+) -> UserPublic | UserBusiness:
+    return load_token_user(session, get_token_data(credentials))
+
+
 # Dependency to get the business user
 async def get_business_user(
     credentials: Annotated[HTTPAuthorizationCredentials, Depends(bearer_scheme)],
-    session: SessionDep
+    session: SessionDep,
 ) -> UserBusiness:
-    current_user = await get_current_user(credentials, session)
+    token_data = get_token_data(credentials)
+    require_user_type(
+        token_data,
+        PrincipalKind.BUSINESS,
+        PrincipalKind.SUPERUSER,
+        detail="Not a business user",
+    )
+    current_user = load_token_user(session, token_data)
     if not isinstance(current_user, UserBusiness):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -78,12 +170,22 @@ async def get_business_user(
         )
     return current_user
 
+
 # Dependency to get the superuser
 async def get_super_user(
     credentials: Annotated[HTTPAuthorizationCredentials, Depends(bearer_scheme)],
-    session: SessionDep
+    session: SessionDep,
 ) -> UserBusiness:
-    current_user = await get_business_user(credentials, session)
+    token_data = get_token_data(credentials)
+    # A business token issued before a promotion is rejected here until it is
+    # refreshed; the flag is still re-checked on the loaded user below.
+    require_user_type(token_data, PrincipalKind.SUPERUSER, detail="Not a superuser")
+    current_user = load_token_user(session, token_data)
+    if not isinstance(current_user, UserBusiness):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not a business user",
+        )
     if not current_user.is_superuser:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -91,14 +193,15 @@ async def get_super_user(
         )
     return current_user
 
+
 # Dependency to get any public user
 async def get_public_user(
     credentials: Annotated[HTTPAuthorizationCredentials, Depends(bearer_scheme)],
-    session: SessionDep
+    session: SessionDep,
 ) -> UserPublic:
-    print('credentials.credentials ', credentials.credentials)
-    current_user = await get_current_user(credentials, session)
-    # print('current_user ', current_user)
+    token_data = get_token_data(credentials)
+    require_user_type(token_data, PrincipalKind.PUBLIC, detail="Not a public user")
+    current_user = load_token_user(session, token_data)
     if not isinstance(current_user, UserPublic):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
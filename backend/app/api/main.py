@@ -1,6 +1,18 @@
 from fastapi import APIRouter
 
-from app.api.routes import carousel, login, menu, qrcode, users, venues
+from app.api.routes import (
+    analytics,
+    carousel,
+    events,
+    login,
+    menu,
+    orders,
+    payments,
+    qrcode,
+    users,
+    utils,
+    venues,
+)
 
 api_router = APIRouter()
 api_router.include_router(venues.router, prefix="/venue", tags=["venue"])
@@ -9,3 +21,8 @@ api_router.include_router(users.router, prefix="/user", tags=["user"])
 api_router.include_router(login.router, tags=["login"])
 api_router.include_router(qrcode.router, tags=["qrcode"])
 api_router.include_router(carousel.router, prefix="/carousel", tags=["carousel"])
+api_router.include_router(orders.router, prefix="/orders", tags=["orders"])
+api_router.include_router(events.router, prefix="/events", tags=["events"])
+api_router.include_router(payments.router, prefix="/payments", tags=["payments"])
+api_router.include_router(analytics.router, prefix="/analytics", tags=["analytics"])
+api_router.include_router(utils.router, prefix="/utils", tags=["utils"])
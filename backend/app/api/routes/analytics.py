@@ -0,0 +1,52 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from fastapi import APIRouter, Depends, Query
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.api.deps import get_async_db, get_business_user
+from app.constants import RollupGranularity
+from app.models.base_model import utcnow
+from app.models.user import UserBusiness
+from app.schema.analytics import SalesReport
+from app.services.analytics import sales_report
+from app.util import check_user_permission_async
+
+router = APIRouter()
+
+# Range reported when the client gives no start
+DEFAULT_SPANS = {
+    RollupGranularity.HOUR: timedelta(hours=24),
+    RollupGranularity.DAY: timedelta(days=30),
+}
+
+
+def as_naive_utc(at: datetime) -> datetime:
+    # Rollup buckets are naive UTC, like every timestamp column
+    if at.tzinfo is None:
+        return at
+    return at.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+@router.get("/venues/{venue_id}/sales", response_model=SalesReport)
+async def read_venue_sales(
+    venue_id: uuid.UUID,
+    granularity: RollupGranularity = RollupGranularity.HOUR,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    top: int = Query(10, ge=0, le=50),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserBusiness = Depends(get_business_user),
+):
+    """
+    Revenue, order count and average ticket of a venue the user manages, per
+    hour or day (UTC), with its best-selling menu items.
+    - **start**, **end**: The range to report, in UTC unless an offset is
+      given; defaults to the last 24 hours for hourly and the last 30 days
+      for daily reports
+    - **top**: How many best-selling items to list
+    """
+    await check_user_permission_async(db, current_user, venue_id)
+    end = as_naive_utc(end) if end else utcnow()
+    start = as_naive_utc(start) if start else end - DEFAULT_SPANS[granularity]
+    return await sales_report(db, venue_id, granularity, start, end, top)
@@ -1,16 +1,25 @@
-from datetime import datetime
-
-import h3
-from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session, select
-
-from app.api.deps import SessionDep, get_business_user, get_current_user, get_db
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.orm import selectinload
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.api.deps import (
+    AsyncSessionDep,
+    get_async_db,
+    get_business_user,
+    get_current_user,
+)
 from app.models.carousel_poster import CarouselPoster
 from app.models.event import Event
 from app.models.user import UserBusiness, UserPublic
 from app.models.venue import Venue
 from app.schema.carousel_poster import CarouselPosterCreate, CarouselPosterRead
-from app.util import check_user_permission, create_record, get_record_by_id
+from app.services.carousel import invalidate_posters, lookup_posters
+from app.util import (
+    cached_json_response,
+    check_user_permission_async,
+    create_record_async,
+    get_record_by_id_async,
+)
 from app.utils import get_h3_index
 
 router = APIRouter()
@@ -18,36 +27,25 @@ router = APIRouter()
 
 @router.get("/poster/", response_model=list[CarouselPosterRead])
 async def get_carousel_posters(
-    latitude: float,
-    longitude: float,
-    session: SessionDep,
-    radius: int = 3000,
+    request: Request,
+    session: AsyncSessionDep,
+    latitude: float = Query(ge=-90, le=90),
+    longitude: float = Query(ge=-180, le=180),
+    radius: int = Query(default=3000, gt=0, le=50_000),
     current_user: UserPublic = Depends(get_current_user),  # noqa: ARG001
 ):
-    user_h3_index = get_h3_index(latitude=latitude, longitude=longitude)
-
-    distance_in_km = radius / 1000
-    k_ring_size = int(distance_in_km / 1.2)
-
-    nearby_h3_indexes = h3.k_ring(user_h3_index, k_ring_size)
-
-    posters = (
-        session.execute(
-            select(CarouselPoster)
-            .where(CarouselPoster.h3_index.in_(nearby_h3_indexes))
-            .where(CarouselPoster.expires_at > datetime.now())
-        )
-        .scalars()
-        .all()
-    )
-
-    return [poster.to_read_schema() for poster in posters]
+    """
+    Live posters within ``radius`` metres of a point, cached per H3 cell and
+    radius until the first of them expires.
+    """
+    cached = await lookup_posters(session, latitude, longitude, radius)
+    return cached_json_response(request, cached)
 
 
 @router.post("/poster/", response_model=CarouselPosterRead)
 async def create_carousel_poster(
     poster: CarouselPosterCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserBusiness = Depends(get_business_user),
 ):
     print("Creating carousel poster,   poster: ", poster)
@@ -57,20 +55,25 @@ async def create_carousel_poster(
     if poster_instance.venue_id:
         print("Creating carousel poster,   venue_id: ", poster_instance.venue_id)
         try:
-            venue = get_record_by_id(db, Venue, poster_instance.venue_id)
+            venue = await get_record_by_id_async(db, Venue, poster_instance.venue_id)
         except Exception:
             raise HTTPException(status_code=404, detail="Venue not found")
         print("Creating carousel poster,   venue: ", venue)
     elif poster_instance.event_id:
         try:
-            event = db.get(poster_instance.event_id, Event)
+            event = await get_record_by_id_async(
+                db,
+                Event,
+                poster_instance.event_id,
+                options=(selectinload(Event.venue),),
+            )
         except Exception:
             raise HTTPException(status_code=404, detail="Event not found")
         venue = event.venue
     else:
         raise ValueError("Either event_id or venue_id must be provided")
 
-    check_user_permission(db, current_user, venue.id)
+    await check_user_permission_async(db, current_user, venue.id)
 
     h3_index = get_h3_index(
         latitude=venue.latitude, longitude=venue.longitude, resolution=9
@@ -78,7 +81,8 @@ async def create_carousel_poster(
 
     poster_instance.h3_index = h3_index
 
-    created_poster = create_record(db, poster_instance)
+    created_poster = await create_record_async(db, poster_instance)
+    invalidate_posters()
 
     assert isinstance(
         created_poster, CarouselPoster
@@ -0,0 +1,65 @@
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.api.deps import get_async_db, get_public_user
+from app.models.event_booking import EventBooking
+from app.models.user import UserPublic
+from app.schema.event import EventBookingRead, EventHoldCreate
+from app.services.event_booking import hold_passes, release_hold
+
+router = APIRouter()
+
+
+@router.post(
+    "/offerings/{offering_id}/holds", response_model=EventBookingRead, status_code=201
+)
+async def create_hold(
+    offering_id: uuid.UUID,
+    hold_in: EventHoldCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserPublic = Depends(get_public_user),
+):
+    """
+    Hold passes of an event offering for the current user. The passes are
+    theirs until ``hold_expires_at``; unless the booking is confirmed by
+    then, they return to sale.
+    """
+    booking = await hold_passes(db, current_user.id, offering_id, hold_in.quantity)
+    return EventBookingRead.model_validate(booking, from_attributes=True)
+
+
+@router.get("/bookings/{booking_id}", response_model=EventBookingRead)
+async def read_booking(
+    booking_id: uuid.UUID,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserPublic = Depends(get_public_user),
+):
+    """
+    Retrieve one of the current user's event bookings.
+    """
+    booking = (
+        await db.execute(
+            select(EventBooking).where(
+                EventBooking.id == booking_id, EventBooking.user_id == current_user.id
+            )
+        )
+    ).scalar_one_or_none()
+    if booking is None:
+        raise HTTPException(status_code=404, detail="Booking not found")
+    return EventBookingRead.model_validate(booking, from_attributes=True)
+
+
+@router.delete("/bookings/{booking_id}/hold", status_code=204)
+async def delete_hold(
+    booking_id: uuid.UUID,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserPublic = Depends(get_public_user),
+):
+    """
+    Give up a held booking, returning its passes to sale at once.
+    """
+    if not await release_hold(db, current_user.id, booking_id):
+        raise HTTPException(status_code=404, detail="No held booking found")
@@ -1,23 +1,27 @@
 import hashlib
+import uuid
 from datetime import datetime, timedelta, timezone
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException
 
 from app.api.deps import SessionDep, get_current_user
+from app.constants import PrincipalKind
 from app.core.security import (  # Adjust the import based on your structure
     create_access_token,
     create_refresh_token,
     get_jwt_payload,
+    get_principal_kind,
 )
 from app.models.auth import OtplessToken, RefreshTokenPayload, UserAuthResponse
 from app.models.user import UserBusiness, UserPublic  # Import your UserPublic model
+from app.services.principal_cache import get_principal_cache
 
 router = APIRouter()
 
 
 def generate_number_from_string(s):
-    return int(hashlib.sha256(s.encode()).hexdigest(), 16) % 10 ** 8
+    return int(hashlib.sha256(s.encode()).hexdigest(), 16) % 10**8
 
 
 @router.post("/verify_token/business", response_model=UserAuthResponse)
@@ -37,22 +41,26 @@ async def business_user_google_login(request: OtplessToken, session: SessionDep)
         # user_id = user_info.get("sub")  # Google user ID
 
         # Check for user by Google ID or email
-        email = request.otpless_token+ "test@gmail.com"   # Replace this with the actual email from the SDK response
+        email = (
+            request.otpless_token + "test@gmail.com"
+        )  # Replace this with the actual email from the SDK response
         user = session.query(UserBusiness).filter(UserBusiness.email == email).first()
 
         if not user:
             # Create new user if not found
-            user = UserBusiness(
-                email=email,
-                is_active=True
-            )
+            user = UserBusiness(email=email, is_active=True)
             session.add(user)
             session.commit()
             session.refresh(user)
 
         # Create tokens
-        access_token = create_access_token(subject=str(user.id), expires_delta=timedelta(minutes=30))
-        refresh_token = create_refresh_token(subject=str(user.id))
+        user_type = get_principal_kind(user)
+        access_token = create_access_token(
+            subject=str(user.id),
+            user_type=user_type,
+            expires_delta=timedelta(minutes=30),
+        )
+        refresh_token = create_refresh_token(subject=str(user.id), user_type=user_type)
 
         # Store refresh token
         user.refresh_token = refresh_token.token
@@ -62,12 +70,13 @@ async def business_user_google_login(request: OtplessToken, session: SessionDep)
         return UserAuthResponse(
             access_token=access_token,
             refresh_token=refresh_token,
-            issued_at=datetime.now(timezone.utc)
+            issued_at=datetime.now(timezone.utc),
         )
 
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+
 @router.post("/verify_token/public", response_model=UserAuthResponse)
 async def verify_token(request: OtplessToken, session: SessionDep):
     try:
@@ -84,21 +93,27 @@ async def verify_token(request: OtplessToken, session: SessionDep):
         phone_number = str(generate_number_from_string(request.otpless_token))
 
         # Check for the user by phone number
-        user = session.query(UserPublic).filter(UserPublic.phone_number == phone_number).first()
+        user = (
+            session.query(UserPublic)
+            .filter(UserPublic.phone_number == phone_number)
+            .first()
+        )
 
         if not user:
             # Create a new user if not found
-            user = UserPublic(
-                phone_number=phone_number,
-                is_active=True
-            )
+            user = UserPublic(phone_number=phone_number, is_active=True)
             session.add(user)
             session.commit()
             session.refresh(user)
 
         # Create tokens
-        access_token = create_access_token(subject=str(user.id), expires_delta=timedelta(minutes=30))
-        refresh_token = create_refresh_token(subject=str(user.id))
+        user_type = get_principal_kind(user)
+        access_token = create_access_token(
+            subject=str(user.id),
+            user_type=user_type,
+            expires_delta=timedelta(minutes=30),
+        )
+        refresh_token = create_refresh_token(subject=str(user.id), user_type=user_type)
 
         # Store the new refresh token in the user's record
         user.refresh_token = refresh_token.token
@@ -108,7 +123,7 @@ async def verify_token(request: OtplessToken, session: SessionDep):
         return UserAuthResponse(
             access_token=access_token,
             refresh_token=refresh_token,
-            issued_at=datetime.now(timezone.utc)
+            issued_at=datetime.now(timezone.utc),
         )
 
     except Exception as e:
@@ -124,16 +139,18 @@ async def refresh_token(request: RefreshTokenPayload, session: SessionDep):
         # Extract the user ID (sub) from the payload
         user_id = payload.sub
 
-        # Fetch the user from the database using the user ID
-        user = (
-            session.query(UserPublic)
-            .filter(UserPublic.id == user_id)
-            .first()
-        ) or (
-            session.query(UserBusiness)
-            .filter(UserBusiness.id == user_id)
-            .first()
-        )
+        # Fetch the user from the table named by the token's user_type claim,
+        # falling back to both tables for tokens issued without it
+        if payload.user_type == PrincipalKind.PUBLIC:
+            user = session.get(UserPublic, uuid.UUID(user_id))
+        elif payload.user_type is not None:
+            user = session.get(UserBusiness, uuid.UUID(user_id))
+        else:
+            user = (
+                session.query(UserPublic).filter(UserPublic.id == user_id).first()
+            ) or (
+                session.query(UserBusiness).filter(UserBusiness.id == user_id).first()
+            )
 
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
@@ -144,12 +161,18 @@ async def refresh_token(request: RefreshTokenPayload, session: SessionDep):
 
         # Check if the token has expired
         current_time = datetime.now(timezone.utc)
-        if payload.exp and datetime.fromtimestamp(payload.exp, timezone.utc) < current_time:
+        if (
+            payload.exp
+            and datetime.fromtimestamp(payload.exp, timezone.utc) < current_time
+        ):
             raise HTTPException(status_code=401, detail="Refresh token expired")
 
         # If valid, generate new tokens
-        new_access_token = create_access_token(subject=user_id, expires_delta=timedelta(minutes=30))
-        new_refresh_token = create_refresh_token(subject=user_id)
+        user_type = get_principal_kind(user)
+        new_access_token = create_access_token(
+            subject=user_id, user_type=user_type, expires_delta=timedelta(minutes=30)
+        )
+        new_refresh_token = create_refresh_token(subject=user_id, user_type=user_type)
 
         # Update the user's refresh token in the database
         user.refresh_token = new_refresh_token.token
@@ -160,21 +183,24 @@ async def refresh_token(request: RefreshTokenPayload, session: SessionDep):
         return UserAuthResponse(
             access_token=new_access_token,
             refresh_token=new_refresh_token,
-            issued_at=current_time
+            issued_at=current_time,
         )
 
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+
 @router.get("/logout")
 async def logout(
     session: SessionDep,
-    current_user: Annotated[UserPublic | UserBusiness, Depends(get_current_user)]):
+    current_user: Annotated[UserPublic | UserBusiness, Depends(get_current_user)],
+):
     try:
         # Invalidate the refresh token by setting it to None or an empty string
         current_user.refresh_token = None
         session.add(current_user)
         session.commit()
+        get_principal_cache().invalidate(current_user.id)
 
         return {"message": "Logout successful, refresh token invalidated"}
 
@@ -1,103 +1,294 @@
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session, select
-
-from app.api.deps import get_current_user, get_db
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import StreamingResponse
+from sqlalchemy.exc import IntegrityError
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.api.deps import get_async_db, get_current_user, get_super_user
+from app.constants import MenuExportFormat
+from app.core.cache import CachedPayload, CacheStats
 from app.models.menu import Menu, MenuCategory, MenuItem, MenuSubCategory
 from app.models.user import UserBusiness, UserPublic
 from app.models.venue import Venue
 from app.schema.menu import (
+    MenuBulkImport,
     MenuCategoryCreate,
     MenuCategoryRead,
     MenuCategoryUpdate,
     MenuCreate,
+    MenuImportResult,
     MenuItemCreate,
     MenuItemRead,
     MenuItemUpdate,
     MenuRead,
+    MenuSearchResult,
     MenuSubCategoryCreate,
     MenuSubCategoryRead,
     MenuSubCategoryUpdate,
     MenuUpdate,
 )
+from app.services.menu import (
+    CATEGORY_MENU_OPTIONS,
+    CATEGORY_TREE_OPTIONS,
+    ITEM_MENU_OPTIONS,
+    MENU_TREE_OPTIONS,
+    SUBCATEGORY_MENU_OPTIONS,
+    SUBCATEGORY_TREE_OPTIONS,
+    load_menu,
+    load_venue_menus,
+    search_venue_menu,
+)
+from app.services.menu_cache import get_menu_cache
+from app.services.menu_transfer import (
+    MenuImportError,
+    import_menus,
+    parse_menu_csv,
+    parse_menu_json,
+    stream_menu_csv,
+    stream_menu_json,
+)
+from app.services.permissions import venue_of
 from app.util import (
-    check_user_permission,
-    create_record,
-    delete_record,
-    get_record_by_id,
-    update_record,
+    cached_json_response,
+    check_user_permission_async,
+    create_record_async,
+    delete_record_async,
+    get_record_by_id_async,
+    update_record_async,
 )
 
 router = APIRouter()
 
 
+def invalidate_menu_venues(*venue_ids: uuid.UUID) -> None:
+    """
+    Invalidate the cached menus of every distinct venue touched by a write,
+    e.g. both the old and new venue when a category is moved between menus.
+    """
+    menu_cache = get_menu_cache()
+    for venue_id in set(venue_ids):
+        menu_cache.invalidate(venue_id)
+
+
 # Get all menus of a specific venue
 @router.get("/all/{venue_id}", response_model=list[MenuRead])
 async def read_menus(
     venue_id: uuid.UUID,
-    db: Session = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserPublic = Depends(get_current_user),  # noqa: ARG001
 ):
     """
     Retrieve all menus for a specific venue.
+
+    Served from the per-venue menu cache when possible; the payload is cached
+    already serialized, so a hit skips both the database and validation, and a
+    matching If-None-Match gets a bodyless 304.
     """
-    # Query the Menu table for menus associated with the specified venue
-    statement = select(Menu).where(Menu.venue_id == venue_id)
-    menus = db.execute(statement).scalars().all()  # Execute the query
+    menu_cache = get_menu_cache()
+    version, cached = menu_cache.lookup(venue_id)
+
+    if cached is None:
+        # Load the menus with their whole category tree in a fixed number of queries
+        menus = await load_venue_menus(db, venue_id)
+
+        if not menus:
+            raise HTTPException(
+                status_code=404, detail="No menus found for this venue."
+            )
 
-    if not menus:
-        raise HTTPException(status_code=404, detail="No menus found for this venue.")
+        assert isinstance(menus[0], Menu), "Fetched Menu object is not of type Menu"
 
-    assert isinstance(menus[0], Menu), "Fetched Menu object is not of type Menu"
+        cached = menu_cache.store_menus(
+            venue_id, version, [menu.to_read_schema() for menu in menus]
+        )
 
-    return [menu.to_read_schema() for menu in menus]
+    return cached_json_response(request, cached)
+
+
+@router.get("/search/{venue_id}", response_model=list[MenuSearchResult])
+async def search_menu(
+    venue_id: uuid.UUID,
+    q: str | None = Query(default=None, max_length=200),
+    min_price: float | None = Query(default=None, ge=0),
+    max_price: float | None = Query(default=None, ge=0),
+    min_abv: float | None = Query(default=None, ge=0),
+    max_abv: float | None = Query(default=None, ge=0),
+    min_ibu: int | None = Query(default=None, ge=0),
+    max_ibu: int | None = Query(default=None, ge=0),
+    is_veg: bool | None = None,
+    limit: int = Query(default=20, gt=0, le=100),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserPublic = Depends(get_current_user),  # noqa: ARG001
+):
+    """
+    Search a venue's menu items by text, tolerating typos in item names, and
+    by price, ABV and IBU ranges. Best matches come first, each with the
+    menu, category and subcategory it is listed under.
+    """
+    return await search_venue_menu(
+        db,
+        venue_id,
+        q.strip() if q else None,
+        min_price=min_price,
+        max_price=max_price,
+        min_abv=min_abv,
+        max_abv=max_abv,
+        min_ibu=min_ibu,
+        max_ibu=max_ibu,
+        is_veg=is_veg,
+        limit=limit,
+    )
+
+
+@router.get("/cache/stats", response_model=CacheStats)
+async def read_menu_cache_stats(
+    current_user: UserBusiness = Depends(get_super_user),  # noqa: ARG001
+):
+    """
+    Hit/miss counters of this worker's menu cache.
+    """
+    return get_menu_cache().stats()
 
 
 @router.get("/menu/{menu_id}", response_model=MenuRead)
 async def read_menu(
     menu_id: uuid.UUID,
-    db: Session = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserPublic = Depends(get_current_user),  # noqa: ARG001
 ):
     """
     Retrieve a specific menu by its ID.
+
+    Cached under the owning venue's version, with the same ETag handling as
+    the venue menu list.
     """
-    menu = get_record_by_id(db, Menu, menu_id)
+    menu_cache = get_menu_cache()
+    venue_id = menu_cache.venue_of(menu_id)
+
+    if venue_id is not None:
+        version, cached = menu_cache.lookup(venue_id, menu_id)
+        if cached is not None:
+            return cached_json_response(request, cached)
+
+    menu = await load_menu(db, menu_id)
+    if not menu:
+        raise HTTPException(
+            status_code=404, detail=f"Menu with ID {menu_id} not found."
+        )
 
     assert isinstance(menu, Menu), "The returned object is not of type Menu"
-    return menu.to_read_schema()
+
+    menu_read = menu.to_read_schema()
+    if venue_id is None:
+        # The venue's version was not read before loading, so this payload
+        # cannot be cached safely; remember the venue for the next request.
+        menu_cache.remember_venue(menu_id, menu.venue_id)
+        cached = CachedPayload.from_payload(menu_read.model_dump_json().encode())
+    else:
+        cached = menu_cache.store_menu(venue_id, version, menu_read)
+    return cached_json_response(request, cached)
+
+
+@router.post("/import/{venue_id}", response_model=MenuImportResult)
+async def import_venue_menus(
+    venue_id: uuid.UUID,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserBusiness = Depends(get_current_user),
+):
+    """
+    Create or update a venue's whole menu tree in one transaction.
+
+    The body is either a ``MenuBulkImport`` JSON document or, with a
+    ``text/csv`` content type, one row per item in the export's CSV columns.
+    Menus, categories, subcategories and items are matched by name within
+    their parent; anything not in the document is left as it is.
+    """
+    await check_user_permission_async(db, current_user, venue_id)
+
+    body = await request.body()
+    try:
+        if "csv" in request.headers.get("content-type", ""):
+            bulk: MenuBulkImport = parse_menu_csv(body.decode("utf-8-sig"))
+        else:
+            bulk = parse_menu_json(body)
+    except MenuImportError as e:
+        raise RequestValidationError(e.errors) from e
+    except UnicodeDecodeError as e:
+        raise HTTPException(status_code=400, detail="CSV must be UTF-8.") from e
+
+    try:
+        result = await import_menus(db, venue_id, bulk)
+    except IntegrityError as e:
+        # A menu node matched by the import was deleted while it ran
+        raise HTTPException(
+            status_code=409, detail="The venue's menus changed during the import."
+        ) from e
+
+    invalidate_menu_venues(venue_id)
+    return result
+
+
+@router.get("/export/{venue_id}")
+async def export_venue_menus(
+    venue_id: uuid.UUID,
+    format: MenuExportFormat = MenuExportFormat.JSON,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserBusiness = Depends(get_current_user),
+):
+    """
+    Stream a venue's menus in the format accepted by the import, writing rows
+    out as they are read from the database.
+    """
+    await check_user_permission_async(db, current_user, venue_id)
+
+    if format is MenuExportFormat.CSV:
+        chunks, media_type = stream_menu_csv(venue_id), "text/csv"
+    else:
+        chunks, media_type = stream_menu_json(venue_id), "application/json"
+    filename = f"menus-{venue_id}.{format.value}"
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
 
 @router.post("/", response_model=MenuRead)
 async def create_menu(
     menu_create: MenuCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserBusiness = Depends(get_current_user),
 ):
     """
     Create a new menu for a specific venue.
     """
     # Check if the venue exists
-    venue = get_record_by_id(db, Venue, menu_create.venue_id)
+    venue = await get_record_by_id_async(db, Venue, menu_create.venue_id)
     if not venue:
         raise HTTPException(status_code=404, detail="Venue not found.")
 
     # Check if the user has permission to create a menu for this venue
-    check_user_permission(db, current_user, menu_create.venue_id)
+    await check_user_permission_async(db, current_user, menu_create.venue_id)
 
     try:
         # Create the Menu object
         menu_instance = Menu.from_create_schema(menu_create)
 
         # Use the create_record helper to save the menu to the database
-        created_menu = create_record(db, menu_instance)
+        created_menu = await create_record_async(db, menu_instance)
+        await db.refresh(created_menu, ["categories"])
+        get_menu_cache().invalidate(created_menu.venue_id)
 
         assert isinstance(created_menu, Menu), "The returned object is not of type Menu"
         return created_menu.to_read_schema()
 
     except Exception as e:
-        db.rollback()  # Rollback in case of error
+        await db.rollback()  # Rollback in case of error
         raise HTTPException(status_code=400, detail=f"Error creating menu: {str(e)}")
 
 
@@ -105,7 +296,7 @@ async def create_menu(
 async def update_menu(
     menu_id: uuid.UUID,
     menu_update: MenuUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserBusiness = Depends(get_current_user),
 ):
     """
@@ -117,16 +308,20 @@ async def update_menu(
     :return: The updated Menu as a response.
     """
     # Retrieve the menu by its ID
-    menu_instance = get_record_by_id(db, Menu, menu_id)
+    menu_instance = await get_record_by_id_async(
+        db, Menu, menu_id, options=MENU_TREE_OPTIONS
+    )
     # Check if the user has permission to update a menu for this venue
 
     if not menu_instance:
         raise HTTPException(status_code=404, detail="Menu not found.")
 
-    check_user_permission(db, current_user, menu_instance.venue_id)
+    await check_user_permission_async(db, current_user, menu_instance.venue_id)
 
     # Update the menu using the validated fields from MenuUpdate
-    updated_menu = update_record(db, menu_instance, menu_update)
+    venue_id = menu_instance.venue_id
+    updated_menu = await update_record_async(db, menu_instance, menu_update)
+    invalidate_menu_venues(venue_id, updated_menu.venue_id)
     assert isinstance(updated_menu, Menu), "The returned object is not of type Menu"
     return updated_menu.to_read_schema()
 
@@ -134,7 +329,7 @@ async def update_menu(
 @router.delete("/{menu_id}", response_model=dict)
 async def delete_menu(
     menu_id: uuid.UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserBusiness = Depends(get_current_user),
 ):
     """
@@ -144,14 +339,20 @@ async def delete_menu(
     :param db: Active database session.
     :return: Confirmation message on successful deletion.
     """
-    menu_instance = get_record_by_id(db, Menu, menu_id)
+    # Deleting a parent nulls out its loaded children's foreign keys, and
+    # the children cannot be lazy-loaded on an AsyncSession.
+    menu_instance = await get_record_by_id_async(
+        db, Menu, menu_id, options=MENU_TREE_OPTIONS
+    )
     if not menu_instance:
         raise HTTPException(status_code=404, detail="Menu not found.")
 
     # Check if the user has permission to delete a menu for this venue
-    check_user_permission(db, current_user, menu_instance.venue_id)
+    await check_user_permission_async(db, current_user, menu_instance.venue_id)
 
-    delete_record(db, menu_instance)
+    venue_id = menu_instance.venue_id
+    await delete_record_async(db, menu_instance)
+    get_menu_cache().invalidate(venue_id)
 
     return {"detail": "Menu deleted successfully."}
 
@@ -162,7 +363,7 @@ async def delete_menu(
 @router.post("/category", response_model=MenuCategoryRead)
 async def create_menu_category(
     category_create: MenuCategoryCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserBusiness = Depends(get_current_user),
 ):
     """
@@ -173,18 +374,20 @@ async def create_menu_category(
     :return: The created MenuCategory as a response.
     """
     # Check if the menu exists
-    menu = get_record_by_id(db, Menu, category_create.menu_id)
+    venue_id = await venue_of(db, Menu, category_create.menu_id)
 
-    if not menu:
+    if not venue_id:
         raise HTTPException(status_code=404, detail="Menu not found.")
     # Check if the user has permission to update a menu for this venue
-    check_user_permission(db, current_user, menu.venue_id)
+    await check_user_permission_async(db, current_user, venue_id)
 
     # Create a new MenuCategory instance from the provided data
     category_instance = MenuCategory.from_create_schema(category_create)
 
     # Persist the new category in the database
-    created_category = create_record(db, category_instance)
+    created_category = await create_record_async(db, category_instance)
+    await db.refresh(created_category, ["sub_categories"])
+    get_menu_cache().invalidate(venue_id)
 
     assert isinstance(
         created_category, MenuCategory
@@ -196,7 +399,7 @@ async def create_menu_category(
 async def update_menu_category(
     category_id: uuid.UUID,
     category_update: MenuCategoryUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserBusiness = Depends(get_current_user),
 ):
     """
@@ -208,15 +411,31 @@ async def update_menu_category(
     :return: The updated MenuCategory as a response.
     """
     # Retrieve the category by its ID
-    category_instance = get_record_by_id(db, MenuCategory, category_id)
+    category_instance = await get_record_by_id_async(
+        db, MenuCategory, category_id, options=CATEGORY_MENU_OPTIONS
+    )
 
     if not category_instance:
         raise HTTPException(status_code=404, detail="Menu category not found.")
 
-    check_user_permission(db, current_user, category_instance.menu.venue_id)
+    venue_id = category_instance.menu.venue_id
+    await check_user_permission_async(db, current_user, venue_id)
+
+    # Moving the category to another menu needs permission on its venue too
+    target_venue_id = venue_id
+    new_menu_id = category_update.menu_id
+    if new_menu_id and new_menu_id != category_instance.menu_id:
+        target_venue_id = await venue_of(db, Menu, new_menu_id)
+        if not target_venue_id:
+            raise HTTPException(status_code=404, detail="Menu not found.")
+        await check_user_permission_async(db, current_user, target_venue_id)
 
     # Update the category using the validated fields from MenuCategoryUpdate
-    updated_category = update_record(db, category_instance, category_update)
+    await update_record_async(db, category_instance, category_update)
+    updated_category = await get_record_by_id_async(
+        db, MenuCategory, category_id, options=CATEGORY_TREE_OPTIONS
+    )
+    invalidate_menu_venues(venue_id, target_venue_id)
 
     assert isinstance(
         updated_category, MenuCategory
@@ -227,7 +446,7 @@ async def update_menu_category(
 @router.delete("/category/{category_id}", response_model=dict)
 async def delete_category(
     category_id: uuid.UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserBusiness = Depends(get_current_user),
 ):
     """
@@ -237,14 +456,21 @@ async def delete_category(
     :param db: Active database session.
     :return: Confirmation message on successful deletion.
     """
-    category = get_record_by_id(db, MenuCategory, category_id)
+    category = await get_record_by_id_async(
+        db,
+        MenuCategory,
+        category_id,
+        options=CATEGORY_MENU_OPTIONS + CATEGORY_TREE_OPTIONS,
+    )
 
     if not category:
         raise HTTPException(status_code=404, detail="Category not found.")
 
-    check_user_permission(db, current_user, category.menu.venue_id)
+    venue_id = category.menu.venue_id
+    await check_user_permission_async(db, current_user, venue_id)
 
-    delete_record(db, category)
+    await delete_record_async(db, category)
+    get_menu_cache().invalidate(venue_id)
 
     return {"detail": "Category deleted successfully."}
 
@@ -255,7 +481,7 @@ async def delete_category(
 @router.post("/subcategory/", response_model=MenuSubCategoryRead)
 async def create_menu_subcategory(
     subcategory_create: MenuSubCategoryCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserBusiness = Depends(get_current_user),
 ):
     """
@@ -266,18 +492,20 @@ async def create_menu_subcategory(
     :return: The created MenuSubCategory as a response.
     """
     # Check if the category exists
-    category = get_record_by_id(db, MenuCategory, subcategory_create.category_id)
+    venue_id = await venue_of(db, MenuCategory, subcategory_create.category_id)
 
-    if not category:
+    if not venue_id:
         raise HTTPException(status_code=404, detail="Category not found.")
 
-    check_user_permission(db, current_user, category.menu.venue_id)
+    await check_user_permission_async(db, current_user, venue_id)
 
     # Create a new MenuSubCategory instance from the provided data
     subcategory_instance = MenuSubCategory.from_create_schema(subcategory_create)
 
     # Persist the new subcategory in the database
-    created_subcategory = create_record(db, subcategory_instance)
+    created_subcategory = await create_record_async(db, subcategory_instance)
+    await db.refresh(created_subcategory, ["menu_items"])
+    get_menu_cache().invalidate(venue_id)
 
     assert isinstance(
         created_subcategory, MenuSubCategory
@@ -289,7 +517,7 @@ async def create_menu_subcategory(
 async def update_menu_subcategory(
     subcategory_id: uuid.UUID,
     subcategory_update: MenuSubCategoryUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserBusiness = Depends(get_current_user),
 ):
     """
@@ -301,18 +529,31 @@ async def update_menu_subcategory(
     :return: The updated MenuSubCategory as a response.
     """
     # Check if the subcategory exists
-    subcategory = get_record_by_id(db, MenuSubCategory, subcategory_id)
+    subcategory = await get_record_by_id_async(
+        db, MenuSubCategory, subcategory_id, options=SUBCATEGORY_MENU_OPTIONS
+    )
 
     if not subcategory:
         raise HTTPException(status_code=404, detail="Subcategory not found.")
 
-    check_user_permission(db, current_user, subcategory.category.menu.venue_id)
+    venue_id = subcategory.category.menu.venue_id
+    await check_user_permission_async(db, current_user, venue_id)
+
+    # Moving the subcategory to another category needs permission on its venue too
+    target_venue_id = venue_id
+    new_category_id = subcategory_update.category_id
+    if new_category_id and new_category_id != subcategory.category_id:
+        target_venue_id = await venue_of(db, MenuCategory, new_category_id)
+        if not target_venue_id:
+            raise HTTPException(status_code=404, detail="Category not found.")
+        await check_user_permission_async(db, current_user, target_venue_id)
 
     # Update the subcategory with provided data
-    update_data = subcategory_update.dict(
-        exclude_unset=True
-    )  # Exclude unset fields for partial update
-    updated_subcategory = update_record(db, subcategory, update_data)
+    await update_record_async(db, subcategory, subcategory_update)
+    updated_subcategory = await get_record_by_id_async(
+        db, MenuSubCategory, subcategory_id, options=SUBCATEGORY_TREE_OPTIONS
+    )
+    invalidate_menu_venues(venue_id, target_venue_id)
 
     assert isinstance(
         updated_subcategory, MenuSubCategory
@@ -323,7 +564,7 @@ async def update_menu_subcategory(
 @router.delete("/subcategory/{subcategory_id}", response_model=dict)
 async def delete_subcategory(
     subcategory_id: uuid.UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserBusiness = Depends(get_current_user),
 ):
     """
@@ -333,14 +574,21 @@ async def delete_subcategory(
     :param db: Active database session.
     :return: Confirmation message on successful deletion.
     """
-    subcategory = get_record_by_id(db, MenuSubCategory, subcategory_id)
+    subcategory = await get_record_by_id_async(
+        db,
+        MenuSubCategory,
+        subcategory_id,
+        options=SUBCATEGORY_MENU_OPTIONS + SUBCATEGORY_TREE_OPTIONS,
+    )
 
     if not subcategory:
         raise HTTPException(status_code=404, detail="Subcategory not found.")
 
-    check_user_permission(db, current_user, subcategory.category.menu.venue_id)
+    venue_id = subcategory.category.menu.venue_id
+    await check_user_permission_async(db, current_user, venue_id)
 
-    delete_record(db, subcategory)
+    await delete_record_async(db, subcategory)
+    get_menu_cache().invalidate(venue_id)
 
     return {"detail": "Subcategory deleted successfully."}
 
@@ -351,7 +599,7 @@ async def delete_subcategory(
 @router.post("/item/", response_model=MenuItemRead)
 async def create_menu_item(
     item_create: MenuItemCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserBusiness = Depends(get_current_user),
 ):
     """
@@ -362,18 +610,19 @@ async def create_menu_item(
     :return: The created MenuItem as a response.
     """
     # Check if the subcategory exists
-    subcategory = get_record_by_id(db, MenuSubCategory, item_create.subcategory_id)
+    venue_id = await venue_of(db, MenuSubCategory, item_create.subcategory_id)
 
-    if not subcategory:
+    if not venue_id:
         raise HTTPException(status_code=404, detail="Subcategory not found.")
 
-    check_user_permission(db, current_user, subcategory.category.menu.venue_id)
+    await check_user_permission_async(db, current_user, venue_id)
 
     # Create a new MenuItem instance from the provided data
     item_instance = MenuItem.from_create_schema(item_create)
 
     # Persist the new item in the database
-    created_item = create_record(db, item_instance)
+    created_item = await create_record_async(db, item_instance)
+    get_menu_cache().invalidate(venue_id)
 
     assert isinstance(
         created_item, MenuItem
@@ -385,7 +634,7 @@ async def create_menu_item(
 async def update_menu_item(
     item_id: uuid.UUID,
     item_update: MenuItemUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserBusiness = Depends(get_current_user),
 ):
     """
@@ -397,15 +646,19 @@ async def update_menu_item(
     :return: The updated MenuItem as a response.
     """
     # Check if the item exists
-    item = get_record_by_id(db, MenuItem, item_id)
+    item = await get_record_by_id_async(
+        db, MenuItem, item_id, options=ITEM_MENU_OPTIONS
+    )
 
     if not item:
         raise HTTPException(status_code=404, detail="Menu item not found.")
 
-    check_user_permission(db, current_user, item.subcategory.category.menu.venue_id)
+    venue_id = item.subcategory.category.menu.venue_id
+    await check_user_permission_async(db, current_user, venue_id)
 
-    # Update the item with provided data
-    updated_item = update_record(db, item, item_update)
+    # Update the item with provided data; an item cannot change subcategory
+    updated_item = await update_record_async(db, item, item_update)
+    get_menu_cache().invalidate(venue_id)
     assert isinstance(
         updated_item, MenuItem
     ), "The returned object is not of type MenuItem"
@@ -415,7 +668,7 @@ async def update_menu_item(
 @router.delete("/item/{item_id}", response_model=dict)
 async def delete_menu_item(
     item_id: uuid.UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserBusiness = Depends(get_current_user),
 ):
     """
@@ -425,14 +678,18 @@ async def delete_menu_item(
     :param db: Active database session.
     :return: Confirmation message on successful deletion.
     """
-    item = get_record_by_id(db, MenuItem, item_id)
+    item = await get_record_by_id_async(
+        db, MenuItem, item_id, options=ITEM_MENU_OPTIONS
+    )
 
     if not item:
         raise HTTPException(status_code=404, detail="Menu item not found.")
 
-    check_user_permission(db, current_user, item.subcategory.category.menu.venue_id)
+    venue_id = item.subcategory.category.menu.venue_id
+    await check_user_permission_async(db, current_user, venue_id)
 
-    delete_record(db, item)
+    await delete_record_async(db, item)
+    get_menu_cache().invalidate(venue_id)
 
     return {"detail": "Menu item deleted successfully."}
 
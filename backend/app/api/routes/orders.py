@@ -0,0 +1,158 @@
+import uuid
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.api.deps import get_async_db, get_business_user, get_public_user
+from app.constants import VenueType
+from app.models.pickup_location import PickupLocation
+from app.models.user import UserBusiness, UserPublic
+from app.schema.order import OrderCreate, OrderRead, OrderStatusUpdate, OrderSummary
+from app.schema.pagination import Page
+from app.services.order import (
+    ORDER_MODELS,
+    get_order,
+    order_history,
+    order_venue_id,
+    place_order,
+    update_order_status,
+)
+from app.services.order_events import (
+    get_order_broker,
+    pickup_location_topic,
+    stream_order_events,
+    venue_topic,
+)
+from app.util import check_user_permission_async
+
+router = APIRouter()
+
+# Sent with every order event stream; proxies must pass events on at once
+EVENT_STREAM_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+@router.post("/", response_model=OrderRead, status_code=201)
+async def create_order(
+    order_in: OrderCreate,
+    response: Response,
+    idempotency_key: str = Header(min_length=1, max_length=255),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserPublic = Depends(get_public_user),
+):
+    """
+    Place an order, priced from the venue's menu.
+
+    Send a unique ``Idempotency-Key`` header per checkout and reuse it when
+    retrying: a retry returns the order already placed, with status 200.
+    """
+    order, created = await place_order(db, current_user.id, order_in, idempotency_key)
+    if not created:
+        response.status_code = 200
+    return order
+
+
+@router.get("/", response_model=Page[OrderSummary])
+async def read_order_history(
+    cursor: str | None = None,
+    limit: int = Query(20, gt=0, le=100),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserPublic = Depends(get_public_user),
+):
+    """
+    Retrieve a page of the current user's orders at all venues, newest first.
+    - **cursor**: The ``next_cursor`` of the previous page; omit for the first page
+    - **limit**: The number of orders per page
+    """
+    orders, next_cursor = await order_history(db, current_user.id, cursor, limit)
+    return Page(items=orders, next_cursor=next_cursor)
+
+
+async def order_event_response(topic: str) -> StreamingResponse:
+    # Subscribed before the response starts, so no event is missed between
+    # the permission check and the first read
+    subscription = await get_order_broker().subscribe([topic])
+    return StreamingResponse(
+        stream_order_events(subscription),
+        media_type="text/event-stream",
+        headers=EVENT_STREAM_HEADERS,
+    )
+
+
+@router.get("/events/venue/{venue_id}")
+async def stream_venue_orders(
+    venue_id: uuid.UUID,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserBusiness = Depends(get_business_user),
+):
+    """
+    Server-sent events for every order placed at the venue or changing
+    status there. Each event carries the order ID and status; fetch the
+    order for its items.
+    """
+    await check_user_permission_async(db, current_user, venue_id)
+    return await order_event_response(venue_topic(venue_id))
+
+
+@router.get("/events/pickup-location/{pickup_location_id}")
+async def stream_pickup_location_orders(
+    pickup_location_id: uuid.UUID,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserBusiness = Depends(get_business_user),
+):
+    """
+    Server-sent events for the orders to be collected at one pickup location,
+    such as a bar counter.
+    """
+    venue_id = (
+        await db.execute(
+            select(PickupLocation.venue_id).where(
+                PickupLocation.id == pickup_location_id
+            )
+        )
+    ).scalar_one_or_none()
+    if venue_id is None:
+        raise HTTPException(status_code=404, detail="Pickup location not found")
+    await check_user_permission_async(db, current_user, venue_id)
+    return await order_event_response(pickup_location_topic(pickup_location_id))
+
+
+@router.patch("/{venue_type}/{order_id}/status", response_model=OrderRead)
+async def set_order_status(
+    venue_type: VenueType,
+    order_id: uuid.UUID,
+    status_in: OrderStatusUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserBusiness = Depends(get_business_user),
+):
+    """
+    Update the status of an order at a venue the user manages. Subscribers
+    of the venue and of the order's pickup location are notified.
+    """
+    venue_id = None
+    if venue_type in ORDER_MODELS:
+        venue_id = await order_venue_id(db, venue_type, order_id)
+    if venue_id is None:
+        raise HTTPException(status_code=404, detail="Order not found")
+    await check_user_permission_async(db, current_user, venue_id)
+    await update_order_status(db, venue_type, order_id, venue_id, status_in.status)
+    return await get_order(db, None, venue_type, order_id)
+
+
+@router.get("/{venue_type}/{order_id}", response_model=OrderRead)
+async def read_order(
+    venue_type: VenueType,
+    order_id: uuid.UUID,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserPublic = Depends(get_public_user),
+):
+    """
+    Retrieve one of the current user's orders with its items.
+    """
+    order = None
+    if venue_type in ORDER_MODELS:
+        order = await get_order(db, current_user.id, venue_type, order_id)
+    if order is None:
+        raise HTTPException(status_code=404, detail="Order not found")
+    return order
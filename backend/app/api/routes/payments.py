@@ -0,0 +1,39 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, Request
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.api.deps import get_async_db
+from app.core.config import settings
+from app.schema.payment import PaymentWebhook, PaymentWebhookAck
+from app.services.payment import store_webhook, verify_signature
+
+router = APIRouter()
+
+
+@router.post("/webhook", response_model=PaymentWebhookAck, status_code=202)
+async def receive_payment_webhook(
+    request: Request,
+    x_signature: str | None = Header(default=None),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Receive a payment status change from the gateway.
+
+    The event is only stored here, so the gateway gets its answer at once;
+    the webhook worker applies it to the payment shortly after. Repeated
+    deliveries of an event are acknowledged and ignored.
+    """
+    if settings.PAYMENT_WEBHOOK_SECRET is None:
+        raise HTTPException(
+            status_code=503, detail="Payment webhooks are not configured"
+        )
+    body = await request.body()
+    if x_signature is None or not verify_signature(body, x_signature):
+        raise HTTPException(status_code=401, detail="Invalid webhook signature")
+    try:
+        webhook = PaymentWebhook.model_validate_json(body)
+    except ValidationError as exc:
+        raise RequestValidationError(exc.errors()) from exc
+    stored = await store_webhook(db, webhook)
+    return PaymentWebhookAck(duplicate=not stored)
@@ -12,6 +12,7 @@ from app.api.deps import (
     get_super_user,
 )
 from app.models import UserBusiness, UserPublic
+from app.schema.pagination import Page
 from app.schema.user import (
     UserBusinessCreate,
     UserBusinessRead,
@@ -19,6 +20,7 @@ from app.schema.user import (
     UserPublicRead,
     UserPublicUpdate,
 )
+from app.services.principal_cache import get_principal_cache
 from app.util import (
     create_record,
     delete_record,
@@ -43,29 +45,30 @@ async def read_user_me(
     return x
 
 
-@router.get("/all-user-business/", response_model=list[UserBusinessRead])
+@router.get("/all-user-business/", response_model=Page[UserBusinessRead])
 async def all_read_user_business(
     db: Session = Depends(get_db),
-    skip: int = Query(0, alias="page", ge=0),
-    limit: int = Query(10, le=100),
+    cursor: str | None = None,
+    limit: int = Query(10, gt=0, le=100),
     current_user: UserBusiness = Depends(get_super_user),  # noqa: ARG001
 ):
     """
-    Retrieve a paginated list of user businesses.
-    - **skip**: The page number (starting from 0)
+    Retrieve a page of user businesses, oldest first.
+    - **cursor**: The ``next_cursor`` of the previous page; omit for the first page
     - **limit**: The number of items per page
     """
-    all_users = get_all_records(db, UserBusiness, skip=skip, limit=limit)
-
-    if all_users is None:
-        raise HTTPException(status_code=404, detail="No user businesses found.")
+    all_users, next_cursor = get_all_records(
+        db, UserBusiness, cursor=cursor, limit=limit
+    )
 
     # Convert each record to its read schema
     assert all(
         hasattr(user, "to_read_schema") for user in all_users
     ), "Each user must implement 'to_read_schema'"
 
-    return [user.to_read_schema() for user in all_users]
+    return Page(
+        items=[user.to_read_schema() for user in all_users], next_cursor=next_cursor
+    )
 
 
 @router.get("/user-businesses/{user_business_id}", response_model=UserBusinessRead)
@@ -116,7 +119,9 @@ async def update_user_business(
     """
     try:
         user_instance = UserBusiness.from_create_schema(user_business)
-        return update_record(db, current_user, user_instance)
+        updated_user = update_record(db, current_user, user_instance)
+        get_principal_cache().invalidate(current_user.id)
+        return updated_user
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=400, detail=str(e))
@@ -135,32 +140,32 @@ async def delete_user_business(
     user_instance = get_record_by_id(session, UserBusiness, user_business_id)
 
     delete_record(session, user_instance)
+    get_principal_cache().invalidate(user_business_id)
     return {"message": f"UserBusiness with ID {user_business_id} has been deleted."}
 
 
-@router.get("/all-user-public/", response_model=list[UserPublicRead])
+@router.get("/all-user-public/", response_model=Page[UserPublicRead])
 async def all_read_user_public(
     db: Session = Depends(get_db),
-    skip: int = Query(0, alias="page", ge=0),
-    limit: int = Query(10, le=100),
+    cursor: str | None = None,
+    limit: int = Query(10, gt=0, le=100),
     current_user: UserBusiness = Depends(get_business_user),  # noqa: ARG001
 ):
     """
-    Retrieve a paginated list of user public.
-    - **skip**: The page number (starting from 0)
+    Retrieve a page of user public, oldest first.
+    - **cursor**: The ``next_cursor`` of the previous page; omit for the first page
     - **limit**: The number of items per page
     """
-    all_users = get_all_records(db, UserPublic, skip=skip, limit=limit)
-
-    if all_users is None:
-        raise HTTPException(status_code=404, detail="No user found.")
+    all_users, next_cursor = get_all_records(db, UserPublic, cursor=cursor, limit=limit)
 
     assert all(
         hasattr(user, "to_read_schema") for user in all_users
     ), "Each user must implement 'to_read_schema'"
 
     # Convert each record to its read schema
-    return [user.to_read_schema() for user in all_users]
+    return Page(
+        items=[user.to_read_schema() for user in all_users], next_cursor=next_cursor
+    )
 
 
 @router.get("/user-public/{user_public_id}", response_model=UserPublicRead)
@@ -192,7 +197,9 @@ async def update_user_public_me(
     print("user_public", user_public)
     try:
         user_instance = UserPublic.from_create_schema(user_public)
-        return update_record(db, current_user, user_instance)
+        updated_user = update_record(db, current_user, user_instance)
+        get_principal_cache().invalidate(current_user.id)
+        return updated_user
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=400, detail=str(e))
@@ -211,4 +218,5 @@ async def delete_user_public(
     user_instance = get_record_by_id(session, UserBusiness, user_public_id)
 
     delete_record(session, user_instance)
+    get_principal_cache().invalidate(user_public_id)
     return {"message": f"UserPublic with ID {user_public_id} has been deleted."}
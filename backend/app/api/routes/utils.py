@@ -0,0 +1,19 @@
+from fastapi import APIRouter, Depends
+
+from app.api.deps import get_super_user
+from app.core.db import get_pool_stats
+from app.core.pool import DatabasePoolStats
+from app.models.user import UserBusiness
+
+router = APIRouter()
+
+
+@router.get("/pool-stats/", response_model=DatabasePoolStats)
+async def read_pool_stats(
+    current_user: UserBusiness = Depends(get_super_user),  # noqa: ARG001
+):
+    """
+    Connection pool gauges of this worker: connections checked out, overflow
+    in use, and how long checkouts have waited for a connection.
+    """
+    return get_pool_stats()
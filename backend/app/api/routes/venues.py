@@ -1,15 +1,32 @@
-from fastapi import APIRouter, Depends, FastAPI, HTTPException
-from sqlmodel import Session
+import uuid
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    FastAPI,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+)
+from pydantic import BaseModel
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.api.deps import (
+    get_async_db,
     get_business_user,
-    get_db,
 )
+from app.constants import VenueType
+from app.core.cache import get_versioned_cache
 from app.models.user import UserBusiness, UserVenueAssociation
 from app.models.venue import QSR, Foodcourt, Nightclub, Restaurant, Venue
+from app.schema.occupancy import ClubVisitCreate, ClubVisitRead, OccupancyRead
+from app.schema.pagination import Page
 from app.schema.venue import (
     FoodcourtCreate,
     FoodcourtRead,
+    NearbyVenueRead,
     NightclubCreate,
     NightclubRead,
     QSRCreate,
@@ -18,201 +35,327 @@ from app.schema.venue import (
     RestaurantRead,
     VenueListResponse,
 )
+from app.services.occupancy import (
+    get_occupancy,
+    record_entry,
+    record_exit,
+    resolve_nightclub,
+)
+from app.services.permissions import get_venue_permission_cache
+from app.services.venue import (
+    VENUE_READ_OPTIONS,
+    find_nearby_venues,
+    load_managed_venues,
+)
 
 # Assuming you have a dependency to get the database session
 from app.util import (
-    create_record,
-    get_all_records,
+    cached_json_response,
+    check_user_permission_async,
+    create_record_async,
+    get_all_records_async,
 )
 
 app = FastAPI()
 router = APIRouter()
 
 
+async def read_venue_list(
+    request: Request,
+    db: AsyncSession,
+    model: type[SQLModel],
+    read_schema: type[BaseModel],
+    cursor: str | None,
+    limit: int,
+) -> Response:
+    """
+    Serve a page of venues of one type from the venue list cache, with ETag
+    support. Each venue type is its own cache scope, invalidated on create.
+    """
+    venue_cache = get_versioned_cache("venue")
+    scope = model.__tablename__
+    page_key = (cursor or "", limit)
+    version, cached = venue_cache.lookup(scope, *page_key)
+
+    if cached is None:
+        records, next_cursor = await get_all_records_async(
+            db, model, cursor=cursor, limit=limit, options=VENUE_READ_OPTIONS[model]
+        )
+        page = Page[read_schema](  # type: ignore[valid-type]
+            items=[record.to_read_schema() for record in records],
+            next_cursor=next_cursor,
+        )
+        payload = page.model_dump_json().encode()
+        cached = venue_cache.store(scope, version, payload, *page_key)
+
+    return cached_json_response(request, cached)
+
+
 # POST endpoint for Foodcourt
 @router.post("/foodcourts/", response_model=FoodcourtRead)
-def create_foodcourt(
+async def create_foodcourt(
     foodcourt: FoodcourtCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserBusiness = Depends(get_business_user),
 ):
     try:
         # Check if the venue exists
         venue_instance = Venue.from_create_schema(foodcourt.venue)
-        create_record(db, venue_instance)  # Persist the new venue
+        await create_record_async(db, venue_instance)  # Persist the new venue
         # Use the newly created venue instance
         foodcourt_instance = Foodcourt.from_create_schema(venue_instance.id, foodcourt)
         # Create the new Foodcourt record in the database
-        create_record(db, foodcourt_instance)
+        await create_record_async(db, foodcourt_instance)
+        await db.refresh(foodcourt_instance, ["venue", "qsrs"])
         association = UserVenueAssociation(
             user_id=current_user.id, venue_id=venue_instance.id
         )
-        create_record(db, association)
+        await create_record_async(db, association)
+        get_venue_permission_cache().invalidate(current_user.id)
+        get_versioned_cache("venue").invalidate(Foodcourt.__tablename__)
 
         return foodcourt_instance.to_read_schema()
 
     except Exception as e:
         # Rollback the session in case of any error
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=str(e))  # Respond with a 500 error
 
 
 # GET endpoint for Foodcourt
-@router.get("/foodcourts/", response_model=list[FoodcourtRead])
-def read_foodcourts(skip: int = 0, limit: int = 10, db: Session = Depends(get_db)):
-    return get_all_records(db, Foodcourt, skip=skip, limit=limit)
+@router.get("/foodcourts/", response_model=Page[FoodcourtRead])
+async def read_foodcourts(
+    request: Request,
+    cursor: str | None = None,
+    limit: int = Query(default=10, gt=0, le=100),
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await read_venue_list(request, db, Foodcourt, FoodcourtRead, cursor, limit)
 
 
 # POST endpoint for QSR
 @router.post("/qsrs/", response_model=QSRRead)
-def create_qsr(
+async def create_qsr(
     qsr: QSRCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserBusiness = Depends(get_business_user),
 ):
     try:
         # Check if the venue exists
         venue_instance = Venue.from_create_schema(qsr.venue)
-        create_record(db, venue_instance)  # Persist the new venue
+        await create_record_async(db, venue_instance)  # Persist the new venue
         # Use the newly created venue instance
         qsr_instance = QSR.from_create_schema(venue_instance.id, qsr)
         # Create the new Foodcourt record in the database
-        create_record(db, qsr_instance)
+        await create_record_async(db, qsr_instance)
+        await db.refresh(qsr_instance, ["venue"])
         association = UserVenueAssociation(
             user_id=current_user.id, venue_id=venue_instance.id
         )
-        create_record(db, association)
+        await create_record_async(db, association)
+        get_venue_permission_cache().invalidate(current_user.id)
+        venue_cache = get_versioned_cache("venue")
+        venue_cache.invalidate(QSR.__tablename__)
+        if qsr_instance.foodcourt_id:
+            # Foodcourt reads embed their QSRs
+            venue_cache.invalidate(Foodcourt.__tablename__)
         return qsr_instance.to_read_schema()
 
     except Exception as e:
         # Rollback the session in case of any error
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=str(e))  # Respond with a 500 error
 
 
 # GET endpoint for QSR
-@router.get("/qsrs/", response_model=list[QSRRead])
-def read_qsrs(skip: int = 0, limit: int = 10, db: Session = Depends(get_db)):
-    return get_all_records(db, QSR, skip=skip, limit=limit)
+@router.get("/qsrs/", response_model=Page[QSRRead])
+async def read_qsrs(
+    request: Request,
+    cursor: str | None = None,
+    limit: int = Query(default=10, gt=0, le=100),
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await read_venue_list(request, db, QSR, QSRRead, cursor, limit)
 
 
 # POST endpoint for Restaurant
 @router.post("/restaurants/", response_model=RestaurantRead)
-def create_restaurant(
+async def create_restaurant(
     restaurant: RestaurantCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserBusiness = Depends(get_business_user),
 ):
     try:
         # Check if the venue exists
         venue_instance = Venue.from_create_schema(restaurant.venue)
-        create_record(db, venue_instance)  # Persist the new venue
+        await create_record_async(db, venue_instance)  # Persist the new venue
         # Use the newly created venue instance
         restaurant_instance = Restaurant.from_create_schema(
             venue_instance.id, restaurant
         )
         # Create the new Foodcourt record in the database
-        create_record(db, restaurant_instance)
+        await create_record_async(db, restaurant_instance)
+        await db.refresh(restaurant_instance, ["venue"])
         association = UserVenueAssociation(
             user_id=current_user.id, venue_id=venue_instance.id
         )
-        create_record(db, association)
+        await create_record_async(db, association)
+        get_venue_permission_cache().invalidate(current_user.id)
+        get_versioned_cache("venue").invalidate(Restaurant.__tablename__)
         return restaurant_instance.to_read_schema()
 
     except Exception as e:
         # Rollback the session in case of any error
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=str(e))  # Respond with a 500 error
 
 
 # GET endpoint for Restaurant
-@router.get("/restaurants/", response_model=list[RestaurantRead])
-def read_restaurants(skip: int = 0, limit: int = 10, db: Session = Depends(get_db)):
-    return get_all_records(db, Restaurant, skip=skip, limit=limit)
+@router.get("/restaurants/", response_model=Page[RestaurantRead])
+async def read_restaurants(
+    request: Request,
+    cursor: str | None = None,
+    limit: int = Query(default=10, gt=0, le=100),
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await read_venue_list(request, db, Restaurant, RestaurantRead, cursor, limit)
 
 
 # POST endpoint for Nightclub
 @router.post("/nightclubs/", response_model=NightclubRead)
-def create_nightclub(
+async def create_nightclub(
     nightclub: NightclubCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserBusiness = Depends(get_business_user),
 ):
     try:
         # Check if the venue exists
         venue_instance = Venue.from_create_schema(nightclub.venue)
-        create_record(db, venue_instance)  # Persist the new venue
+        await create_record_async(db, venue_instance)  # Persist the new venue
         # Use the newly created venue instance
         nightclub_instance = Nightclub.from_create_schema(venue_instance.id, nightclub)
         # Create the new Foodcourt record in the database
-        create_record(db, nightclub_instance)
+        await create_record_async(db, nightclub_instance)
+        await db.refresh(nightclub_instance, ["venue"])
         association = UserVenueAssociation(
             user_id=current_user.id, venue_id=venue_instance.id
         )
-        create_record(db, association)
+        await create_record_async(db, association)
+        get_venue_permission_cache().invalidate(current_user.id)
+        get_versioned_cache("venue").invalidate(Nightclub.__tablename__)
         return nightclub_instance.to_read_schema()
 
     except Exception as e:
         # Rollback the session in case of any error
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=str(e))  # Respond with a 500 error
 
 
 # GET endpoint for Nightclub
-@router.get("/nightclubs/", response_model=list[NightclubRead])
-def read_nightclubs(skip: int = 0, limit: int = 10, db: Session = Depends(get_db)):
-    return get_all_records(db, Nightclub, skip=skip, limit=limit)
+@router.get("/nightclubs/", response_model=Page[NightclubRead])
+async def read_nightclubs(
+    request: Request,
+    cursor: str | None = None,
+    limit: int = Query(default=10, gt=0, le=100),
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await read_venue_list(request, db, Nightclub, NightclubRead, cursor, limit)
+
+
+@router.get("/nearby", response_model=list[NearbyVenueRead])
+async def read_nearby_venues(
+    latitude: float = Query(ge=-90, le=90),
+    longitude: float = Query(ge=-180, le=180),
+    radius: float = Query(default=3000, gt=0, le=50_000),
+    venue_type: VenueType | None = None,
+    open_now: bool = False,
+    min_price: float | None = Query(default=None, ge=0),
+    max_price: float | None = Query(default=None, ge=0),
+    limit: int = Query(default=20, gt=0, le=100),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Venues within ``radius`` metres of a point, nearest first, optionally
+    filtered by type, open now, and average expense for two.
+    """
+    nearby = await find_nearby_venues(
+        db,
+        latitude,
+        longitude,
+        radius,
+        venue_type=venue_type,
+        open_now=open_now,
+        min_price=min_price,
+        max_price=max_price,
+        limit=limit,
+    )
+    return [
+        NearbyVenueRead(venue=venue.to_read_schema(), distance_m=round(distance, 1))
+        for venue, distance in nearby
+    ]
 
 
 @router.get("/my-venues/", response_model=VenueListResponse)
 async def get_my_venues(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserBusiness = Depends(get_business_user),
 ):
     """
-    Retrieve the venues managed by the current user, organized by venue type.
+    Retrieve the venues managed by the current user, organized by venue type,
+    in a constant number of queries.
+    """
+    return await load_managed_venues(db, current_user.id)
+
 
-    This method leverages SQLAlchemy's efficient querying capabilities to minimize database load
-    while ensuring data integrity through the association table, UserVenueAssociation.
+@router.get("/{venue_id}/occupancy", response_model=OccupancyRead)
+async def read_occupancy(
+    venue_id: uuid.UUID,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    How many people are inside a nightclub now, against its capacity, from
+    its live counter.
+    """
+    occupancy = await get_occupancy(db, venue_id)
+    if occupancy is None:
+        raise HTTPException(status_code=404, detail="Nightclub not found")
+    return occupancy
+
+
+async def managed_nightclub_id(
+    db: AsyncSession, current_user: UserBusiness, venue_id: uuid.UUID
+) -> uuid.UUID:
+    await check_user_permission_async(db, current_user, venue_id)
+    nightclub = await resolve_nightclub(db, venue_id)
+    if nightclub is None:
+        raise HTTPException(status_code=404, detail="Nightclub not found")
+    return nightclub[0]
+
+
+@router.post("/{venue_id}/visits", response_model=ClubVisitRead, status_code=201)
+async def create_visit(
+    venue_id: uuid.UUID,
+    visit_in: ClubVisitCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserBusiness = Depends(get_business_user),
+):
+    """
+    Let a visitor into a nightclub the user manages, counting them in.
     """
+    nightclub_id = await managed_nightclub_id(db, current_user, venue_id)
+    return await record_entry(db, nightclub_id, visit_in)
 
-    # Fetch all venues managed by the current user
-    managed_venues = (
-        db.query(Venue)
-        .join(UserVenueAssociation)
-        .filter(UserVenueAssociation.user_id == current_user.id)
-        .all()
-    )
 
-    # Create a set for fast membership testing
-    managed_venue_ids = {venue.id for venue in managed_venues}
-
-    # Initialize lists for categorized venues
-    nightclubs, qsrs, foodcourts, restaurants = [], [], [], []
-
-    # Efficiently query and convert Nightclubs
-    for nightclub in (
-        db.query(Nightclub).filter(Nightclub.venue_id.in_(managed_venue_ids)).all()
-    ):
-        nightclubs.append(nightclub.to_read_schema())
-
-    # Efficiently query and convert QSRs
-    for qsr in db.query(QSR).filter(QSR.venue_id.in_(managed_venue_ids)).all():
-        qsrs.append(qsr.to_read_schema())
-
-    # Efficiently query and convert Foodcourts
-    for foodcourt in (
-        db.query(Foodcourt).filter(Foodcourt.venue_id.in_(managed_venue_ids)).all()
-    ):
-        foodcourts.append(foodcourt.to_read_schema())
-
-    # Efficiently query and convert Restaurants
-    for restaurant in (
-        db.query(Restaurant).filter(Restaurant.venue_id.in_(managed_venue_ids)).all()
-    ):
-        restaurants.append(restaurant.to_read_schema())
-
-    # Construct and return the response
-    return VenueListResponse(
-        nightclubs=nightclubs, qsrs=qsrs, foodcourts=foodcourts, restaurants=restaurants
-    )
+@router.post("/{venue_id}/visits/{visit_id}/exit", status_code=204)
+async def exit_visit(
+    venue_id: uuid.UUID,
+    visit_id: uuid.UUID,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserBusiness = Depends(get_business_user),
+):
+    """
+    Record a visitor leaving a nightclub the user manages, counting them out.
+    """
+    nightclub_id = await managed_nightclub_id(db, current_user, venue_id)
+    if not await record_exit(db, nightclub_id, visit_id):
+        raise HTTPException(status_code=404, detail="Open visit not found")
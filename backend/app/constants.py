@@ -6,3 +6,75 @@ class Gender(Enum):
     MALE = "male"
     FEMALE = "female"
     OTHERS = ("others",)
+
+
+class PrincipalKind(str, Enum):
+    """Kind of principal a token was issued to, carried in its ``user_type`` claim."""
+
+    PUBLIC = "public"
+    BUSINESS = "business"
+    SUPERUSER = "superuser"
+
+
+class VenueType(str, Enum):
+    """Venue subtypes; values match their table names."""
+
+    FOODCOURT = "foodcourt"
+    QSR = "qsr"
+    RESTAURANT = "restaurant"
+    NIGHTCLUB = "nightclub"
+
+
+class MenuExportFormat(str, Enum):
+    JSON = "json"
+    CSV = "csv"
+
+
+class OrderStatus(str, Enum):
+    PLACED = "placed"
+    PAID = "paid"
+    COMPLETED = "completed"
+    CANCELLED = "cancelled"
+
+
+class WalletEntryKind(str, Enum):
+    TOPUP = "topup"
+    SPEND = "spend"
+    # Correction recorded by a migration or an operator, never by the app
+    ADJUSTMENT = "adjustment"
+
+
+class BookingStatus(str, Enum):
+    HELD = "held"
+    CONFIRMED = "confirmed"
+    EXPIRED = "expired"
+    CANCELLED = "cancelled"
+
+
+class PaymentStatus(str, Enum):
+    PENDING = "pending"
+    PAID = "paid"
+    FAILED = "failed"
+    REFUNDED = "refunded"
+
+
+class PaymentSource(str, Enum):
+    NIGHTCLUB = "nightclub"
+    QSR = "qsr"
+    RESTAURANT = "restaurant"
+    EVENT = "event"
+
+
+class WebhookOutcome(str, Enum):
+    # The payment moved to the reported status
+    APPLIED = "applied"
+    # The payment already had that status, or a later one
+    IGNORED = "ignored"
+    # No payment has the transaction ID, after every retry
+    UNMATCHED = "unmatched"
+
+
+class RollupGranularity(str, Enum):
+    # Values are date_trunc() field names
+    HOUR = "hour"
+    DAY = "day"
@@ -0,0 +1,58 @@
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+Job = Callable[[], Awaitable[object]]
+
+
+@dataclass
+class PeriodicJob:
+    name: str
+    interval_seconds: float
+    run: Job
+
+
+class PeriodicJobRunner:
+    """
+    Runs registered jobs at a fixed interval inside each API worker, for as
+    long as the application is up. A failing run is logged and retried at
+    the next interval. Jobs must therefore be safe to run in several workers
+    at once.
+    """
+
+    def __init__(self) -> None:
+        self.jobs: list[PeriodicJob] = []
+        self._tasks: list[asyncio.Task[None]] = []
+
+    def register(self, name: str, interval_seconds: float, run: Job) -> None:
+        self.jobs.append(PeriodicJob(name, interval_seconds, run))
+
+    async def _loop(self, job: PeriodicJob) -> None:
+        while True:
+            await asyncio.sleep(job.interval_seconds)
+            try:
+                await job.run()
+            except Exception:
+                logger.exception("Periodic job failed job=%s", job.name)
+
+    def start(self) -> None:
+        if not settings.BACKGROUND_JOBS_ENABLED:
+            logger.info("Periodic jobs disabled")
+            return
+        for job in self.jobs:
+            self._tasks.append(asyncio.create_task(self._loop(job), name=job.name))
+        logger.info("Started periodic jobs jobs=%s", [job.name for job in self.jobs])
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
+
+periodic_jobs = PeriodicJobRunner()
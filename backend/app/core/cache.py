@@ -0,0 +1,245 @@
+import hashlib
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from functools import cache, lru_cache
+from typing import NamedTuple
+
+from pydantic import BaseModel
+
+from app.core.config import settings
+
+
+class CacheBackend(ABC):
+    """
+    Minimal key/value interface shared by the in-process and Redis caches.
+
+    Values are raw bytes so callers decide how to serialise them. Counters
+    (``incr``) are kept apart from cached values and are never evicted.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> bytes | None:
+        """Return the value stored under ``key`` or None if absent or expired."""
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, ttl: int | None = None) -> None:
+        """Store ``value`` under ``key``, optionally expiring after ``ttl`` seconds."""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove ``key`` if present."""
+
+    @abstractmethod
+    def get_counter(self, key: str) -> int:
+        """Return the current value of counter ``key`` (0 if never incremented)."""
+
+    @abstractmethod
+    def incr(self, key: str) -> int:
+        """Atomically increment counter ``key`` and return the new value."""
+
+
+class LRUCacheBackend(CacheBackend):
+    """
+    Thread-safe in-process LRU cache with optional per-entry TTL.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[bytes, float | None]] = OrderedDict()
+        self._counters: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, ttl: int | None = None) -> None:
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def get_counter(self, key: str) -> int:
+        with self._lock:
+            return self._counters.get(key, 0)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            value = self._counters.get(key, 0) + 1
+            self._counters[key] = value
+            return value
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Cache shared by every worker through Redis.
+    """
+
+    def __init__(self, url: str):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+
+    def get(self, key: str) -> bytes | None:
+        return self.client.get(key)
+
+    def set(self, key: str, value: bytes, ttl: int | None = None) -> None:
+        self.client.set(key, value, ex=ttl)
+
+    def delete(self, key: str) -> None:
+        self.client.delete(key)
+
+    def get_counter(self, key: str) -> int:
+        value = self.client.get(key)
+        return int(value) if value is not None else 0
+
+    def incr(self, key: str) -> int:
+        return int(self.client.incr(key))
+
+
+class CachedPayload(NamedTuple):
+    etag: str
+    payload: bytes
+
+    @classmethod
+    def from_payload(cls, payload: bytes) -> "CachedPayload":
+        """Wrap ``payload`` with a strong ETag derived from its content."""
+        return cls(
+            etag=f'"{hashlib.sha256(payload).hexdigest()[:32]}"', payload=payload
+        )
+
+
+class CacheStats(BaseModel):
+    hits: int
+    misses: int
+    invalidations: int
+    hit_ratio: float
+
+
+class VersionedCache:
+    """
+    Serialized response payloads grouped into scopes (e.g. one venue) that
+    are invalidated together by bumping the scope's version counter.
+
+    A payload built from data read before a write is stored under the old
+    version and can never be served after the write, even if it is stored
+    after the invalidation. Each payload is kept with a strong ETag derived
+    from its content, so the tag is identical on every worker.
+    """
+
+    def __init__(self, backend: CacheBackend, namespace: str, ttl: int | None = None):
+        self.backend = backend
+        self.namespace = namespace
+        self.ttl = ttl
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+        self._lock = threading.Lock()
+
+    def _version_key(self, scope: object) -> str:
+        return f"{self.namespace}:version:{scope}"
+
+    def _entry_key(self, scope: object, version: int, *key_parts: object) -> str:
+        return ":".join(
+            [self.namespace, str(scope), f"v{version}", *map(str, key_parts)]
+        )
+
+    def version(self, scope: object) -> int:
+        return self.backend.get_counter(self._version_key(scope))
+
+    def lookup(
+        self, scope: object, *key_parts: object
+    ) -> tuple[int, CachedPayload | None]:
+        """
+        Return the scope's current version and the payload cached for
+        ``key_parts`` under it, if any. Pass the version back to ``store`` on a miss.
+        """
+        version = self.version(scope)
+        raw = self.backend.get(self._entry_key(scope, version, *key_parts))
+        with self._lock:
+            if raw is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+        if raw is None:
+            return version, None
+        etag, _, payload = raw.partition(b"\n")
+        return version, CachedPayload(etag=etag.decode(), payload=payload)
+
+    def store(
+        self,
+        scope: object,
+        version: int,
+        payload: bytes,
+        *key_parts: object,
+        ttl: int | None = None,
+    ) -> CachedPayload:
+        """
+        Cache ``payload`` for ``key_parts`` under ``version`` and return it with its ETag.
+        ``ttl`` overrides the cache's default TTL for this entry.
+        """
+        cached = CachedPayload.from_payload(payload)
+        self.backend.set(
+            self._entry_key(scope, version, *key_parts),
+            cached.etag.encode() + b"\n" + payload,
+            ttl=self.ttl if ttl is None else ttl,
+        )
+        return cached
+
+    def invalidate(self, scope: object) -> int:
+        """
+        Bump the scope's version and evict its unkeyed entry for the old version.
+        Keyed entries of the old version are unreachable and age out on their own.
+        """
+        new_version = self.backend.incr(self._version_key(scope))
+        self.backend.delete(self._entry_key(scope, new_version - 1))
+        with self._lock:
+            self._invalidations += 1
+        return new_version
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            total = self._hits + self._misses
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                invalidations=self._invalidations,
+                hit_ratio=self._hits / total if total else 0.0,
+            )
+
+
+@lru_cache(maxsize=1)
+def get_cache_backend() -> CacheBackend:
+    """
+    Return the process-wide cache backend: Redis when REDIS_URL is configured,
+    otherwise an in-process LRU.
+    """
+    if settings.REDIS_URL:
+        return RedisCacheBackend(settings.REDIS_URL)
+    return LRUCacheBackend(max_entries=settings.CACHE_MAX_ENTRIES)
+
+
+@cache
+def get_versioned_cache(namespace: str) -> VersionedCache:
+    """
+    Return the process-wide versioned cache for ``namespace``.
+    """
+    return VersionedCache(
+        get_cache_backend(), namespace=namespace, ttl=settings.CACHE_TTL_SECONDS
+    )
@@ -1,3 +1,4 @@
+import logging
 import secrets
 import warnings
 from typing import Annotated, Any, ClassVar, Literal
@@ -12,6 +13,8 @@ from pydantic import (
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing_extensions import Self
 
+logger = logging.getLogger(__name__)
+
 
 def parse_cors(v: Any) -> list[str] | str:
     if isinstance(v, str) and not v.startswith("["):
@@ -37,6 +40,7 @@ class Settings(BaseSettings):
     CLIENT_SECRET: str
     REFRESH_TOKEN_EXPIRE_DAYS: ClassVar[int] = 365  # Use ClassVar if it's a constant
     ALGORITHM: str = "HS256"
+
     @computed_field  # type: ignore[prop-decorator]
     @property
     def server_host(self) -> str:
@@ -57,11 +61,104 @@ class Settings(BaseSettings):
     POSTGRES_PASSWORD: str = ""
     POSTGRES_DB: str = ""
 
+    # Connection pool, applied to both the sync and the async engine
+    POSTGRES_POOL_SIZE: int = 5
+    POSTGRES_MAX_OVERFLOW: int = 10
+    POSTGRES_POOL_TIMEOUT: float = 30
+    POSTGRES_POOL_RECYCLE: int = 30 * 60
+    POSTGRES_POOL_PRE_PING: bool = True
+    # Set when connecting through PgBouncer in transaction mode, which cannot
+    # keep server-side prepared statements across transactions.
+    POSTGRES_PGBOUNCER: bool = False
+
     @computed_field  # type: ignore[prop-decorator]
     @property
     def SQLALCHEMY_DATABASE_URI(self) -> str:
         return f"postgresql://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_SERVER}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
 
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def SQLALCHEMY_ASYNC_DATABASE_URI(self) -> str:
+        return f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_SERVER}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
+
+    # Local time zone of the venues, used to evaluate opening hours
+    VENUE_TIMEZONE: str = "Asia/Kolkata"
+
+    # Bulk QR code creation: most codes per request, and the number of worker
+    # processes rendering QR images for the printable ZIP.
+    QR_BULK_MAX_CODES: int = 500
+    QR_IMAGE_WORKERS: int = 2
+
+    # Orders: tax charged on the item subtotal, and the most lines per order.
+    ORDER_TAX_RATE: float = 0.05
+    ORDER_MAX_ITEMS: int = 100
+
+    # Live order events for venue staff. "postgres" publishes with NOTIFY and
+    # fans out from one LISTEN connection per worker; "memory" keeps events
+    # within the worker. LISTEN needs a session-level connection, so behind
+    # PgBouncer in transaction mode point ORDER_EVENTS_DATABASE_URL at Postgres
+    # directly; without it events stay within the worker. Slow clients are
+    # disconnected once their queue is full.
+    ORDER_EVENTS_BROKER: Literal["postgres", "memory"] = "postgres"
+    ORDER_EVENTS_DATABASE_URL: str | None = None
+    ORDER_EVENTS_QUEUE_SIZE: int = 100
+    ORDER_EVENTS_HEARTBEAT_SECONDS: int = 15
+
+    # Event passes are held for a buyer this long before they return to sale,
+    # by a sweep running every EVENT_HOLD_SWEEP_INTERVAL_SECONDS.
+    EVENT_HOLD_SECONDS: int = 10 * 60
+    EVENT_MAX_PASSES_PER_BOOKING: int = 10
+    EVENT_HOLD_SWEEP_INTERVAL_SECONDS: int = 30
+    EVENT_HOLD_SWEEP_BATCH: int = 500
+
+    # Payment gateway. Webhooks must be signed with PAYMENT_WEBHOOK_SECRET
+    # (HMAC-SHA256 of the body, hex, in X-Signature) and are refused while it
+    # is unset. The worker applies stored webhooks every
+    # PAYMENT_WEBHOOK_POLL_SECONDS. Payments left pending are polled from the
+    # gateway at PAYMENT_GATEWAY_URL with exponential backoff, starting at
+    # PAYMENT_RETRY_BASE_SECONDS, and fail after PAYMENT_RETRY_MAX_ATTEMPTS.
+    PAYMENT_WEBHOOK_SECRET: str | None = None
+    PAYMENT_WEBHOOK_POLL_SECONDS: float = 1
+    PAYMENT_WEBHOOK_BATCH: int = 500
+    PAYMENT_GATEWAY_URL: str | None = None
+    PAYMENT_GATEWAY_TIMEOUT_SECONDS: float = 10
+    PAYMENT_RETRY_INTERVAL_SECONDS: int = 30
+    PAYMENT_RETRY_BASE_SECONDS: int = 30
+    PAYMENT_RETRY_MAX_ATTEMPTS: int = 8
+
+    # Venue sales analytics are read from hourly and daily rollups, which a
+    # job brings up to date every ANALYTICS_ROLLUP_INTERVAL_SECONDS. It only
+    # rolls up orders placed at least ANALYTICS_ROLLUP_LAG_SECONDS ago, so
+    # that orders still being committed are not skipped. Reports span at
+    # most ANALYTICS_MAX_BUCKETS buckets.
+    ANALYTICS_ROLLUP_INTERVAL_SECONDS: int = 5 * 60
+    ANALYTICS_ROLLUP_LAG_SECONDS: int = 2 * 60
+    ANALYTICS_MAX_BUCKETS: int = 1000
+
+    # Live nightclub occupancy. "postgres" keeps the counters in
+    # nightclub_occupancy, changed in the transaction recording the entry or
+    # exit; "redis" keeps them in a hash at REDIS_URL, changed once that
+    # transaction commits, so that a busy door never waits on a row lock.
+    # Either way they are recounted from the open club visits every
+    # OCCUPANCY_RECONCILE_INTERVAL_SECONDS.
+    OCCUPANCY_BACKEND: Literal["postgres", "redis"] = "postgres"
+    OCCUPANCY_RECONCILE_INTERVAL_SECONDS: int = 5 * 60
+
+    # Periodic jobs (reconciliation, sweepers) run in every API worker unless
+    # disabled, e.g. to run them from a single dedicated deployment instead.
+    BACKGROUND_JOBS_ENABLED: bool = True
+    WALLET_RECONCILE_INTERVAL_SECONDS: int = 60 * 60
+
+    # Shared cache. Leave REDIS_URL unset to use an in-process LRU per worker;
+    # invalidations are then local to the worker, so the TTL bounds how long
+    # other workers may serve a stale entry.
+    REDIS_URL: str | None = None
+    CACHE_MAX_ENTRIES: int = 1024
+    CACHE_TTL_SECONDS: int = 5 * 60
+    # Authenticated principals are cached briefly so that most requests need
+    # no user lookup; user updates and logout invalidate them early.
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+
     SMTP_TLS: bool = True
     SMTP_SSL: bool = False
     SMTP_PORT: int = 587
@@ -109,10 +206,13 @@ class Settings(BaseSettings):
         self._check_default_secret(
             "FIRST_SUPERUSER_PASSWORD", self.FIRST_SUPERUSER_PASSWORD
         )
-        print(f"FIRST_SUPERUSER_PASSWORD: {self.FIRST_SUPERUSER_PASSWORD}")
 
         return self
 
-print("About to initialize Settings...")
+
 settings = Settings()
-print("Settings initialized.")
+logger.debug(
+    "settings loaded environment=%s project=%s",
+    settings.ENVIRONMENT,
+    settings.PROJECT_NAME,
+)
@@ -1,14 +1,115 @@
+import logging
+import uuid
+from functools import lru_cache
+from typing import Any
+
+from sqlalchemy import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlmodel import Session, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.config import settings
+from app.core.pool import (
+    DatabasePoolStats,
+    InstrumentedAsyncQueuePool,
+    InstrumentedQueuePool,
+    PoolStats,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def pool_options() -> dict[str, Any]:
+    """
+    Engine keyword arguments for the connection pool, from Settings.
+    """
+    return {
+        "pool_size": settings.POSTGRES_POOL_SIZE,
+        "max_overflow": settings.POSTGRES_MAX_OVERFLOW,
+        "pool_timeout": settings.POSTGRES_POOL_TIMEOUT,
+        "pool_recycle": settings.POSTGRES_POOL_RECYCLE,
+        "pool_pre_ping": settings.POSTGRES_POOL_PRE_PING,
+    }
 
-print("SQLALCHEMY_DATABASE_URI : ", str(settings.SQLALCHEMY_DATABASE_URI))
-engine = create_engine(str(settings.SQLALCHEMY_DATABASE_URI))
-print("engine created : ")
 
-connection = engine.connect()
-print("Connection successful!")
-connection.close()
+def async_connect_args() -> dict[str, Any]:
+    """
+    asyncpg connect arguments. In PgBouncer mode statement caching is turned
+    off and every prepared statement gets a unique name, so a statement
+    prepared on one server connection is never looked up on another.
+    """
+    if not settings.POSTGRES_PGBOUNCER:
+        return {}
+    return {
+        "statement_cache_size": 0,
+        "prepared_statement_cache_size": 0,
+        "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+    }
+
+
+@lru_cache
+def get_engine() -> Engine:
+    """
+    The sync engine, created on first use so importing this module neither
+    builds a pool nor touches the database.
+    """
+    # psycopg2 does not use server-side prepared statements, so the sync
+    # engine needs no PgBouncer-specific arguments.
+    engine = create_engine(
+        str(settings.SQLALCHEMY_DATABASE_URI),
+        poolclass=InstrumentedQueuePool,
+        **pool_options(),
+    )
+    logger.info(
+        "database engine created kind=sync host=%s port=%s pool_size=%s",
+        settings.POSTGRES_SERVER,
+        settings.POSTGRES_PORT,
+        settings.POSTGRES_POOL_SIZE,
+    )
+    return engine
+
+
+@lru_cache
+def get_async_engine() -> AsyncEngine:
+    """
+    The async engine for request handlers, created on first use. It keeps its
+    own pool next to the sync engine, which still serves the user/login
+    routes and startup scripts.
+    """
+    engine = create_async_engine(
+        str(settings.SQLALCHEMY_ASYNC_DATABASE_URI),
+        poolclass=InstrumentedAsyncQueuePool,
+        connect_args=async_connect_args(),
+        **pool_options(),
+    )
+    logger.info(
+        "database engine created kind=async host=%s port=%s pool_size=%s pgbouncer=%s",
+        settings.POSTGRES_SERVER,
+        settings.POSTGRES_PORT,
+        settings.POSTGRES_POOL_SIZE,
+        settings.POSTGRES_PGBOUNCER,
+    )
+    return engine
+
+
+@lru_cache
+def get_async_session_maker() -> async_sessionmaker[AsyncSession]:
+    # expire_on_commit=False: an expired attribute would need a lazy load on
+    # access, and lazy loads cannot run implicitly under asyncio.
+    return async_sessionmaker(
+        get_async_engine(), class_=AsyncSession, expire_on_commit=False
+    )
+
+
+def get_pool_stats() -> DatabasePoolStats:
+    """
+    Current pool gauges of both engines in this worker.
+    """
+    return DatabasePoolStats(
+        engine=PoolStats.from_pool(get_engine().pool),
+        async_engine=PoolStats.from_pool(get_async_engine().sync_engine.pool),
+    )
+
 
 def init_db() -> None:
     """
@@ -16,8 +117,8 @@ def init_db() -> None:
     Assumes that database schema is up-to-date due to Alembic migrations.
     """
     # Example: Create the superuser if it does not exist
-    with Session(engine) as session:
-        print("here")
+    with Session(get_engine()) as session:  # noqa: F841
+        logger.info("initializing database")
         # Check for existing superuser
         # superuser = session.exec(
         #     select(UserBusiness).where(UserBusiness.email == settings.FIRST_SUPERUSER)
@@ -46,4 +147,4 @@ def init_db() -> None:
         # Example: Create default Nightclub, Foodcourt, etc.
         # ...
 
-    print("Database initialization complete.")
+    logger.info("database initialization complete")
@@ -0,0 +1,97 @@
+import threading
+import time
+
+from pydantic import BaseModel
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from sqlalchemy.pool.base import ConnectionPoolEntry
+
+
+class PoolWaitTimer:
+    """
+    Accumulates how long checkouts waited for a pooled connection.
+    """
+
+    def __init__(self) -> None:
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.timeouts += timed_out
+            self.total_seconds += seconds
+            self.max_seconds = max(self.max_seconds, seconds)
+
+
+class WaitTimingMixin:
+    """
+    Times every checkout of a QueuePool, including the time spent queued
+    behind other requests once the pool and its overflow are exhausted.
+    """
+
+    _wait_timer: PoolWaitTimer
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        if not hasattr(self, "_wait_timer"):
+            self._wait_timer = PoolWaitTimer()
+        start = time.perf_counter()
+        try:
+            entry = super()._do_get()  # type: ignore[misc]
+        except exc.TimeoutError:
+            self._wait_timer.record(time.perf_counter() - start, timed_out=True)
+            raise
+        self._wait_timer.record(time.perf_counter() - start)
+        return entry
+
+    def recreate(self):  # type: ignore[no-untyped-def]
+        # Keep the counters when the pool is recreated after an invalidation
+        pool = super().recreate()  # type: ignore[misc]
+        if hasattr(self, "_wait_timer"):
+            pool._wait_timer = self._wait_timer
+        return pool
+
+
+class InstrumentedQueuePool(WaitTimingMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(WaitTimingMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+class PoolStats(BaseModel):
+    """
+    Gauges of one engine's connection pool, plus cumulative checkout waits.
+    """
+
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    checkouts: int
+    timeouts: int
+    wait_seconds_total: float
+    wait_seconds_max: float
+
+    @classmethod
+    def from_pool(cls, pool: QueuePool) -> "PoolStats":
+        timer = getattr(pool, "_wait_timer", None) or PoolWaitTimer()
+        return cls(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=max(pool.overflow(), 0),
+            checkouts=timer.checkouts,
+            timeouts=timer.timeouts,
+            wait_seconds_total=round(timer.total_seconds, 6),
+            wait_seconds_max=round(timer.max_seconds, 6),
+        )
+
+
+class DatabasePoolStats(BaseModel):
+    engine: PoolStats
+    async_engine: PoolStats
@@ -1,10 +1,19 @@
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 import sentry_sdk
 from fastapi import FastAPI
 from fastapi.routing import APIRoute
 from starlette.middleware.cors import CORSMiddleware
 
 from app.api.main import api_router
+from app.core.background import periodic_jobs
 from app.core.config import settings
+from app.services.analytics import refresh_sales_analytics
+from app.services.event_booking import sweep_expired_holds
+from app.services.occupancy import reconcile_occupancy
+from app.services.payment import process_webhook_events, retry_pending_payments
+from app.services.wallet import reconcile_wallets
 
 
 def custom_generate_unique_id(route: APIRoute) -> str:
@@ -14,8 +23,48 @@ def custom_generate_unique_id(route: APIRoute) -> str:
 if settings.SENTRY_DSN and settings.ENVIRONMENT != "local":
     sentry_sdk.init(dsn=str(settings.SENTRY_DSN), enable_tracing=True)
 
+periodic_jobs.register(
+    "wallet-reconciliation",
+    settings.WALLET_RECONCILE_INTERVAL_SECONDS,
+    reconcile_wallets,
+)
+periodic_jobs.register(
+    "event-hold-sweep",
+    settings.EVENT_HOLD_SWEEP_INTERVAL_SECONDS,
+    sweep_expired_holds,
+)
+periodic_jobs.register(
+    "payment-webhooks",
+    settings.PAYMENT_WEBHOOK_POLL_SECONDS,
+    process_webhook_events,
+)
+periodic_jobs.register(
+    "payment-retries",
+    settings.PAYMENT_RETRY_INTERVAL_SECONDS,
+    retry_pending_payments,
+)
+periodic_jobs.register(
+    "sales-rollups",
+    settings.ANALYTICS_ROLLUP_INTERVAL_SECONDS,
+    refresh_sales_analytics,
+)
+periodic_jobs.register(
+    "occupancy-reconciliation",
+    settings.OCCUPANCY_RECONCILE_INTERVAL_SECONDS,
+    reconcile_occupancy,
+)
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    periodic_jobs.start()
+    yield
+    await periodic_jobs.stop()
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
+    lifespan=lifespan,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     generate_unique_id_function=custom_generate_unique_id,
 )
@@ -8,9 +8,12 @@ from .event_booking import EventBooking
 from .event_offering import EventOffering
 from .group import Group
 from .group_wallet import GroupWallet
+from .group_wallet_ledger import GroupWalletLedgerEntry
 from .group_wallet_topup import GroupWalletTopup
 from .menu import Menu
+from .nightclub_occupancy import NightclubOccupancy
 from .order import NightclubOrder, QSROrder, RestaurantOrder
+from .order_idempotency_key import OrderIdempotencyKey
 from .order_item import OrderItem
 from .payment import (
     PaymentEvent,
@@ -18,8 +21,10 @@ from .payment import (
     PaymentOrderQSR,
     PaymentOrderRestaurant,
 )
+from .payment_webhook_event import PaymentWebhookEvent
 from .pickup_location import PickupLocation
 from .qrcode import QRCode
+from .sales_rollup import MenuItemSalesRollup, SalesRollupWatermark, VenueSalesRollup
 from .user import UserBusiness, UserPublic
 from .venue import QSR, Foodcourt, Nightclub, Restaurant
 
@@ -32,11 +37,13 @@ __all__ = [
     "EventOffering",
     "Group",
     "GroupWallet",
+    "GroupWalletLedgerEntry",
     "GroupWalletTopup",
     "Menu",
     "NightclubOrder",
     "RestaurantOrder",
     "QSROrder",
+    "OrderIdempotencyKey",
     "OrderItem",
     "PickupLocation",
     "UserBusiness",
@@ -49,9 +56,11 @@ __all__ = [
     "PaymentOrderRestaurant",
     "PaymentOrderQSR",
     "PaymentEvent",
+    "PaymentWebhookEvent",
     "QRCode",
     "CarouselPoster",
+    "VenueSalesRollup",
+    "MenuItemSalesRollup",
+    "SalesRollupWatermark",
+    "NightclubOccupancy",
 ]
-
-
-print("target_metadata in init:", SQLModel.metadata.tables)
@@ -1,9 +1,12 @@
 import uuid
 from datetime import datetime, timezone
+from typing import Literal
 
 from pydantic import EmailStr
 from sqlmodel import Field, SQLModel
 
+from app.constants import PrincipalKind
+
 
 class TokenBlacklist(SQLModel, table=True):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
@@ -53,6 +56,20 @@ class OtplessToken(SQLModel):
 class TokenModel(SQLModel):
     sub: str
     exp: int | None = None
+    # None for tokens issued before the claim existed
+    user_type: PrincipalKind | None = None
+
+
+class CachedPrincipal(SQLModel):
+    """
+    The parts of an authenticated user needed to authorize a request,
+    cached so that hits skip the user table lookups.
+    """
+
+    id: uuid.UUID
+    user_type: Literal["public", "business"]
+    is_active: bool
+    is_superuser: bool
 
 
 class RefreshTokenPayload(SQLModel):
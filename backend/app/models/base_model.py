@@ -5,9 +5,18 @@ Base model class for all models in the application.
 from abc import ABC, abstractmethod
 from datetime import datetime, timezone
 
+from sqlalchemy import Index
 from sqlmodel import Field, SQLModel
 
 
+def utcnow() -> datetime:
+    """
+    The current UTC time without tzinfo, as stored in the TIMESTAMP WITHOUT
+    TIME ZONE columns; asyncpg rejects aware datetimes for those.
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
 class BaseTimeModel(SQLModel, ABC):
     """
     Base class for models that require timestamp fields.
@@ -17,12 +26,8 @@ class BaseTimeModel(SQLModel, ABC):
         updated_at (Optional[datetime]): The timestamp when the model instance was last updated.
     """
 
-    created_at: datetime | None = Field(
-        default_factory=lambda: datetime.now(timezone.utc), nullable=True
-    )
-    updated_at: datetime | None = Field(
-        default_factory=lambda: datetime.now(timezone.utc), nullable=True
-    )
+    created_at: datetime | None = Field(default_factory=utcnow, nullable=True)
+    updated_at: datetime | None = Field(default_factory=utcnow, nullable=True)
 
     @abstractmethod
     def to_read_schema(self):
@@ -32,3 +37,10 @@ class BaseTimeModel(SQLModel, ABC):
     @abstractmethod
     def from_create_schema(cls, schema):
         """Create a model instance from the provided create schema."""
+
+
+def keyset_index(table_name: str) -> Index:
+    """
+    Composite (created_at, id) index backing the keyset pagination of a table.
+    """
+    return Index(f"ix_{table_name}_created_at_id", "created_at", "id")
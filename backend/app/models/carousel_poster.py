@@ -2,11 +2,17 @@ import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 
+import h3
+from sqlalchemy import Index, event
 from sqlmodel import Field, Relationship
 
 from app.models.base_model import BaseTimeModel
 from app.schema.carousel_poster import CarouselPosterCreate, CarouselPosterRead
 
+# Coarser resolutions stored next to the resolution-9 h3_index, so a search
+# ring compacted to parent cells can be matched without expanding it again.
+POSTER_PARENT_RESOLUTIONS = (5, 6, 7, 8)
+
 if TYPE_CHECKING:
     from app.models.event import Event
     from app.models.venue import Venue
@@ -14,12 +20,30 @@ if TYPE_CHECKING:
 
 class CarouselPoster(BaseTimeModel, table=True):
     __tablename__ = "carousel_poster"
+    __table_args__ = (
+        Index("ix_carousel_poster_h3_index_expires_at", "h3_index", "expires_at"),
+        *(
+            Index(
+                f"ix_carousel_poster_h3_res{resolution}_expires_at",
+                f"h3_res{resolution}",
+                "expires_at",
+            )
+            for resolution in POSTER_PARENT_RESOLUTIONS
+        ),
+    )
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True, index=True)
     h3_index: str = Field(nullable=True, index=True)
     image_url: str = Field(nullable=False)
     deep_link: str = Field(nullable=False)
     expires_at: datetime = Field(nullable=False)
 
+    # Parents of h3_index at POSTER_PARENT_RESOLUTIONS, kept in sync on flush
+    h3_res5: str | None = Field(default=None)
+    h3_res6: str | None = Field(default=None)
+    h3_res7: str | None = Field(default=None)
+    h3_res8: str | None = Field(default=None)
+
     # Foreign keys [Optional]
     event_id: uuid.UUID | None = Field(default=None, foreign_key="event.id")
     venue_id: uuid.UUID | None = Field(default=None, foreign_key="venue.id")
@@ -48,3 +72,16 @@ class CarouselPoster(BaseTimeModel, table=True):
             event_id=self.event_id,
             venue_id=self.venue_id,
         )
+
+    def set_h3_parents(self) -> None:
+        for resolution in POSTER_PARENT_RESOLUTIONS:
+            parent = (
+                h3.h3_to_parent(self.h3_index, resolution) if self.h3_index else None
+            )
+            setattr(self, f"h3_res{resolution}", parent)
+
+
+@event.listens_for(CarouselPoster, "before_insert")
+@event.listens_for(CarouselPoster, "before_update")
+def _sync_poster_h3_parents(mapper, connection, poster: CarouselPoster) -> None:  # noqa: ARG001
+    poster.set_h3_parents()
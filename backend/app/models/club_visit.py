@@ -2,6 +2,7 @@ import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 
+from sqlalchemy import Index, text
 from sqlmodel import Field, Relationship, SQLModel
 
 if TYPE_CHECKING:
@@ -11,6 +12,14 @@ if TYPE_CHECKING:
 
 
 class ClubVisit(SQLModel, table=True):
+    __table_args__ = (
+        # The visits still open, counted by the occupancy reconciliation
+        Index(
+            "ix_clubvisit_open_nightclub_id",
+            "nightclub_id",
+            postgresql_where=text("exit_time IS NULL"),
+        ),
+    )
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     user_id: uuid.UUID | None = Field(foreign_key="user_public.id", nullable=False)
     group_id: uuid.UUID | None = Field(foreign_key="group.id", nullable=True)
@@ -2,6 +2,7 @@ import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 
+from sqlalchemy import Column, ForeignKey, Index, Uuid, text
 from sqlmodel import Field, Relationship, SQLModel
 
 if TYPE_CHECKING:
@@ -13,13 +14,32 @@ if TYPE_CHECKING:
 
 class EventBooking(SQLModel, table=True):
     __tablename__ = "event_booking"
+    __table_args__ = (
+        # Only held bookings are swept, so only they are indexed
+        Index(
+            "ix_event_booking_held_expires_at",
+            "hold_expires_at",
+            postgresql_where=text("status = 'held'"),
+        ),
+    )
 
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     user_id: uuid.UUID | None = Field(foreign_key="user_public.id", nullable=False)
     event_id: uuid.UUID | None = Field(foreign_key="event.id", nullable=False)
     booking_time: datetime = Field(nullable=False)
     total_amount: float = Field(nullable=False)
-    status: str = Field(nullable=False)
+    status: str = Field(nullable=False)  # BookingStatus
+    # The offering and number of passes booked. event_offering also points
+    # here, so the key is added after both tables exist.
+    offering_id: uuid.UUID | None = Field(
+        default=None,
+        sa_column=Column(
+            Uuid, ForeignKey("event_offering.id", use_alter=True), nullable=True
+        ),
+    )
+    quantity: int = Field(default=1, nullable=False)
+    # When a held booking lapses unless confirmed; None once it is not held
+    hold_expires_at: datetime | None = Field(default=None)
 
     # Relationships
     user: Optional["UserPublic"] = Relationship(back_populates="event_bookings")
@@ -28,5 +48,9 @@ class EventBooking(SQLModel, table=True):
         back_populates="event_booking", sa_relationship_kwargs={"uselist": False}
     )
     event_offerings: list["EventOffering"] = Relationship(
-        back_populates="event_booking"
+        back_populates="event_booking",
+        sa_relationship_kwargs={"foreign_keys": "[EventOffering.event_booking_id]"},
+    )
+    offering: Optional["EventOffering"] = Relationship(
+        sa_relationship_kwargs={"foreign_keys": "[EventBooking.offering_id]"}
     )
@@ -1,6 +1,7 @@
 import uuid
 from typing import TYPE_CHECKING, Optional
 
+from sqlalchemy import CheckConstraint
 from sqlmodel import Field, Relationship, SQLModel
 
 if TYPE_CHECKING:
@@ -11,19 +12,29 @@ if TYPE_CHECKING:
 # Stag, couple etc
 class EventOffering(SQLModel, table=True):
     __tablename__ = "event_offering"
+    __table_args__ = (
+        CheckConstraint(
+            "availability >= 0", name="ck_event_offering_availability_non_negative"
+        ),
+    )
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True, index=True)
     event_id: uuid.UUID = Field(foreign_key="event.id", nullable=False)
-    event_booking_id: uuid.UUID = Field(foreign_key="event_booking.id", nullable=False)
+    event_booking_id: uuid.UUID | None = Field(
+        default=None, foreign_key="event_booking.id"
+    )
     offering_type: str = Field(nullable=False)
     description: str = Field(nullable=False)
     price: float = Field(nullable=False)
     total_guests_per_pass: int = Field(nullable=False)
     cover_charge: float | None = Field(nullable=True)
     additional_charges: float | None = Field(nullable=True)
+    # Passes left to sell. Only change it through app.services.event_booking;
+    # held passes are already subtracted.
     availability: int = Field(nullable=False)
 
     # Relationships
     event: Optional["Event"] = Relationship(back_populates="offerings")
     event_booking: Optional["EventBooking"] = Relationship(
-        back_populates="event_offerings"
+        back_populates="event_offerings",
+        sa_relationship_kwargs={"foreign_keys": "[EventOffering.event_booking_id]"},
     )
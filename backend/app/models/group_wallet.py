@@ -1,20 +1,36 @@
 import uuid
+from decimal import Decimal
 from typing import TYPE_CHECKING, Optional
 
+from sqlalchemy import CheckConstraint
 from sqlmodel import Field, Relationship, SQLModel
 
 if TYPE_CHECKING:
     from app.models.group import Group
+    from app.models.group_wallet_ledger import GroupWalletLedgerEntry
     from app.models.group_wallet_topup import GroupWalletTopup
 
 
-# (TODO) Added another model : Group wallet transactions
 class GroupWallet(SQLModel, table=True):
+    """
+    A group's shared balance. Only change it through app.services.wallet,
+    which records every change in the ledger; the balance must always equal
+    the sum of the wallet's ledger entries.
+    """
+
     __tablename__ = "group_wallet"
+    __table_args__ = (
+        CheckConstraint("balance >= 0", name="ck_group_wallet_balance_non_negative"),
+    )
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True, index=True)
     group_id: uuid.UUID = Field(foreign_key="group.id", nullable=False, unique=True)
-    balance: float = Field(default=0.0, nullable=False)
+    balance: Decimal = Field(
+        default=Decimal(0), max_digits=12, decimal_places=2, nullable=False
+    )
 
     # Relationships
     group: Optional["Group"] = Relationship(back_populates="wallet")
     topups: list["GroupWalletTopup"] = Relationship(back_populates="group_wallet")
+    ledger_entries: list["GroupWalletLedgerEntry"] = Relationship(
+        back_populates="group_wallet"
+    )
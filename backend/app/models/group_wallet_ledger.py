@@ -0,0 +1,40 @@
+import uuid
+from datetime import datetime
+from decimal import Decimal
+from typing import TYPE_CHECKING, Optional
+
+from sqlalchemy import Index
+from sqlmodel import Field, Relationship, SQLModel
+
+from app.models.base_model import utcnow
+
+if TYPE_CHECKING:
+    from app.models.group_wallet import GroupWallet
+
+
+class GroupWalletLedgerEntry(SQLModel, table=True):
+    """
+    One change of a group wallet's balance. Entries are only ever inserted:
+    ``amount`` is positive for top-ups and negative for spends, and
+    ``balance_after`` is the wallet balance the change left.
+    """
+
+    __tablename__ = "group_wallet_ledger"
+    __table_args__ = (
+        Index(
+            "ix_group_wallet_ledger_wallet_created_at", "group_wallet_id", "created_at"
+        ),
+    )
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    group_wallet_id: uuid.UUID = Field(foreign_key="group_wallet.id", nullable=False)
+    kind: str = Field(nullable=False)  # WalletEntryKind
+    amount: Decimal = Field(max_digits=12, decimal_places=2, nullable=False)
+    balance_after: Decimal = Field(max_digits=12, decimal_places=2, nullable=False)
+    # What the entry pays for or comes from, such as an order or a payment
+    reference_id: uuid.UUID | None = Field(default=None)
+    created_at: datetime = Field(default_factory=utcnow, nullable=False)
+
+    # Relationships
+    group_wallet: Optional["GroupWallet"] = Relationship(
+        back_populates="ledger_entries"
+    )
@@ -1,6 +1,8 @@
 import uuid
 from typing import TYPE_CHECKING, Optional
 
+from sqlalchemy import Column, Computed, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlmodel import Field, Relationship
 
 from app.models.base_model import BaseTimeModel
@@ -19,11 +21,42 @@ from app.schema.menu import (
     MenuSubCategoryRead,
 )
 
+# Text search configuration of MenuItem.search_vector, which queries against
+# it must use too
+TEXT_SEARCH_CONFIG = "english"
+
+# Name, ingredients and description, weighted in that order
+SEARCH_VECTOR_EXPRESSION = " || ".join(
+    f"setweight(to_tsvector('{TEXT_SEARCH_CONFIG}', coalesce({column}, '')), '{weight}')"
+    for column, weight in (("name", "A"), ("ingredients", "B"), ("description", "C"))
+)
+
 
 class MenuItem(BaseTimeModel, table=True):
     __tablename__ = "menu_item"
+    __table_args__ = (
+        # Generated by Postgres and left unmapped, so items are never loaded
+        # with it
+        Column(
+            "search_vector",
+            TSVECTOR,
+            Computed(SEARCH_VECTOR_EXPRESSION, persisted=True),
+        ),
+        Index("ix_menu_item_search_vector", "search_vector", postgresql_using="gin"),
+        # Trigram index for names searched with typos
+        Index(
+            "ix_menu_item_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+    )
+    __mapper_args__ = {"exclude_properties": ["search_vector"]}
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True, index=True)
-    subcategory_id: uuid.UUID = Field(foreign_key="menu_subcategory.id", nullable=False)
+    subcategory_id: uuid.UUID = Field(
+        foreign_key="menu_subcategory.id", nullable=False, index=True
+    )
     name: str = Field(nullable=False)
     price: float = Field(nullable=False)
     description: str | None = Field(default=None)
@@ -50,7 +83,6 @@ class MenuItem(BaseTimeModel, table=True):
             ibu=schema.ibu,
         )
 
-    @classmethod
     def to_read_schema(self) -> MenuItemRead:
         return MenuItemRead(
             item_id=self.id,
@@ -72,7 +104,9 @@ class MenuItem(BaseTimeModel, table=True):
 class MenuSubCategory(BaseTimeModel, table=True):
     __tablename__ = "menu_subcategory"
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True, index=True)
-    category_id: uuid.UUID = Field(foreign_key="menu_category.id", nullable=False)
+    category_id: uuid.UUID = Field(
+        foreign_key="menu_category.id", nullable=False, index=True
+    )
     name: str = Field(nullable=False)
     is_alcoholic: bool = Field(default=False)
 
@@ -104,7 +138,7 @@ class MenuSubCategory(BaseTimeModel, table=True):
 class MenuCategory(BaseTimeModel, table=True):
     __tablename__ = "menu_category"
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True, index=True)
-    menu_id: uuid.UUID = Field(foreign_key="menu.id", nullable=False)
+    menu_id: uuid.UUID = Field(foreign_key="menu.id", nullable=False, index=True)
     name: str = Field(nullable=False)
 
     # Relationships
@@ -135,7 +169,7 @@ class Menu(BaseTimeModel, table=True):
     name: str = Field(nullable=False)
     description: str | None = Field(default=None)
     menu_type: str | None = Field(default=None)  # Type of menu (e.g., "Food", "Drink")
-    venue_id: uuid.UUID = Field(foreign_key="venue.id", nullable=False)
+    venue_id: uuid.UUID = Field(foreign_key="venue.id", nullable=False, index=True)
 
     # Relationships
     categories: list["MenuCategory"] = Relationship(back_populates="menu")
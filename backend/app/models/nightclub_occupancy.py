@@ -0,0 +1,23 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import CheckConstraint
+from sqlmodel import Field, SQLModel
+
+from app.models.base_model import utcnow
+
+
+class NightclubOccupancy(SQLModel, table=True):
+    """
+    How many people are inside a nightclub now: its club visits without an
+    exit time. Only change it through app.services.occupancy, which keeps it
+    in step with the visits.
+    """
+
+    __tablename__ = "nightclub_occupancy"
+    __table_args__ = (
+        CheckConstraint("occupancy >= 0", name="ck_nightclub_occupancy_non_negative"),
+    )
+    nightclub_id: uuid.UUID = Field(foreign_key="nightclub.id", primary_key=True)
+    occupancy: int = Field(default=0, nullable=False)
+    updated_at: datetime = Field(default_factory=utcnow, nullable=False)
@@ -2,6 +2,7 @@ import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 
+from sqlalchemy import Index, UniqueConstraint
 from sqlmodel import Field, Relationship, SQLModel
 
 from app.models.group import GroupNightclubOrderLink
@@ -19,22 +20,38 @@ if TYPE_CHECKING:
     from app.models.venue import QSR, Nightclub, Restaurant
 
 
+def order_history_index(table_name: str) -> Index:
+    """
+    Index walked by the user's order history, newest first.
+    """
+    return Index(f"ix_{table_name}_user_id_order_time", "user_id", "order_time", "id")
+
+
 class OrderBase(SQLModel):
     user_id: uuid.UUID = Field(foreign_key="user_public.id")
     pickup_location_id: uuid.UUID | None = Field(
         default=None, foreign_key="pickup_location.id"
     )
     note: str | None = Field(nullable=True)
-    order_time: datetime = Field(nullable=False)
+    order_time: datetime = Field(nullable=False, index=True)
     total_amount: float = Field(nullable=False)
     taxes_and_charges: float | None = Field(default=None)
     cover_charge_used: float | None = Field(default=None)
     status: str = Field(nullable=False)
     service_type: str | None = Field(default=None)
+    # Client-supplied key making order placement safe to retry; unique per user
+    # across the order tables through OrderIdempotencyKey
+    idempotency_key: str | None = Field(default=None, max_length=255)
 
 
 class NightclubOrder(OrderBase, table=True):
     __tablename__ = "nightclub_order"
+    __table_args__ = (
+        UniqueConstraint(
+            "user_id", "idempotency_key", name="uq_nightclub_order_user_idempotency_key"
+        ),
+        order_history_index("nightclub_order"),
+    )
 
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True, index=True)
     venue_id: uuid.UUID | None = Field(default=None, foreign_key="nightclub.id")
@@ -59,6 +76,14 @@ class NightclubOrder(OrderBase, table=True):
 
 class RestaurantOrder(OrderBase, table=True):
     __tablename__ = "restaurant_order"
+    __table_args__ = (
+        UniqueConstraint(
+            "user_id",
+            "idempotency_key",
+            name="uq_restaurant_order_user_idempotency_key",
+        ),
+        order_history_index("restaurant_order"),
+    )
 
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True, index=True)
     venue_id: uuid.UUID | None = Field(default=None, foreign_key="restaurant.id")
@@ -77,10 +102,19 @@ class RestaurantOrder(OrderBase, table=True):
 
 class QSROrder(OrderBase, table=True):
     __tablename__ = "qsr_order"
+    __table_args__ = (
+        UniqueConstraint(
+            "user_id", "idempotency_key", name="uq_qsr_order_user_idempotency_key"
+        ),
+        order_history_index("qsr_order"),
+    )
 
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True, index=True)
     venue_id: uuid.UUID = Field(default=None, foreign_key="qsr.id")
-    payment_id: uuid.UUID = Field(default=None, foreign_key="payment_source_qsr.id")
+    # Set once the order is paid for
+    payment_id: uuid.UUID | None = Field(
+        default=None, foreign_key="payment_source_qsr.id"
+    )
 
     # Relationships
     user: Optional["UserPublic"] = Relationship(back_populates="qsr_orders")
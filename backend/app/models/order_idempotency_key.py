@@ -0,0 +1,21 @@
+import uuid
+from datetime import datetime
+
+from sqlmodel import Field, SQLModel
+
+from app.models.base_model import utcnow
+
+
+class OrderIdempotencyKey(SQLModel, table=True):
+    """
+    The order a user placed with an idempotency key, whatever its venue type.
+    Its primary key makes a key place at most one order across the three
+    order tables.
+    """
+
+    __tablename__ = "order_idempotency_key"
+    user_id: uuid.UUID = Field(foreign_key="user_public.id", primary_key=True)
+    idempotency_key: str = Field(primary_key=True, max_length=255)
+    venue_type: str = Field(nullable=False)
+    order_id: uuid.UUID = Field(nullable=False)
+    created_at: datetime = Field(default_factory=utcnow, nullable=False)
@@ -10,14 +10,18 @@ if TYPE_CHECKING:
 class OrderItem(SQLModel, table=True):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True, index=True)
     nightclub_order_id: uuid.UUID | None = Field(
-        default=None, foreign_key="nightclub_order.id"
+        default=None, foreign_key="nightclub_order.id", index=True
     )
     restaurant_order_id: uuid.UUID | None = Field(
-        default=None, foreign_key="restaurant_order.id"
+        default=None, foreign_key="restaurant_order.id", index=True
+    )
+    qsr_order_id: uuid.UUID | None = Field(
+        default=None, foreign_key="qsr_order.id", index=True
     )
-    qsr_order_id: uuid.UUID | None = Field(default=None, foreign_key="qsr_order.id")
     item_id: uuid.UUID = Field(foreign_key="menu_item.id", nullable=False)
     quantity: int = Field(nullable=False)
+    # Menu price of the item when the order was placed
+    unit_price: float | None = Field(default=None)
 
     # Relationships
     nightclub_order: Optional["NightclubOrder"] = Relationship(
@@ -6,24 +6,39 @@ if TYPE_CHECKING:
     from app.models.event_booking import EventBooking
     from app.models.order import NightclubOrder, QSROrder, RestaurantOrder
     from app.models.user import UserPublic
+from sqlalchemy import Index, text
 from sqlmodel import Field, Relationship, SQLModel
 
 
+def pending_payment_index(table_name: str) -> Index:
+    """
+    Partial index on the payments the retry scheduler polls the gateway for.
+    """
+    return Index(
+        f"ix_{table_name}_pending_last_attempt",
+        "last_attempt_time",
+        postgresql_where=text("status = 'pending'"),
+    )
+
+
 class PaymentBase(SQLModel):
     user_id: uuid.UUID = Field(foreign_key="user_public.id", nullable=False)
     source_type: str = Field(nullable=False)  # Changed to str
-    gateway_transaction_id: uuid.UUID | None = Field(default=None)
+    # Unique so that gateway webhooks resolve to exactly one payment
+    gateway_transaction_id: uuid.UUID | None = Field(default=None, unique=True)
     payment_time: datetime = Field(nullable=False)
     amount: float = Field(nullable=False)
-    status: str = Field(nullable=False)  # e.g., Paid, Pending, Failed
+    status: str = Field(nullable=False)  # PaymentStatus
     source_type: str = Field(nullable=False)
+    # Gateway status polls so far, and when the last one was made
+    retry_count: int = Field(default=0)
+    last_attempt_time: datetime | None = Field(default=None)
 
 
 class PaymentOrderNightclub(PaymentBase, table=True):
     __tablename__ = "payment_source_nightclub"
+    __table_args__ = (pending_payment_index("payment_source_nightclub"),)
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True, index=True)
-    retry_count: int = Field(default=0)
-    last_attempt_time: datetime | None = Field(default=None)
     order: "NightclubOrder" = Relationship(
         back_populates="payment", sa_relationship_kwargs={"uselist": False}
     )
@@ -32,9 +47,8 @@ class PaymentOrderNightclub(PaymentBase, table=True):
 
 class PaymentOrderQSR(PaymentBase, table=True):
     __tablename__ = "payment_source_qsr"
+    __table_args__ = (pending_payment_index("payment_source_qsr"),)
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True, index=True)
-    retry_count: int = Field(default=0)
-    last_attempt_time: datetime | None = Field(default=None)
     order: "QSROrder" = Relationship(
         back_populates="payment", sa_relationship_kwargs={"uselist": False}
     )
@@ -43,9 +57,8 @@ class PaymentOrderQSR(PaymentBase, table=True):
 
 class PaymentOrderRestaurant(PaymentBase, table=True):
     __tablename__ = "payment_source_restaurant"
+    __table_args__ = (pending_payment_index("payment_source_restaurant"),)
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True, index=True)
-    retry_count: int = Field(default=0)
-    last_attempt_time: datetime | None = Field(default=None)
     order: "RestaurantOrder" = Relationship(
         back_populates="payment", sa_relationship_kwargs={"uselist": False}
     )
@@ -54,6 +67,7 @@ class PaymentOrderRestaurant(PaymentBase, table=True):
 
 class PaymentEvent(PaymentBase, table=True):
     __tablename__ = "payment_event"
+    __table_args__ = (pending_payment_index("payment_event"),)
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True, index=True)
     event_booking_id: uuid.UUID | None = Field(
         default=None, foreign_key="event_booking.id"
@@ -0,0 +1,35 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import Index, text
+from sqlmodel import Field, SQLModel
+
+from app.models.base_model import utcnow
+
+
+class PaymentWebhookEvent(SQLModel, table=True):
+    """
+    A payment gateway webhook, stored as received and applied to its payment
+    later by the webhook worker. Delivered twice, it is stored once.
+    """
+
+    __tablename__ = "payment_webhook_event"
+    __table_args__ = (
+        # The worker's queue: events not processed yet, by when they are due
+        Index(
+            "ix_payment_webhook_event_due",
+            "next_attempt_at",
+            postgresql_where=text("processed_at IS NULL"),
+        ),
+    )
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    gateway_event_id: str = Field(max_length=255, unique=True, nullable=False)
+    source_type: str = Field(nullable=False)  # PaymentSource
+    gateway_transaction_id: uuid.UUID = Field(nullable=False)
+    status: str = Field(nullable=False)  # PaymentStatus reported by the gateway
+    received_at: datetime = Field(default_factory=utcnow, nullable=False)
+    # Events whose payment is not found yet are retried with backoff
+    attempts: int = Field(default=0, nullable=False)
+    next_attempt_at: datetime = Field(default_factory=utcnow, nullable=False)
+    processed_at: datetime | None = Field(default=None)
+    outcome: str | None = Field(default=None)  # WebhookOutcome
@@ -0,0 +1,49 @@
+import uuid
+from datetime import datetime
+from decimal import Decimal
+
+from sqlmodel import Field, SQLModel
+
+# Rollups are derived data, rebuilt from the order tables, so they do not
+# hold foreign keys that would get in the way of deleting venues or items.
+
+
+class VenueSalesRollup(SQLModel, table=True):
+    """
+    A venue's orders and revenue within one hour or day, by order time (UTC).
+    """
+
+    __tablename__ = "venue_sales_rollup"
+    venue_id: uuid.UUID = Field(primary_key=True)
+    granularity: str = Field(primary_key=True)  # RollupGranularity
+    bucket_start: datetime = Field(primary_key=True)
+    order_count: int = Field(default=0, nullable=False)
+    revenue: Decimal = Field(
+        default=Decimal(0), max_digits=14, decimal_places=2, nullable=False
+    )
+
+
+class MenuItemSalesRollup(SQLModel, table=True):
+    """
+    How much of one menu item a venue sold within one hour or day.
+    """
+
+    __tablename__ = "menu_item_sales_rollup"
+    venue_id: uuid.UUID = Field(primary_key=True)
+    granularity: str = Field(primary_key=True)  # RollupGranularity
+    bucket_start: datetime = Field(primary_key=True)
+    item_id: uuid.UUID = Field(primary_key=True)
+    quantity: int = Field(default=0, nullable=False)
+    revenue: Decimal = Field(
+        default=Decimal(0), max_digits=14, decimal_places=2, nullable=False
+    )
+
+
+class SalesRollupWatermark(SQLModel, table=True):
+    """
+    Order time up to which orders are included in the sales rollups.
+    """
+
+    __tablename__ = "sales_rollup_watermark"
+    name: str = Field(primary_key=True)
+    rolled_up_to: datetime | None = Field(default=None)
@@ -6,7 +6,7 @@ from pydantic import EmailStr
 from sqlmodel import Field, Relationship, SQLModel
 
 from app.constants import Gender
-from app.models.base_model import BaseTimeModel
+from app.models.base_model import BaseTimeModel, keyset_index
 from app.models.club_visit import ClubVisit
 from app.models.event_booking import EventBooking
 from app.models.group import GroupMembers
@@ -40,6 +40,7 @@ class UserBase(BaseTimeModel):
 
 class UserPublic(UserBase, table=True):
     __tablename__ = "user_public"
+    __table_args__ = (keyset_index("user_public"),)
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True, index=True)
     phone_number: str | None = Field(
         unique=True, nullable=False, index=True, default=None
@@ -108,6 +109,7 @@ class UserVenueAssociation(SQLModel, table=True):
 
 class UserBusiness(UserBase, table=True):
     __tablename__ = "user_business"
+    __table_args__ = (keyset_index("user_business"),)
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True, index=True)
     email: EmailStr = Field(unique=True, nullable=False, index=True, max_length=255)
     phone_number: str | None = Field(default=None)
@@ -2,9 +2,11 @@ import uuid
 from datetime import time
 from typing import TYPE_CHECKING, Optional
 
+from sqlalchemy import event
 from sqlmodel import Field, Relationship
 
-from app.models.base_model import BaseTimeModel
+from app.models.base_model import BaseTimeModel, keyset_index
+from app.utils.h3_utils import VENUE_H3_RESOLUTIONS, get_h3_index
 
 if TYPE_CHECKING:
     from app.models.carousel_poster import CarouselPoster
@@ -54,6 +56,12 @@ class Venue(BaseTimeModel, table=True):
     zomato_link: str | None = Field(default=None)
     swiggy_link: str | None = Field(default=None)
 
+    # H3 cells of (latitude, longitude) at each of VENUE_H3_RESOLUTIONS, for
+    # the nearby search. Kept in sync with the coordinates on every flush.
+    h3_res5: str | None = Field(default=None, index=True)
+    h3_res7: str | None = Field(default=None, index=True)
+    h3_res9: str | None = Field(default=None, index=True)
+
     managing_users: list["UserVenueAssociation"] = Relationship(back_populates="venue")
     qrcode: list["QRCode"] = Relationship(back_populates="venue")
     menu: list["Menu"] = Relationship(back_populates="venue")
@@ -71,6 +79,8 @@ class Venue(BaseTimeModel, table=True):
     def from_create_schema(cls, venue_create: VenueCreate) -> "Venue":
         return cls(
             name=venue_create.name,
+            latitude=venue_create.latitude,
+            longitude=venue_create.longitude,
             capacity=venue_create.capacity,
             description=venue_create.description,
             instagram_handle=venue_create.instagram_handle,
@@ -106,10 +116,25 @@ class Venue(BaseTimeModel, table=True):
             swiggy_link=self.swiggy_link,
         )
 
+    def set_h3_cells(self) -> None:
+        for resolution in VENUE_H3_RESOLUTIONS:
+            setattr(
+                self,
+                f"h3_res{resolution}",
+                get_h3_index(self.latitude, self.longitude, resolution),
+            )
+
+
+@event.listens_for(Venue, "before_insert")
+@event.listens_for(Venue, "before_update")
+def _sync_venue_h3_cells(mapper, connection, venue: Venue) -> None:  # noqa: ARG001
+    venue.set_h3_cells()
+
 
 # Specific Venue Types
 class Foodcourt(BaseTimeModel, table=True):
     __tablename__ = "foodcourt"
+    __table_args__ = (keyset_index("foodcourt"),)
 
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True, index=True)
     total_qsrs: int | None = Field(default=None)  # Example specific field for foodcourt
@@ -143,6 +168,7 @@ class Foodcourt(BaseTimeModel, table=True):
 
 class QSR(BaseTimeModel, table=True):
     __tablename__ = "qsr"
+    __table_args__ = (keyset_index("qsr"),)
 
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True, index=True)
     foodcourt_id: uuid.UUID | None = Field(
@@ -176,6 +202,7 @@ class QSR(BaseTimeModel, table=True):
 
 class Restaurant(BaseTimeModel, table=True):
     __tablename__ = "restaurant"
+    __table_args__ = (keyset_index("restaurant"),)
 
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True, index=True)
     venue_id: uuid.UUID = Field(foreign_key="venue.id", nullable=False, index=True)
@@ -205,6 +232,7 @@ class Restaurant(BaseTimeModel, table=True):
 
 class Nightclub(BaseTimeModel, table=True):
     __tablename__ = "nightclub"
+    __table_args__ = (keyset_index("nightclub"),)
 
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True, index=True)
     venue_id: uuid.UUID = Field(foreign_key="venue.id", nullable=False, index=True)
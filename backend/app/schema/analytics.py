@@ -0,0 +1,40 @@
+from datetime import datetime
+from decimal import Decimal
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from app.constants import RollupGranularity
+
+
+class SalesBucket(BaseModel):
+    bucket_start: datetime
+    order_count: int
+    revenue: Decimal
+    average_ticket: Decimal
+
+
+class TopItem(BaseModel):
+    item_id: UUID
+    name: str | None = None  # None once the item is off the menu
+    quantity: int
+    revenue: Decimal
+
+
+class SalesReport(BaseModel):
+    """
+    A venue's sales between ``start`` and ``end``, per hour or day (UTC),
+    with its best-selling items. Orders placed after ``as_of`` are not
+    included yet.
+    """
+
+    venue_id: UUID
+    granularity: RollupGranularity
+    start: datetime
+    end: datetime
+    as_of: datetime | None = None
+    order_count: int
+    revenue: Decimal
+    average_ticket: Decimal
+    buckets: list[SalesBucket]
+    top_items: list[TopItem]
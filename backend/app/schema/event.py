@@ -0,0 +1,33 @@
+from datetime import datetime
+from decimal import Decimal
+from uuid import UUID
+
+from pydantic import BaseModel, Field, field_validator
+
+from app.constants import BookingStatus
+from app.core.config import settings
+
+
+class EventHoldCreate(BaseModel):
+    """
+    Schema for holding passes of an event offering.
+    """
+
+    quantity: int = Field(default=1, gt=0, le=settings.EVENT_MAX_PASSES_PER_BOOKING)
+
+
+class EventBookingRead(BaseModel):
+    id: UUID
+    event_id: UUID
+    offering_id: UUID | None = None
+    quantity: int
+    status: BookingStatus
+    total_amount: Decimal
+    booking_time: datetime
+    # Confirm the booking before this, or the passes return to sale
+    hold_expires_at: datetime | None = None
+
+    @field_validator("total_amount")
+    @classmethod
+    def round_amount(cls, value: Decimal) -> Decimal:
+        return value.quantize(Decimal("0.01"))
@@ -1,6 +1,7 @@
 import uuid
+from collections import Counter
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 
 
 class MenuItemCreate(BaseModel):
@@ -135,3 +136,87 @@ class MenuUpdate(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+#########################################################################################################
+# Bulk import/export. Nodes are matched to existing records by name within their
+# parent, so the same document can be imported again to update a menu.
+
+
+def unique_names(nodes: list) -> list:  # type: ignore[type-arg]
+    counts = Counter(node.name for node in nodes)
+    duplicates = [name for name, count in counts.items() if count > 1]
+    if duplicates:
+        raise ValueError(f"Duplicate names: {', '.join(sorted(duplicates))}")
+    return nodes
+
+
+class MenuItemImport(BaseModel):
+    name: str = Field(min_length=1)
+    price: float = Field(ge=0)
+    description: str | None = None
+    image_url: str | None = None
+    is_veg: bool | None = None
+    ingredients: str | None = None
+    abv: float | None = None
+    ibu: int | None = None
+
+
+class MenuSubCategoryImport(BaseModel):
+    name: str = Field(min_length=1)
+    is_alcoholic: bool = False
+    menu_items: list[MenuItemImport] = []
+
+    _unique_items = field_validator("menu_items")(unique_names)
+
+
+class MenuCategoryImport(BaseModel):
+    name: str = Field(min_length=1)
+    sub_categories: list[MenuSubCategoryImport] = []
+
+    _unique_sub_categories = field_validator("sub_categories")(unique_names)
+
+
+class MenuImport(BaseModel):
+    name: str = Field(min_length=1)
+    description: str | None = None
+    menu_type: str | None = None
+    categories: list[MenuCategoryImport] = []
+
+    _unique_categories = field_validator("categories")(unique_names)
+
+
+class MenuBulkImport(BaseModel):
+    menus: list[MenuImport]
+
+    _unique_menus = field_validator("menus")(unique_names)
+
+
+class MenuImportCounts(BaseModel):
+    created: int = 0
+    updated: int = 0
+
+
+class MenuImportResult(BaseModel):
+    menus: MenuImportCounts = Field(default_factory=MenuImportCounts)
+    categories: MenuImportCounts = Field(default_factory=MenuImportCounts)
+    sub_categories: MenuImportCounts = Field(default_factory=MenuImportCounts)
+    menu_items: MenuImportCounts = Field(default_factory=MenuImportCounts)
+
+
+#########################################################################################################
+
+
+class MenuSearchResult(BaseModel):
+    """
+    A menu item matching a search, with the path of menu, category and
+    subcategory it is listed under.
+    """
+
+    item: MenuItemRead
+    menu_id: uuid.UUID
+    menu_name: str
+    category_id: uuid.UUID
+    category_name: str
+    subcategory_name: str
+    rank: float  # Higher is a better match; 0 without a search text
@@ -0,0 +1,47 @@
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import BaseModel, Field, computed_field
+
+
+class ClubVisitCreate(BaseModel):
+    """
+    Schema for letting a visitor into a nightclub.
+    """
+
+    user_id: UUID
+    group_id: UUID | None = None
+    cover_charge: float | None = Field(default=None, ge=0)
+
+
+class ClubVisitRead(BaseModel):
+    id: UUID
+    user_id: UUID
+    group_id: UUID | None = None
+    nightclub_id: UUID
+    entry_time: datetime
+    exit_time: datetime | None = None
+    cover_charge: float | None = None
+
+
+class OccupancyRead(BaseModel):
+    """
+    How many people are inside a nightclub now, against its capacity if the
+    venue has one.
+    """
+
+    venue_id: UUID
+    occupancy: int
+    capacity: int | None = None
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def available(self) -> int | None:
+        if self.capacity is None:
+            return None
+        return max(self.capacity - self.occupancy, 0)
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def is_full(self) -> bool:
+        return self.capacity is not None and self.occupancy >= self.capacity
@@ -0,0 +1,95 @@
+from datetime import datetime
+from decimal import Decimal
+from uuid import UUID
+
+from pydantic import BaseModel, Field, field_validator
+
+from app.constants import OrderStatus, PaymentStatus, VenueType
+from app.core.config import settings
+
+
+class OrderItemCreate(BaseModel):
+    """
+    One line of an order: a menu item and how many of it.
+    """
+
+    item_id: UUID
+    quantity: int = Field(gt=0, le=1000)
+
+
+class OrderCreate(BaseModel):
+    """
+    Schema for placing an order at a venue. Prices are taken from the menu,
+    never from the client.
+    """
+
+    venue_id: UUID  # ID of the Venue, not of its nightclub/restaurant/QSR row
+    items: list[OrderItemCreate]
+    note: str | None = None
+    pickup_location_id: UUID | None = None
+    service_type: str | None = None
+
+    @field_validator("items")
+    @classmethod
+    def validate_items(cls, items: list[OrderItemCreate]) -> list[OrderItemCreate]:
+        if not items:
+            raise ValueError("An order needs at least one item.")
+        if len(items) > settings.ORDER_MAX_ITEMS:
+            raise ValueError(
+                f"An order may have at most {settings.ORDER_MAX_ITEMS} items."
+            )
+        return items
+
+    def quantities(self) -> dict[UUID, int]:
+        """
+        Quantity per menu item, with repeated lines of an item merged.
+        """
+        quantities: dict[UUID, int] = {}
+        for line in self.items:
+            quantities[line.item_id] = quantities.get(line.item_id, 0) + line.quantity
+        return quantities
+
+
+class OrderStatusUpdate(BaseModel):
+    status: OrderStatus
+
+
+class OrderItemRead(BaseModel):
+    item_id: UUID
+    quantity: int
+    unit_price: Decimal
+
+
+class OrderRead(BaseModel):
+    """
+    Schema for an order as returned to the user who placed it.
+    """
+
+    id: UUID
+    venue_type: VenueType
+    venue_id: UUID
+    status: OrderStatus
+    order_time: datetime
+    note: str | None = None
+    pickup_location_id: UUID | None = None
+    service_type: str | None = None
+    items: list[OrderItemRead]
+    subtotal: Decimal
+    taxes_and_charges: Decimal
+    total_amount: Decimal
+
+
+class OrderSummary(BaseModel):
+    """
+    One order in the user's order history, across all venue types. Fetch
+    the order itself for its items.
+    """
+
+    id: UUID
+    venue_type: VenueType
+    venue_id: UUID
+    venue_name: str
+    status: OrderStatus
+    order_time: datetime
+    total_amount: Decimal
+    payment_status: PaymentStatus | None = None  # None until a payment is made
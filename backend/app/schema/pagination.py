@@ -0,0 +1,15 @@
+from typing import Generic, TypeVar
+
+from pydantic import BaseModel
+
+ItemT = TypeVar("ItemT")
+
+
+class Page(BaseModel, Generic[ItemT]):
+    """
+    One page of a keyset-paginated list. Pass ``next_cursor`` back as
+    ``cursor`` to get the next page; it is None on the last page.
+    """
+
+    items: list[ItemT]
+    next_cursor: str | None = None
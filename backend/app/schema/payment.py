@@ -0,0 +1,22 @@
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+from app.constants import PaymentSource, PaymentStatus
+
+
+class PaymentWebhook(BaseModel):
+    """
+    A payment status change as reported by the gateway.
+    """
+
+    event_id: str = Field(min_length=1, max_length=255)  # Unique per delivery
+    source_type: PaymentSource
+    transaction_id: UUID  # gateway_transaction_id of the payment
+    status: PaymentStatus
+
+
+class PaymentWebhookAck(BaseModel):
+    accepted: bool = True
+    # The event had been delivered before and was not queued again
+    duplicate: bool = False
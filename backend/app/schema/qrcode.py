@@ -1,6 +1,8 @@
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
+
+from app.core.config import settings
 
 
 class QRCodeCreate(BaseModel):
@@ -19,6 +21,64 @@ class QRCodeUpdate(BaseModel):
 
     table_number: str | None = None
 
+class TableRange(BaseModel):
+    """
+    Inclusive range of numbered tables, e.g. T1 to T120 with prefix "T".
+    """
+
+    start: int = Field(ge=0)
+    end: int = Field(ge=0)
+    prefix: str = ""
+
+    @model_validator(mode="after")
+    def validate_order(self) -> "TableRange":
+        if self.end < self.start:
+            raise ValueError("'end' must not be less than 'start'.")
+        return self
+
+    def table_numbers(self) -> range:
+        """The numbers of the tables, without the prefix; lazy however long."""
+        return range(self.start, self.end + 1)
+
+
+class QRCodeBulkCreate(BaseModel):
+    """
+    Schema for creating one QR code per table of a venue.
+    Exactly one of ``table_numbers`` or ``table_range`` must be provided.
+    """
+
+    venue_id: UUID
+    table_numbers: list[str] | None = None
+    table_range: TableRange | None = None
+
+    @model_validator(mode="after")
+    def validate_tables(self) -> "QRCodeBulkCreate":
+        if (self.table_numbers is None) == (self.table_range is None):
+            raise ValueError(
+                "Exactly one of 'table_numbers' or 'table_range' must be provided."
+            )
+        # Counted before any table is listed, so an oversized range costs
+        # nothing to reject
+        if self.table_range is not None:
+            count = len(self.table_range.table_numbers())
+        else:
+            count = len(self.table_numbers or [])
+        if not count:
+            raise ValueError("At least one table must be provided.")
+        if count > settings.QR_BULK_MAX_CODES:
+            raise ValueError(
+                f"At most {settings.QR_BULK_MAX_CODES} QR codes can be created at once."
+            )
+        return self
+
+    def tables(self) -> list[str]:
+        """The requested table numbers, in order and without duplicates."""
+        if self.table_range is not None:
+            prefix = self.table_range.prefix
+            return [f"{prefix}{number}" for number in self.table_range.table_numbers()]
+        return list(dict.fromkeys(self.table_numbers or []))
+
+
 class QRCodeRead(BaseModel):
     """
     Schema for reading a QR code.
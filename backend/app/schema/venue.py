@@ -7,6 +7,8 @@ from pydantic import BaseModel
 # Venue base details (composition)
 class VenueCreate(BaseModel):
     name: str
+    latitude: float = 0
+    longitude: float = 0
     capacity: int | None = None
     description: str | None = None
     instagram_handle: str | None = None
@@ -121,3 +123,8 @@ class VenueListResponse(BaseModel):
     qsrs: list[QSRRead]
     foodcourts: list[FoodcourtRead]
     restaurants: list[RestaurantRead]
+
+
+class NearbyVenueRead(BaseModel):
+    venue: VenueRead
+    distance_m: float
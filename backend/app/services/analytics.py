@@ -0,0 +1,308 @@
+import logging
+import uuid
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from fastapi import HTTPException
+from sqlalchemy import func, literal, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.constants import RollupGranularity
+from app.core.config import settings
+from app.core.db import get_async_session_maker
+from app.models.base_model import utcnow
+from app.models.menu import MenuItem
+from app.models.order_item import OrderItem
+from app.models.sales_rollup import (
+    MenuItemSalesRollup,
+    SalesRollupWatermark,
+    VenueSalesRollup,
+)
+from app.schema.analytics import SalesBucket, SalesReport, TopItem
+from app.services.order import CENT, ORDER_ITEM_COLUMNS, ORDER_MODELS, to_amount
+from app.services.venue import VENUE_TYPE_MODELS
+
+logger = logging.getLogger(__name__)
+
+WATERMARK = "orders"
+
+BUCKET_SIZES = {
+    RollupGranularity.HOUR: timedelta(hours=1),
+    RollupGranularity.DAY: timedelta(days=1),
+}
+
+
+def bucket_floor(at: datetime, granularity: RollupGranularity) -> datetime:
+    """
+    Start of the bucket containing ``at``, as date_trunc() computes it.
+    """
+    at = at.replace(minute=0, second=0, microsecond=0)
+    if granularity is RollupGranularity.DAY:
+        at = at.replace(hour=0)
+    return at
+
+
+def _upsert(  # type: ignore[no-untyped-def]
+    model, statement, columns: list[str], totals: list[str]
+):
+    """
+    INSERT the rows of ``statement`` into a rollup table, adding ``totals``
+    onto buckets that already exist.
+    """
+    insert = pg_insert(model).from_select(columns, statement)
+    return insert.on_conflict_do_update(
+        index_elements=[column.name for column in model.__table__.primary_key],
+        set_={
+            total: getattr(model, total) + getattr(insert.excluded, total)
+            for total in totals
+        },
+    )
+
+
+async def rollup_orders(
+    db: AsyncSession, after: datetime | None, until: datetime
+) -> None:
+    """
+    Add the orders placed after ``after`` and up to ``until`` to the hourly
+    and daily rollups. Each order table takes one INSERT ... SELECT ...
+    GROUP BY per rollup table and granularity, so the orders never leave the
+    database. Does not commit.
+    """
+    for venue_type, model in ORDER_MODELS.items():
+        venue_model = VENUE_TYPE_MODELS[venue_type]
+        order_id = getattr(OrderItem, ORDER_ITEM_COLUMNS[venue_type])
+        window = [model.order_time <= until]
+        if after is not None:
+            window.append(model.order_time > after)
+        for granularity in RollupGranularity:
+            bucket = func.date_trunc(granularity.value, model.order_time)
+            orders = (
+                select(
+                    venue_model.venue_id,
+                    literal(granularity.value),
+                    bucket,
+                    func.count(),
+                    func.sum(model.total_amount),
+                )
+                .join(venue_model, venue_model.id == model.venue_id)
+                .where(*window)
+                .group_by(venue_model.venue_id, bucket)
+            )
+            await db.execute(
+                _upsert(
+                    VenueSalesRollup,
+                    orders,
+                    [
+                        "venue_id",
+                        "granularity",
+                        "bucket_start",
+                        "order_count",
+                        "revenue",
+                    ],
+                    ["order_count", "revenue"],
+                )
+            )
+            items = (
+                select(
+                    venue_model.venue_id,
+                    literal(granularity.value),
+                    bucket,
+                    OrderItem.item_id,
+                    func.sum(OrderItem.quantity),
+                    func.sum(
+                        OrderItem.quantity * func.coalesce(OrderItem.unit_price, 0)
+                    ),
+                )
+                .join(model, model.id == order_id)
+                .join(venue_model, venue_model.id == model.venue_id)
+                .where(*window)
+                .group_by(venue_model.venue_id, bucket, OrderItem.item_id)
+            )
+            await db.execute(
+                _upsert(
+                    MenuItemSalesRollup,
+                    items,
+                    [
+                        "venue_id",
+                        "granularity",
+                        "bucket_start",
+                        "item_id",
+                        "quantity",
+                        "revenue",
+                    ],
+                    ["quantity", "revenue"],
+                )
+            )
+
+
+async def refresh_sales_rollups(db: AsyncSession) -> datetime | None:
+    """
+    Roll up the orders placed since the watermark, up to
+    ANALYTICS_ROLLUP_LAG_SECONDS ago, and move the watermark on, in one
+    transaction, so no order time is rolled up twice. Returns the new
+    watermark, or None if there was nothing to do.
+
+    Orders are picked by order time, not commit time: an order committed more
+    than ANALYTICS_ROLLUP_LAG_SECONDS after its order time lands behind the
+    watermark and is never rolled up. Each order is counted with the total it
+    had when rolled up; later changes, cancellations included, are not
+    reflected.
+
+    The watermark row is locked for the run; a worker finding it locked
+    leaves the refresh to the worker holding it.
+    """
+    until = utcnow() - timedelta(seconds=settings.ANALYTICS_ROLLUP_LAG_SECONDS)
+    await db.execute(
+        pg_insert(SalesRollupWatermark)
+        .values(name=WATERMARK)
+        .on_conflict_do_nothing(index_elements=["name"])
+    )
+    watermark = (
+        await db.execute(
+            select(SalesRollupWatermark.rolled_up_to)
+            .where(SalesRollupWatermark.name == WATERMARK)
+            .with_for_update(skip_locked=True)
+        )
+    ).first()
+    if watermark is None or (watermark[0] is not None and watermark[0] >= until):
+        await db.commit()
+        return None
+
+    await rollup_orders(db, watermark[0], until)
+    await db.execute(
+        update(SalesRollupWatermark)
+        .where(SalesRollupWatermark.name == WATERMARK)
+        .values(rolled_up_to=until)
+    )
+    await db.commit()
+    return until
+
+
+async def refresh_sales_analytics() -> datetime | None:
+    """
+    Periodic job bringing the sales rollups up to date.
+    """
+    async with get_async_session_maker()() as db:
+        rolled_up_to = await refresh_sales_rollups(db)
+    if rolled_up_to is not None:
+        logger.debug("Rolled up sales rolled_up_to=%s", rolled_up_to)
+    return rolled_up_to
+
+
+def _average(revenue: Decimal, order_count: int) -> Decimal:
+    if not order_count:
+        return Decimal(0).quantize(CENT)
+    return to_amount(revenue / order_count)
+
+
+async def sales_report(
+    db: AsyncSession,
+    venue_id: uuid.UUID,
+    granularity: RollupGranularity,
+    start: datetime,
+    end: datetime,
+    top: int,
+) -> SalesReport:
+    """
+    The venue's sales per bucket from ``start`` to ``end``, with its ``top``
+    best-selling items by revenue, read from the rollups alone. Every bucket
+    in the range is listed, empty ones with zeros.
+    """
+    size = BUCKET_SIZES[granularity]
+    start = bucket_floor(start, granularity)
+    if end <= start:
+        raise HTTPException(status_code=400, detail="end must be after start.")
+    if (end - start) / size > settings.ANALYTICS_MAX_BUCKETS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"A report spans at most {settings.ANALYTICS_MAX_BUCKETS} buckets.",
+        )
+
+    in_range = (
+        VenueSalesRollup.venue_id == venue_id,
+        VenueSalesRollup.granularity == granularity.value,
+        VenueSalesRollup.bucket_start >= start,
+        VenueSalesRollup.bucket_start < end,
+    )
+    rows = await db.execute(
+        select(
+            VenueSalesRollup.bucket_start,
+            VenueSalesRollup.order_count,
+            VenueSalesRollup.revenue,
+        ).where(*in_range)
+    )
+    filled = {bucket_start: (count, revenue) for bucket_start, count, revenue in rows}
+
+    item_totals = (
+        select(
+            MenuItemSalesRollup.item_id,
+            func.sum(MenuItemSalesRollup.quantity).label("quantity"),
+            func.sum(MenuItemSalesRollup.revenue).label("revenue"),
+        )
+        .where(
+            MenuItemSalesRollup.venue_id == venue_id,
+            MenuItemSalesRollup.granularity == granularity.value,
+            MenuItemSalesRollup.bucket_start >= start,
+            MenuItemSalesRollup.bucket_start < end,
+        )
+        .group_by(MenuItemSalesRollup.item_id)
+        .order_by(func.sum(MenuItemSalesRollup.revenue).desc())
+        .limit(top)
+        .subquery()
+    )
+    top_rows = await db.execute(
+        select(
+            item_totals.c.item_id,
+            MenuItem.name,
+            item_totals.c.quantity,
+            item_totals.c.revenue,
+        )
+        .outerjoin(MenuItem, MenuItem.id == item_totals.c.item_id)
+        .order_by(item_totals.c.revenue.desc())
+    )
+    as_of = (
+        await db.execute(
+            select(SalesRollupWatermark.rolled_up_to).where(
+                SalesRollupWatermark.name == WATERMARK
+            )
+        )
+    ).scalar_one_or_none()
+
+    buckets = []
+    bucket_start = start
+    while bucket_start < end:
+        count, revenue = filled.get(bucket_start, (0, Decimal(0)))
+        revenue = to_amount(revenue)
+        buckets.append(
+            SalesBucket(
+                bucket_start=bucket_start,
+                order_count=count,
+                revenue=revenue,
+                average_ticket=_average(revenue, count),
+            )
+        )
+        bucket_start += size
+    order_count = sum(bucket.order_count for bucket in buckets)
+    revenue = sum((bucket.revenue for bucket in buckets), Decimal(0))
+    return SalesReport(
+        venue_id=venue_id,
+        granularity=granularity,
+        start=start,
+        end=end,
+        as_of=as_of,
+        order_count=order_count,
+        revenue=revenue,
+        average_ticket=_average(revenue, order_count),
+        buckets=buckets,
+        top_items=[
+            TopItem(
+                item_id=item_id,
+                name=name,
+                quantity=quantity,
+                revenue=to_amount(item_revenue),
+            )
+            for item_id, name, quantity, item_revenue in top_rows
+        ],
+    )
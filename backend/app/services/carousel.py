@@ -0,0 +1,132 @@
+from collections import defaultdict
+from collections.abc import Sequence
+from datetime import datetime
+
+import h3
+from pydantic import TypeAdapter
+from sqlalchemy import and_, or_
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.cache import CachedPayload, get_versioned_cache
+from app.core.config import settings
+from app.models.carousel_poster import POSTER_PARENT_RESOLUTIONS, CarouselPoster
+from app.schema.carousel_poster import CarouselPosterRead
+from app.utils import haversine_m, resolution_for_radius
+
+# Resolution of CarouselPoster.h3_index
+POSTER_RESOLUTION = 9
+
+# The search ring is built at the finest resolution whose k-ring stays within
+# this size (k=16 is 817 cells) before it is compacted.
+MAX_RING_K = 16
+
+# Every poster lookup is cached under this one scope; creating a poster
+# invalidates it.
+POSTER_CACHE_SCOPE = "posters"
+
+_poster_list_adapter = TypeAdapter(list[CarouselPosterRead])
+
+
+def poster_column(resolution: int):
+    if resolution == POSTER_RESOLUTION:
+        return CarouselPoster.h3_index
+    return getattr(CarouselPoster, f"h3_res{resolution}")
+
+
+def ring_cells(
+    latitude: float, longitude: float, radius_m: float
+) -> dict[int, set[str]]:
+    """
+    Cover the disc of ``radius_m`` around a point with H3 cells, grouped by
+    resolution.
+
+    The k-ring is compacted, so whole groups of cells collapse into their
+    parent. Compacted cells coarser than the coarsest stored parent
+    resolution are expanded back to it.
+    """
+    resolutions = (*POSTER_PARENT_RESOLUTIONS, POSTER_RESOLUTION)
+    ring_resolution, k = resolution_for_radius(
+        radius_m, resolutions=resolutions, max_k=MAX_RING_K
+    )
+    origin = h3.geo_to_h3(latitude, longitude, ring_resolution)
+    coarsest = min(resolutions)
+
+    cells: dict[int, set[str]] = defaultdict(set)
+    for cell in h3.compact(h3.k_ring(origin, k)):
+        resolution = h3.h3_get_resolution(cell)
+        if resolution < coarsest:
+            cells[coarsest].update(h3.h3_to_children(cell, coarsest))
+        else:
+            cells[resolution].add(cell)
+    return cells
+
+
+async def find_posters(
+    db: AsyncSession, latitude: float, longitude: float, radius_m: float
+) -> list[CarouselPoster]:
+    """
+    Live posters within ``radius_m`` of a point.
+
+    Each group of ring cells is matched against the poster column of the same
+    resolution, together with the expiry, so every branch of the query can use
+    its composite (cell, expires_at) index. The ring is quantised to its
+    cells, so candidates are then checked against the radius using the centre
+    of their resolution-9 cell.
+    """
+    now = datetime.now()
+    cells = ring_cells(latitude, longitude, radius_m)
+    statement = select(CarouselPoster).where(
+        or_(
+            *(
+                and_(
+                    poster_column(resolution).in_(group),
+                    CarouselPoster.expires_at > now,
+                )
+                for resolution, group in cells.items()
+            )
+        )
+    )
+    candidates: Sequence[CarouselPoster] = (await db.execute(statement)).scalars().all()
+    return [
+        poster
+        for poster in candidates
+        if haversine_m(latitude, longitude, *h3.h3_to_geo(poster.h3_index)) <= radius_m
+    ]
+
+
+async def lookup_posters(
+    db: AsyncSession, latitude: float, longitude: float, radius_m: int
+) -> CachedPayload:
+    """
+    Serialized posters around a point, cached per (resolution-9 cell, radius).
+
+    The search is centred on the cell rather than the exact point, so the
+    result is the same for every user in that cell. An entry lives until the
+    first of its posters expires, and at most CACHE_TTL_SECONDS.
+    """
+    poster_cache = get_versioned_cache("carousel")
+    cell = h3.geo_to_h3(latitude, longitude, POSTER_RESOLUTION)
+    version, cached = poster_cache.lookup(POSTER_CACHE_SCOPE, cell, radius_m)
+    if cached is not None:
+        return cached
+
+    cell_latitude, cell_longitude = h3.h3_to_geo(cell)
+    posters = await find_posters(db, cell_latitude, cell_longitude, radius_m)
+
+    ttl = settings.CACHE_TTL_SECONDS
+    if posters:
+        first_expiry = min(poster.expires_at for poster in posters)
+        seconds_left = int((first_expiry - datetime.now()).total_seconds())
+        ttl = max(1, min(ttl, seconds_left))
+
+    payload = _poster_list_adapter.dump_json(
+        [poster.to_read_schema() for poster in posters]
+    )
+    return poster_cache.store(
+        POSTER_CACHE_SCOPE, version, payload, cell, radius_m, ttl=ttl
+    )
+
+
+def invalidate_posters() -> None:
+    get_versioned_cache("carousel").invalidate(POSTER_CACHE_SCOPE)
@@ -0,0 +1,188 @@
+import logging
+import uuid
+from collections import Counter
+from datetime import timedelta
+
+from fastapi import HTTPException
+from sqlalchemy import insert, update
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.constants import BookingStatus
+from app.core.config import settings
+from app.core.db import get_async_session_maker
+from app.models.base_model import utcnow
+from app.models.event_booking import EventBooking
+from app.models.event_offering import EventOffering
+from app.services.order import to_amount
+
+logger = logging.getLogger(__name__)
+
+
+def sold_out() -> HTTPException:
+    return HTTPException(status_code=409, detail="Not enough passes left.")
+
+
+async def hold_passes(
+    db: AsyncSession, user_id: uuid.UUID, offering_id: uuid.UUID, quantity: int
+) -> EventBooking:
+    """
+    Reserve ``quantity`` passes of an offering for the user, as a booking
+    held until EVENT_HOLD_SECONDS from now.
+
+    The offering row is the only contended resource, so it is touched last
+    and as little as possible:
+
+    - a plain read turns buyers away once the offering is sold out, without
+      queueing them behind the row lock;
+    - the booking is inserted before the offering is locked;
+    - one conditional UPDATE then takes the passes, so the row lock is held
+      only from that statement to the commit, and availability can never
+      drop below zero.
+    """
+    offering = (
+        await db.execute(
+            select(
+                EventOffering.event_id, EventOffering.price, EventOffering.availability
+            ).where(EventOffering.id == offering_id)
+        )
+    ).first()
+    if offering is None:
+        raise HTTPException(status_code=404, detail="Offering not found")
+    event_id, price, availability = offering
+    if availability < quantity:
+        raise sold_out()
+
+    now = utcnow()
+    booking = EventBooking(
+        user_id=user_id,
+        event_id=event_id,
+        offering_id=offering_id,
+        quantity=quantity,
+        booking_time=now,
+        hold_expires_at=now + timedelta(seconds=settings.EVENT_HOLD_SECONDS),
+        total_amount=float(to_amount(price) * quantity),
+        status=BookingStatus.HELD.value,
+    )
+    await db.execute(insert(EventBooking).values(**booking.model_dump()))
+    taken = await db.execute(
+        update(EventOffering)
+        .where(EventOffering.id == offering_id, EventOffering.availability >= quantity)
+        .values(availability=EventOffering.availability - quantity)
+        .returning(EventOffering.id)
+    )
+    if taken.first() is None:
+        await db.rollback()
+        raise sold_out()
+    await db.commit()
+    return booking
+
+
+async def confirm_booking(db: AsyncSession, booking_id: uuid.UUID) -> bool:
+    """
+    Turn a held booking into a confirmed one, e.g. once it is paid for.
+    False if the hold has lapsed or the booking is not held; the conditional
+    UPDATE settles a race with the sweeper.
+    """
+    confirmed = await db.execute(
+        update(EventBooking)
+        .where(
+            EventBooking.id == booking_id,
+            EventBooking.status == BookingStatus.HELD.value,
+            EventBooking.hold_expires_at > utcnow(),
+        )
+        .values(status=BookingStatus.CONFIRMED.value, hold_expires_at=None)
+        .returning(EventBooking.id)
+    )
+    if confirmed.first() is None:
+        await db.rollback()
+        return False
+    await db.commit()
+    return True
+
+
+async def _return_passes(db: AsyncSession, released: Counter[uuid.UUID]) -> None:
+    # In a fixed order, so that two sweeps cannot deadlock on two offerings
+    for offering_id, quantity in sorted(released.items()):
+        await db.execute(
+            update(EventOffering)
+            .where(EventOffering.id == offering_id)
+            .values(availability=EventOffering.availability + quantity)
+        )
+
+
+async def release_hold(
+    db: AsyncSession, user_id: uuid.UUID, booking_id: uuid.UUID
+) -> bool:
+    """
+    Cancel the user's held booking and return its passes. False if the user
+    has no such held booking.
+    """
+    released = (
+        await db.execute(
+            update(EventBooking)
+            .where(
+                EventBooking.id == booking_id,
+                EventBooking.user_id == user_id,
+                EventBooking.status == BookingStatus.HELD.value,
+            )
+            .values(status=BookingStatus.CANCELLED.value, hold_expires_at=None)
+            .returning(EventBooking.offering_id, EventBooking.quantity)
+        )
+    ).first()
+    if released is None:
+        await db.rollback()
+        return False
+    offering_id, quantity = released
+    await _return_passes(db, Counter({offering_id: quantity}))
+    await db.commit()
+    return True
+
+
+async def expire_holds(db: AsyncSession, batch_size: int) -> int:
+    """
+    Expire up to ``batch_size`` lapsed holds and return their passes, in one
+    transaction. Returns how many holds were expired.
+
+    Holds locked by another transaction (being confirmed, or swept by
+    another worker) are skipped rather than waited for.
+    """
+    lapsed = (
+        select(EventBooking.id)
+        .where(
+            EventBooking.status == BookingStatus.HELD.value,
+            EventBooking.hold_expires_at <= utcnow(),
+        )
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    rows = (
+        await db.execute(
+            update(EventBooking)
+            .where(EventBooking.id.in_(lapsed.scalar_subquery()))
+            .values(status=BookingStatus.EXPIRED.value, hold_expires_at=None)
+            .returning(EventBooking.offering_id, EventBooking.quantity)
+        )
+    ).all()
+    released: Counter[uuid.UUID] = Counter()
+    for offering_id, quantity in rows:
+        released[offering_id] += quantity
+    await _return_passes(db, released)
+    await db.commit()
+    return len(rows)
+
+
+async def sweep_expired_holds() -> int:
+    """
+    Periodic job returning the passes of every lapsed hold to sale.
+    """
+    expired = 0
+    async with get_async_session_maker()() as db:
+        while True:
+            count = await expire_holds(db, settings.EVENT_HOLD_SWEEP_BATCH)
+            expired += count
+            if count < settings.EVENT_HOLD_SWEEP_BATCH:
+                break
+    if expired:
+        logger.info("Expired event holds count=%d", expired)
+    return expired
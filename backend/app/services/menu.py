@@ -0,0 +1,183 @@
+import uuid
+from collections.abc import Sequence
+
+from sqlalchemy import case, func, literal, or_
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.orm import joinedload, selectinload
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models.menu import (
+    TEXT_SEARCH_CONFIG,
+    Menu,
+    MenuCategory,
+    MenuItem,
+    MenuSubCategory,
+)
+from app.schema.menu import MenuSearchResult
+
+# Eager-load the whole Menu -> MenuCategory -> MenuSubCategory -> MenuItem tree.
+# selectinload issues one query per level, so the number of round trips stays
+# at four no matter how many categories, subcategories or items a menu has.
+MENU_TREE_OPTIONS = (
+    selectinload(Menu.categories)
+    .selectinload(MenuCategory.sub_categories)
+    .selectinload(MenuSubCategory.menu_items),
+)
+
+# The same tree below a category or a subcategory, for write responses.
+CATEGORY_TREE_OPTIONS = (
+    selectinload(MenuCategory.sub_categories).selectinload(MenuSubCategory.menu_items),
+)
+SUBCATEGORY_TREE_OPTIONS = (selectinload(MenuSubCategory.menu_items),)
+
+# The path from a node up to its Menu, whose venue_id is checked for permission
+# and used for cache invalidation. Joined in the same query as the node.
+CATEGORY_MENU_OPTIONS = (joinedload(MenuCategory.menu),)
+SUBCATEGORY_MENU_OPTIONS = (
+    joinedload(MenuSubCategory.category).joinedload(MenuCategory.menu),
+)
+ITEM_MENU_OPTIONS = (
+    joinedload(MenuItem.subcategory)
+    .joinedload(MenuSubCategory.category)
+    .joinedload(MenuCategory.menu),
+)
+
+
+async def load_venue_menus(db: AsyncSession, venue_id: uuid.UUID) -> Sequence[Menu]:
+    """
+    Load every menu of a venue together with its full category tree.
+
+    :param db: The active async database session.
+    :param venue_id: The ID of the venue whose menus should be loaded.
+    :return: The venue's menus with categories, subcategories and items populated.
+    """
+    statement = (
+        select(Menu).where(Menu.venue_id == venue_id).options(*MENU_TREE_OPTIONS)
+    )
+    return (await db.execute(statement)).scalars().all()
+
+
+async def load_menu(db: AsyncSession, menu_id: uuid.UUID) -> Menu | None:
+    """
+    Load a single menu together with its full category tree.
+
+    :param db: The active async database session.
+    :param menu_id: The ID of the menu to load.
+    :return: The menu with categories, subcategories and items populated, or None.
+    """
+    statement = select(Menu).where(Menu.id == menu_id).options(*MENU_TREE_OPTIONS)
+    return (await db.execute(statement)).scalars().first()
+
+
+def _in_range(  # type: ignore[no-untyped-def]
+    column, low: float | None, high: float | None
+) -> list:
+    conditions = []
+    if low is not None:
+        conditions.append(column >= low)
+    if high is not None:
+        conditions.append(column <= high)
+    return conditions
+
+
+async def search_venue_menu(
+    db: AsyncSession,
+    venue_id: uuid.UUID,
+    text: str | None = None,
+    *,
+    min_price: float | None = None,
+    max_price: float | None = None,
+    min_abv: float | None = None,
+    max_abv: float | None = None,
+    min_ibu: int | None = None,
+    max_ibu: int | None = None,
+    is_veg: bool | None = None,
+    limit: int = 20,
+) -> list[MenuSearchResult]:
+    """
+    Search the items on a venue's menus, best matches first, in one query
+    that also joins each item's menu, category and subcategory.
+
+    ``text`` is matched against the items' search_vector, with web search
+    syntax (quoted phrases, ``or``, ``-word``), through its GIN index. Names
+    the text is a close enough trigram match for (pg_trgm's ``<%`` operator,
+    at the database's word_similarity_threshold) also match, so that typos
+    still find something; they rank below every full-text match. Without a
+    text the items in the ranges are listed in menu order.
+
+    :param db: The active async database session.
+    :param venue_id: The ID of the venue whose menus are searched.
+    :param text: What to search for, or None to filter only.
+    :param limit: The maximum number of items returned.
+    :return: The matching items with their path and rank.
+    """
+    conditions = [
+        Menu.venue_id == venue_id,
+        *_in_range(MenuItem.price, min_price, max_price),
+        *_in_range(MenuItem.abv, min_abv, max_abv),
+        *_in_range(MenuItem.ibu, min_ibu, max_ibu),
+    ]
+    if is_veg is not None:
+        conditions.append(MenuItem.is_veg.is_(is_veg))  # type: ignore[union-attr]
+
+    if text:
+        search_vector = MenuItem.__table__.c.search_vector
+        query = func.websearch_to_tsquery(
+            literal(TEXT_SEARCH_CONFIG, type_=REGCONFIG), text
+        )
+        matched = search_vector.op("@@")(query)
+        similar = literal(text).op("<%")(MenuItem.name)
+        conditions.append(or_(matched, similar))
+        rank = case(
+            (matched, func.ts_rank(search_vector, query)),
+            else_=func.word_similarity(text, MenuItem.name),
+        )
+        order_by = [matched.desc(), rank.desc(), MenuItem.name, MenuItem.id]
+    else:
+        rank = literal(0.0)
+        order_by = [
+            Menu.name,
+            MenuCategory.name,
+            MenuSubCategory.name,
+            MenuItem.name,
+            MenuItem.id,
+        ]
+
+    rows = await db.execute(
+        select(
+            MenuItem,
+            Menu.id,
+            Menu.name,
+            MenuCategory.id,
+            MenuCategory.name,
+            MenuSubCategory.name,
+            rank,
+        )
+        .join(MenuSubCategory, MenuSubCategory.id == MenuItem.subcategory_id)
+        .join(MenuCategory, MenuCategory.id == MenuSubCategory.category_id)
+        .join(Menu, Menu.id == MenuCategory.menu_id)
+        .where(*conditions)
+        .order_by(*order_by)
+        .limit(limit)
+    )
+    return [
+        MenuSearchResult(
+            item=item.to_read_schema(),
+            menu_id=menu_id,
+            menu_name=menu_name,
+            category_id=category_id,
+            category_name=category_name,
+            subcategory_name=subcategory_name,
+            rank=item_rank,
+        )
+        for (
+            item,
+            menu_id,
+            menu_name,
+            category_id,
+            category_name,
+            subcategory_name,
+            item_rank,
+        ) in rows
+    ]
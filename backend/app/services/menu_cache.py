@@ -0,0 +1,52 @@
+import uuid
+from collections.abc import Sequence
+from functools import lru_cache
+
+from pydantic import TypeAdapter
+
+from app.core.cache import (
+    CacheBackend,
+    CachedPayload,
+    VersionedCache,
+    get_cache_backend,
+)
+from app.core.config import settings
+from app.schema.menu import MenuRead
+
+_menu_list_adapter = TypeAdapter(list[MenuRead])
+
+
+class MenuCache(VersionedCache):
+    """
+    Serialized menus scoped per venue: the venue's full ``list[MenuRead]`` and
+    single ``MenuRead`` payloads keyed by menu ID. Every menu, category,
+    subcategory or item write invalidates the owning venue.
+    """
+
+    def __init__(self, backend: CacheBackend, ttl: int | None = None):
+        super().__init__(backend, namespace="menu", ttl=ttl)
+
+    def store_menus(
+        self, venue_id: uuid.UUID, version: int, menus: Sequence[MenuRead]
+    ) -> CachedPayload:
+        return self.store(venue_id, version, _menu_list_adapter.dump_json(list(menus)))
+
+    def store_menu(
+        self, venue_id: uuid.UUID, version: int, menu: MenuRead
+    ) -> CachedPayload:
+        return self.store(
+            venue_id, version, menu.model_dump_json().encode(), menu.menu_id
+        )
+
+    # A menu never changes venue, so its venue can be remembered indefinitely.
+    def venue_of(self, menu_id: uuid.UUID) -> uuid.UUID | None:
+        raw = self.backend.get(f"{self.namespace}:venue-of:{menu_id}")
+        return uuid.UUID(raw.decode()) if raw is not None else None
+
+    def remember_venue(self, menu_id: uuid.UUID, venue_id: uuid.UUID) -> None:
+        self.backend.set(f"{self.namespace}:venue-of:{menu_id}", str(venue_id).encode())
+
+
+@lru_cache(maxsize=1)
+def get_menu_cache() -> MenuCache:
+    return MenuCache(get_cache_backend(), ttl=settings.CACHE_TTL_SECONDS)
@@ -0,0 +1,508 @@
+"""
+Bulk import and streaming export of whole menu trees.
+
+Both directions use the same two formats: the nested ``MenuBulkImport`` JSON
+document, and a flat CSV with one row per item (a subcategory, category or
+menu without children gets a row of its own with the lower columns empty).
+"""
+
+import csv
+import io
+import json
+import uuid
+from collections.abc import AsyncIterator, Sequence
+from typing import Any
+
+from pydantic import ValidationError
+from sqlalchemy import insert, update
+from sqlmodel import SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.db import get_async_session_maker
+from app.models.base_model import utcnow
+from app.models.menu import Menu, MenuCategory, MenuItem, MenuSubCategory
+from app.schema.menu import (
+    MenuBulkImport,
+    MenuImportCounts,
+    MenuImportResult,
+    MenuItemImport,
+)
+
+MENU_CSV_COLUMNS = (
+    "menu",
+    "menu_type",
+    "menu_description",
+    "category",
+    "subcategory",
+    "is_alcoholic",
+    "item",
+    "price",
+    "description",
+    "image_url",
+    "is_veg",
+    "ingredients",
+    "abv",
+    "ibu",
+)
+
+# Column of each CSV field on MenuItemImport, where the names differ
+ITEM_CSV_FIELDS = {"item": "name"} | {
+    field: field for field in MenuItemImport.model_fields if field != "name"
+}
+
+# Rows per multi-row INSERT, and rows fetched per round trip when exporting
+IMPORT_BATCH_SIZE = 1000
+EXPORT_BATCH_SIZE = 500
+
+
+class MenuImportError(Exception):
+    """
+    The import document is invalid. ``errors`` are in the format of pydantic
+    validation errors, so they can be raised as a RequestValidationError.
+    """
+
+    def __init__(self, errors: list[dict[str, Any]]):
+        super().__init__(errors)
+        self.errors = errors
+
+
+#########################################################################################################
+# Import
+
+
+def _body_errors(error: ValidationError, *loc: str) -> list[dict[str, Any]]:
+    return [
+        {**detail, "loc": ("body", *loc, *detail["loc"])}
+        for detail in error.errors(
+            include_url=False, include_context=False, include_input=False
+        )
+    ]
+
+
+def parse_menu_json(body: bytes) -> MenuBulkImport:
+    try:
+        return MenuBulkImport.model_validate_json(body)
+    except ValidationError as e:
+        raise MenuImportError(_body_errors(e)) from e
+
+
+def parse_menu_csv(text: str) -> MenuBulkImport:
+    """
+    Build the menu tree from CSV rows, merging rows that share a menu,
+    category or subcategory name. Every row is validated before anything is
+    written, and errors are reported by line number.
+    """
+    reader = csv.DictReader(io.StringIO(text))
+    missing = {"menu", "category", "subcategory", "item"} - set(reader.fieldnames or ())
+    if missing:
+        raise MenuImportError(
+            [
+                {
+                    "type": "missing",
+                    "loc": ("body", "header"),
+                    "msg": f"Missing CSV columns: {', '.join(sorted(missing))}",
+                }
+            ]
+        )
+
+    menus: dict[str, dict[str, Any]] = {}
+    errors: list[dict[str, Any]] = []
+    for row in reader:
+        line = f"line {reader.line_num}"
+        values = {key: (value or "").strip() for key, value in row.items() if key}
+        if not values["menu"]:
+            errors.append(
+                {
+                    "type": "missing",
+                    "loc": ("body", line, "menu"),
+                    "msg": "Field required",
+                }
+            )
+            continue
+
+        menu = menus.setdefault(
+            values["menu"], {"name": values["menu"], "categories": {}}
+        )
+        for field, column in (
+            ("menu_type", "menu_type"),
+            ("description", "menu_description"),
+        ):
+            if values.get(column) and not menu.get(field):
+                menu[field] = values[column]
+        if not values["category"]:
+            continue
+
+        category = menu["categories"].setdefault(
+            values["category"], {"name": values["category"], "sub_categories": {}}
+        )
+        if not values["subcategory"]:
+            continue
+
+        subcategory = category["sub_categories"].setdefault(
+            values["subcategory"], {"name": values["subcategory"], "menu_items": []}
+        )
+        if values.get("is_alcoholic"):
+            subcategory["is_alcoholic"] = values["is_alcoholic"]
+        if not values["item"]:
+            continue
+
+        item = {
+            field: values[column]
+            for column, field in ITEM_CSV_FIELDS.items()
+            if values.get(column)
+        }
+        try:
+            subcategory["menu_items"].append(MenuItemImport.model_validate(item))
+        except ValidationError as e:
+            errors.extend(_body_errors(e, line))
+
+    if errors:
+        raise MenuImportError(errors)
+
+    tree = {
+        "menus": [
+            {
+                **menu,
+                "categories": [
+                    {
+                        **category,
+                        "sub_categories": list(category["sub_categories"].values()),
+                    }
+                    for category in menu["categories"].values()
+                ],
+            }
+            for menu in menus.values()
+        ]
+    }
+    try:
+        return MenuBulkImport.model_validate(tree)
+    except ValidationError as e:
+        raise MenuImportError(_body_errors(e)) from e
+
+
+class _UpsertPlan:
+    """
+    Rows to insert and to update per model, collected while walking the
+    import tree against the records that already exist.
+    """
+
+    def __init__(self) -> None:
+        self.now = utcnow()
+        self.inserts: dict[type[SQLModel], list[dict[str, Any]]] = {}
+        self.updates: dict[type[SQLModel], list[dict[str, Any]]] = {}
+        self.result = MenuImportResult()
+
+    def upsert(
+        self,
+        model: type[SQLModel],
+        counts: MenuImportCounts,
+        existing: dict[tuple[Any, ...], tuple[uuid.UUID, dict[str, Any]]],
+        key: tuple[Any, ...],
+        values: dict[str, Any],
+    ) -> uuid.UUID:
+        """
+        Plan an insert of ``values``, or an update of the record matching
+        ``key`` if any of them changed. Returns the record's ID.
+        """
+        match = existing.get(key)
+        if match is None:
+            record = model(**values)
+            self.inserts.setdefault(model, []).append(record.model_dump())
+            counts.created += 1
+            return record.id  # type: ignore[attr-defined, no-any-return]
+
+        record_id, current = match
+        if any(current[field] != value for field, value in values.items()):
+            self.updates.setdefault(model, []).append(
+                {"id": record_id, **values, "updated_at": self.now}
+            )
+            counts.updated += 1
+        return record_id
+
+    async def execute(self, db: AsyncSession) -> None:
+        # Parents first, so every foreign key points at a written row
+        for model in (Menu, MenuCategory, MenuSubCategory, MenuItem):
+            rows = self.inserts.get(model, [])
+            for start in range(0, len(rows), IMPORT_BATCH_SIZE):
+                await db.execute(
+                    insert(model).values(rows[start : start + IMPORT_BATCH_SIZE])
+                )
+            if model in self.updates:
+                # ORM bulk UPDATE by primary key, executed as one executemany
+                await db.execute(update(model), self.updates[model])
+
+
+async def _existing(
+    db: AsyncSession, statement: Any, key_size: int
+) -> dict[tuple[Any, ...], tuple[uuid.UUID, dict[str, Any]]]:
+    """
+    Index rows of (id, *key columns, *value columns) by their natural key.
+    If names are already duplicated within a parent, the first one wins.
+    """
+    existing: dict[tuple[Any, ...], tuple[uuid.UUID, dict[str, Any]]] = {}
+    for row in (await db.execute(statement)).mappings():
+        values = dict(row)
+        record_id = values.pop("id")
+        key = tuple(values[column] for column in list(values)[:key_size])
+        existing.setdefault(key, (record_id, values))
+    return existing
+
+
+async def import_menus(
+    db: AsyncSession, venue_id: uuid.UUID, bulk: MenuBulkImport
+) -> MenuImportResult:
+    """
+    Upsert a venue's menu tree, matching each node by name within its parent.
+
+    The venue's existing records are read in one query per level, and the
+    changes written with batched multi-row INSERTs and a bulk UPDATE per
+    level, committed as a single transaction. Records missing from the
+    document are left untouched.
+    """
+    menus = await _existing(
+        db,
+        select(
+            Menu.id, Menu.venue_id, Menu.name, Menu.description, Menu.menu_type
+        ).where(Menu.venue_id == venue_id),
+        key_size=2,
+    )
+    categories = await _existing(
+        db,
+        select(MenuCategory.id, MenuCategory.menu_id, MenuCategory.name)
+        .join(Menu)
+        .where(Menu.venue_id == venue_id),
+        key_size=2,
+    )
+    sub_categories = await _existing(
+        db,
+        select(
+            MenuSubCategory.id,
+            MenuSubCategory.category_id,
+            MenuSubCategory.name,
+            MenuSubCategory.is_alcoholic,
+        )
+        .join(MenuCategory)
+        .join(Menu)
+        .where(Menu.venue_id == venue_id),
+        key_size=2,
+    )
+    item_columns = [getattr(MenuItem, field) for field in MenuItemImport.model_fields]
+    menu_items = await _existing(
+        db,
+        select(MenuItem.id, MenuItem.subcategory_id, *item_columns)
+        .join(MenuSubCategory)
+        .join(MenuCategory)
+        .join(Menu)
+        .where(Menu.venue_id == venue_id),
+        key_size=2,
+    )
+
+    plan = _UpsertPlan()
+    result = plan.result
+    for menu in bulk.menus:
+        menu_id = plan.upsert(
+            Menu,
+            result.menus,
+            menus,
+            (venue_id, menu.name),
+            {
+                "venue_id": venue_id,
+                "name": menu.name,
+                "description": menu.description,
+                "menu_type": menu.menu_type,
+            },
+        )
+        for category in menu.categories:
+            category_id = plan.upsert(
+                MenuCategory,
+                result.categories,
+                categories,
+                (menu_id, category.name),
+                {"menu_id": menu_id, "name": category.name},
+            )
+            for subcategory in category.sub_categories:
+                subcategory_id = plan.upsert(
+                    MenuSubCategory,
+                    result.sub_categories,
+                    sub_categories,
+                    (category_id, subcategory.name),
+                    {
+                        "category_id": category_id,
+                        "name": subcategory.name,
+                        "is_alcoholic": subcategory.is_alcoholic,
+                    },
+                )
+                for item in subcategory.menu_items:
+                    plan.upsert(
+                        MenuItem,
+                        result.menu_items,
+                        menu_items,
+                        (subcategory_id, item.name),
+                        {"subcategory_id": subcategory_id, **item.model_dump()},
+                    )
+
+    try:
+        await plan.execute(db)
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+    return result
+
+
+#########################################################################################################
+# Export
+
+
+def _export_statement(venue_id: uuid.UUID) -> Any:
+    """
+    One flat row per item, ordered so that every menu, category and
+    subcategory is contiguous. Childless nodes come out as rows with NULLs
+    below them.
+    """
+    return (
+        select(
+            Menu.id.label("menu_id"),
+            Menu.name.label("menu"),
+            Menu.menu_type,
+            Menu.description.label("menu_description"),
+            MenuCategory.id.label("category_id"),
+            MenuCategory.name.label("category"),
+            MenuSubCategory.id.label("subcategory_id"),
+            MenuSubCategory.name.label("subcategory"),
+            MenuSubCategory.is_alcoholic,
+            MenuItem.name.label("item"),
+            *(
+                getattr(MenuItem, field)
+                for field in MenuItemImport.model_fields
+                if field != "name"
+            ),
+        )
+        .select_from(Menu)
+        .outerjoin(MenuCategory, MenuCategory.menu_id == Menu.id)
+        .outerjoin(MenuSubCategory, MenuSubCategory.category_id == MenuCategory.id)
+        .outerjoin(MenuItem, MenuItem.subcategory_id == MenuSubCategory.id)
+        .where(Menu.venue_id == venue_id)
+        .order_by(
+            Menu.name,
+            Menu.id,
+            MenuCategory.name,
+            MenuCategory.id,
+            MenuSubCategory.name,
+            MenuSubCategory.id,
+            MenuItem.name,
+        )
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+
+
+async def _stream_row_batches(venue_id: uuid.UUID) -> AsyncIterator[Sequence[Any]]:
+    # The export outlives the request's session, which is closed before a
+    # streamed body is sent, so it reads through a session of its own.
+    async with get_async_session_maker()() as db:
+        result = await db.stream(_export_statement(venue_id))
+        async for batch in result.mappings().partitions():
+            yield batch
+
+
+def _csv_value(value: Any) -> Any:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return value
+
+
+async def stream_menu_csv(venue_id: uuid.UUID) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(MENU_CSV_COLUMNS)
+    async for batch in _stream_row_batches(venue_id):
+        writer.writerows(
+            [_csv_value(row[column]) for column in MENU_CSV_COLUMNS] for row in batch
+        )
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+
+class _MenuTreeJsonWriter:
+    """
+    Writes the ordered flat export rows as a ``MenuBulkImport`` document,
+    opening and closing the nested objects as the menu, category and
+    subcategory change from one row to the next.
+    """
+
+    def __init__(self) -> None:
+        # (node ID, has children) of the open menu, category and subcategory
+        self._open: list[list[Any]] = []
+        self._has_menus = False
+
+    def start(self) -> str:
+        return '{"menus": ['
+
+    def finish(self) -> str:
+        return self._close_to(0) + "]}"
+
+    def _close_to(self, depth: int) -> str:
+        closed = ""
+        while len(self._open) > depth:
+            self._open.pop()
+            closed += "]}"
+        return closed
+
+    def _separator(self, depth: int) -> str:
+        if depth == 0:
+            first, self._has_menus = not self._has_menus, True
+        else:
+            parent = self._open[depth - 1]
+            first, parent[1] = not parent[1], True
+        return "" if first else ", "
+
+    def _open_node(
+        self, depth: int, node_id: uuid.UUID, fields: dict[str, Any], children: str
+    ) -> str:
+        chunk = self._close_to(depth) + self._separator(depth)
+        self._open.append([node_id, False])
+        return chunk + json.dumps(fields)[:-1] + f', "{children}": ['
+
+    def _is_open(self, depth: int, node_id: uuid.UUID) -> bool:
+        return len(self._open) > depth and self._open[depth][0] == node_id
+
+    def write(self, row: Any) -> str:
+        chunk = ""
+        if not self._is_open(0, row["menu_id"]):
+            chunk += self._open_node(
+                0,
+                row["menu_id"],
+                {
+                    "name": row["menu"],
+                    "description": row["menu_description"],
+                    "menu_type": row["menu_type"],
+                },
+                "categories",
+            )
+        if row["category_id"] is not None and not self._is_open(1, row["category_id"]):
+            chunk += self._open_node(
+                1, row["category_id"], {"name": row["category"]}, "sub_categories"
+            )
+        if row["subcategory_id"] is not None and not self._is_open(
+            2, row["subcategory_id"]
+        ):
+            chunk += self._open_node(
+                2,
+                row["subcategory_id"],
+                {"name": row["subcategory"], "is_alcoholic": row["is_alcoholic"]},
+                "menu_items",
+            )
+        if row["item"] is not None:
+            item = {field: row[column] for column, field in ITEM_CSV_FIELDS.items()}
+            chunk += self._separator(3) + json.dumps(item)
+        return chunk
+
+
+async def stream_menu_json(venue_id: uuid.UUID) -> AsyncIterator[str]:
+    tree = _MenuTreeJsonWriter()
+    yield tree.start()
+    async for batch in _stream_row_batches(venue_id):
+        yield "".join(tree.write(row) for row in batch)
+    yield tree.finish()
@@ -0,0 +1,321 @@
+import logging
+import uuid
+from abc import ABC, abstractmethod
+from collections import Counter
+from functools import lru_cache
+from typing import Any, NamedTuple
+
+from sqlalchemy import event as sa_event
+from sqlalchemy import func, insert, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.core.db import get_async_session_maker
+from app.models.base_model import utcnow
+from app.models.club_visit import ClubVisit
+from app.models.nightclub_occupancy import NightclubOccupancy
+from app.models.venue import Nightclub, Venue
+from app.schema.occupancy import ClubVisitCreate, OccupancyRead
+
+logger = logging.getLogger(__name__)
+
+# Key in Session.info of the counter changes waiting for the session's commit
+PENDING_CHANGES_KEY = "pending_occupancy_changes"
+
+# Redis hash of the counters, by nightclub ID
+REDIS_HASH = "nightclub_occupancy"
+
+
+class OccupancyDiscrepancy(NamedTuple):
+    nightclub_id: uuid.UUID
+    counter: int
+    open_visits: int
+
+
+async def count_open_visits(db: AsyncSession) -> dict[uuid.UUID, int]:
+    """
+    Open club visits per nightclub, read off the partial index of open
+    visits.
+    """
+    rows = await db.execute(
+        select(ClubVisit.nightclub_id, func.count())
+        .where(ClubVisit.exit_time.is_(None))
+        .group_by(ClubVisit.nightclub_id)
+    )
+    return dict(rows)
+
+
+def _discrepancies(
+    counters: dict[uuid.UUID, int], open_visits: dict[uuid.UUID, int]
+) -> list[OccupancyDiscrepancy]:
+    return [
+        OccupancyDiscrepancy(
+            nightclub_id,
+            counters.get(nightclub_id, 0),
+            open_visits.get(nightclub_id, 0),
+        )
+        for nightclub_id in sorted(counters.keys() | open_visits.keys())
+        if counters.get(nightclub_id, 0) != open_visits.get(nightclub_id, 0)
+    ]
+
+
+class OccupancyCounter(ABC):
+    """
+    Live count of the people inside each nightclub. Entries and exits change
+    it as part of the transaction recording them.
+    """
+
+    @abstractmethod
+    async def add(self, db: AsyncSession, nightclub_id: uuid.UUID, delta: int) -> None:
+        """Change the count by ``delta`` when the transaction of ``db`` commits."""
+
+    @abstractmethod
+    async def get(self, db: AsyncSession, nightclub_id: uuid.UUID) -> int:
+        """The current count, 0 for a nightclub nobody has entered yet."""
+
+    @abstractmethod
+    async def reconcile(self, db: AsyncSession) -> list[OccupancyDiscrepancy]:
+        """
+        Set every count to the number of open visits and commit. Returns the
+        counts that were off.
+        """
+
+
+class PostgresOccupancyCounter(OccupancyCounter):
+    """
+    Counters in the nightclub_occupancy table, changed by the entry or exit
+    transaction itself, so they are exact while the visits are.
+    """
+
+    async def add(self, db: AsyncSession, nightclub_id: uuid.UUID, delta: int) -> None:
+        if delta > 0:
+            statement = pg_insert(NightclubOccupancy).values(
+                nightclub_id=nightclub_id, occupancy=delta, updated_at=utcnow()
+            )
+            await db.execute(
+                statement.on_conflict_do_update(
+                    index_elements=["nightclub_id"],
+                    set_={
+                        "occupancy": NightclubOccupancy.occupancy + delta,
+                        "updated_at": statement.excluded.updated_at,
+                    },
+                )
+            )
+        else:
+            # Never below zero; a count that drifted low is fixed by reconcile
+            await db.execute(
+                update(NightclubOccupancy)
+                .where(
+                    NightclubOccupancy.nightclub_id == nightclub_id,
+                    NightclubOccupancy.occupancy + delta >= 0,
+                )
+                .values(
+                    occupancy=NightclubOccupancy.occupancy + delta, updated_at=utcnow()
+                )
+            )
+
+    async def get(self, db: AsyncSession, nightclub_id: uuid.UUID) -> int:
+        occupancy = await db.execute(
+            select(NightclubOccupancy.occupancy).where(
+                NightclubOccupancy.nightclub_id == nightclub_id
+            )
+        )
+        return occupancy.scalar_one_or_none() or 0
+
+    async def reconcile(self, db: AsyncSession) -> list[OccupancyDiscrepancy]:
+        # Counting with the counters locked: an entry or exit in flight either
+        # committed before the lock, and is counted, or changes its counter
+        # after the recount
+        rows = await db.execute(
+            select(NightclubOccupancy.nightclub_id, NightclubOccupancy.occupancy)
+            .order_by(NightclubOccupancy.nightclub_id)
+            .with_for_update()
+        )
+        counters = dict(rows)
+        discrepancies = _discrepancies(counters, await count_open_visits(db))
+        if discrepancies:
+            statement = pg_insert(NightclubOccupancy).values(
+                [
+                    {
+                        "nightclub_id": discrepancy.nightclub_id,
+                        "occupancy": discrepancy.open_visits,
+                        "updated_at": utcnow(),
+                    }
+                    for discrepancy in discrepancies
+                ]
+            )
+            await db.execute(
+                statement.on_conflict_do_update(
+                    index_elements=["nightclub_id"],
+                    set_={
+                        "occupancy": statement.excluded.occupancy,
+                        "updated_at": statement.excluded.updated_at,
+                    },
+                )
+            )
+        await db.commit()
+        return discrepancies
+
+
+class RedisOccupancyCounter(OccupancyCounter):
+    """
+    Counters in one Redis hash, incremented once the entry or exit commits.
+
+    A worker dying between the commit and the increment, or an entry landing
+    between a reconciliation's recount and its write, leaves a count off
+    until the next reconciliation.
+    """
+
+    def __init__(self, url: str) -> None:
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+
+    async def add(self, db: AsyncSession, nightclub_id: uuid.UUID, delta: int) -> None:
+        session = db.sync_session
+        if PENDING_CHANGES_KEY not in session.info:
+            session.info[PENDING_CHANGES_KEY] = Counter()
+            sa_event.listen(session, "after_commit", self._after_commit)
+            sa_event.listen(session, "after_soft_rollback", _discard_pending)
+        session.info[PENDING_CHANGES_KEY][nightclub_id] += delta
+
+    def _after_commit(self, session: Any) -> None:
+        changes = session.info.get(PENDING_CHANGES_KEY, Counter())
+        session.info[PENDING_CHANGES_KEY] = Counter()
+        if not changes:
+            return
+        try:
+            pipeline = self.client.pipeline()
+            for nightclub_id, delta in changes.items():
+                pipeline.hincrby(REDIS_HASH, str(nightclub_id), delta)
+            pipeline.execute()
+        except Exception:
+            logger.exception("Could not update occupancy counters changes=%s", changes)
+
+    async def get(self, db: AsyncSession, nightclub_id: uuid.UUID) -> int:
+        occupancy = self.client.hget(REDIS_HASH, str(nightclub_id))
+        return max(int(occupancy), 0) if occupancy is not None else 0
+
+    async def reconcile(self, db: AsyncSession) -> list[OccupancyDiscrepancy]:
+        open_visits = await count_open_visits(db)
+        await db.commit()
+        counters = {
+            uuid.UUID(nightclub_id.decode()): int(occupancy)
+            for nightclub_id, occupancy in self.client.hgetall(REDIS_HASH).items()
+        }
+        discrepancies = _discrepancies(counters, open_visits)
+        if discrepancies:
+            self.client.hset(
+                REDIS_HASH,
+                mapping={
+                    str(discrepancy.nightclub_id): discrepancy.open_visits
+                    for discrepancy in discrepancies
+                },
+            )
+        return discrepancies
+
+
+def _discard_pending(session: Any, _previous_transaction: Any) -> None:
+    session.info[PENDING_CHANGES_KEY] = Counter()
+
+
+@lru_cache(maxsize=1)
+def get_occupancy_counter() -> OccupancyCounter:
+    if settings.OCCUPANCY_BACKEND == "redis":
+        if not settings.REDIS_URL:
+            raise RuntimeError("OCCUPANCY_BACKEND=redis needs REDIS_URL")
+        return RedisOccupancyCounter(settings.REDIS_URL)
+    return PostgresOccupancyCounter()
+
+
+async def resolve_nightclub(
+    db: AsyncSession, venue_id: uuid.UUID
+) -> tuple[uuid.UUID, int | None] | None:
+    """
+    The ID of the venue's nightclub row and the venue's capacity, or None if
+    the venue is not a nightclub.
+    """
+    row = (
+        await db.execute(
+            select(Nightclub.id, Venue.capacity)
+            .join(Venue, Venue.id == Nightclub.venue_id)
+            .where(Nightclub.venue_id == venue_id)
+        )
+    ).first()
+    return None if row is None else (row[0], row[1])
+
+
+async def record_entry(
+    db: AsyncSession, nightclub_id: uuid.UUID, visit_in: ClubVisitCreate
+) -> ClubVisit:
+    """
+    Open a visit to the nightclub and count the visitor in, in one
+    transaction.
+    """
+    visit = ClubVisit(
+        user_id=visit_in.user_id,
+        group_id=visit_in.group_id,
+        nightclub_id=nightclub_id,
+        entry_time=utcnow(),
+        cover_charge=visit_in.cover_charge,
+    )
+    await db.execute(insert(ClubVisit).values(**visit.model_dump()))
+    await get_occupancy_counter().add(db, nightclub_id, 1)
+    await db.commit()
+    return visit
+
+
+async def record_exit(
+    db: AsyncSession, nightclub_id: uuid.UUID, visit_id: uuid.UUID
+) -> bool:
+    """
+    Close an open visit to the nightclub and count the visitor out. False if
+    there is no such open visit, so a repeated exit counts nobody out twice.
+    """
+    closed = await db.execute(
+        update(ClubVisit)
+        .where(
+            ClubVisit.id == visit_id,
+            ClubVisit.nightclub_id == nightclub_id,
+            ClubVisit.exit_time.is_(None),
+        )
+        .values(exit_time=utcnow())
+        .returning(ClubVisit.id)
+    )
+    if closed.first() is None:
+        await db.rollback()
+        return False
+    await get_occupancy_counter().add(db, nightclub_id, -1)
+    await db.commit()
+    return True
+
+
+async def get_occupancy(db: AsyncSession, venue_id: uuid.UUID) -> OccupancyRead | None:
+    """
+    How full the nightclub is now, from its counter: two primary-key reads,
+    whatever the number of visits. None if the venue is not a nightclub.
+    """
+    nightclub = await resolve_nightclub(db, venue_id)
+    if nightclub is None:
+        return None
+    nightclub_id, capacity = nightclub
+    occupancy = await get_occupancy_counter().get(db, nightclub_id)
+    return OccupancyRead(venue_id=venue_id, occupancy=occupancy, capacity=capacity)
+
+
+async def reconcile_occupancy() -> list[OccupancyDiscrepancy]:
+    """
+    Periodic job recounting every nightclub's occupancy from its open visits.
+    """
+    async with get_async_session_maker()() as db:
+        discrepancies = await get_occupancy_counter().reconcile(db)
+    for discrepancy in discrepancies:
+        logger.warning(
+            "Corrected occupancy nightclub_id=%s counter=%d open_visits=%d",
+            discrepancy.nightclub_id,
+            discrepancy.counter,
+            discrepancy.open_visits,
+        )
+    return discrepancies
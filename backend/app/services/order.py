@@ -0,0 +1,466 @@
+import logging
+import uuid
+from decimal import ROUND_HALF_UP, Decimal
+from typing import NamedTuple
+
+from fastapi import HTTPException
+from sqlalchemy import insert, literal, tuple_, union_all, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.constants import OrderStatus, PaymentStatus, VenueType
+from app.core.config import settings
+from app.models.base_model import utcnow
+from app.models.menu import Menu, MenuCategory, MenuItem, MenuSubCategory
+from app.models.order import NightclubOrder, QSROrder, RestaurantOrder
+from app.models.order_idempotency_key import OrderIdempotencyKey
+from app.models.order_item import OrderItem
+from app.models.payment import (
+    PaymentOrderNightclub,
+    PaymentOrderQSR,
+    PaymentOrderRestaurant,
+)
+from app.models.pickup_location import PickupLocation
+from app.models.venue import Venue
+from app.schema.order import OrderCreate, OrderItemRead, OrderRead, OrderSummary
+from app.services.order_events import OrderEvent, get_order_broker
+from app.services.venue import VENUE_TYPE_MODELS
+from app.util import decode_cursor, encode_position
+
+logger = logging.getLogger(__name__)
+
+CENT = Decimal("0.01")
+
+# Venue types taking orders, with their order table and the OrderItem column
+# pointing at it
+ORDER_MODELS = {
+    VenueType.NIGHTCLUB: NightclubOrder,
+    VenueType.RESTAURANT: RestaurantOrder,
+    VenueType.QSR: QSROrder,
+}
+ORDER_PAYMENT_MODELS = {
+    VenueType.NIGHTCLUB: PaymentOrderNightclub,
+    VenueType.RESTAURANT: PaymentOrderRestaurant,
+    VenueType.QSR: PaymentOrderQSR,
+}
+ORDER_ITEM_COLUMNS = {
+    VenueType.NIGHTCLUB: "nightclub_order_id",
+    VenueType.RESTAURANT: "restaurant_order_id",
+    VenueType.QSR: "qsr_order_id",
+}
+
+# The statuses an order may be in to move to each status. Completed and
+# cancelled orders are final.
+TRANSITIONS: dict[OrderStatus, tuple[OrderStatus, ...]] = {
+    OrderStatus.PLACED: (),
+    OrderStatus.PAID: (OrderStatus.PLACED,),
+    OrderStatus.COMPLETED: (OrderStatus.PLACED, OrderStatus.PAID),
+    OrderStatus.CANCELLED: (OrderStatus.PLACED, OrderStatus.PAID),
+}
+
+Order = NightclubOrder | RestaurantOrder | QSROrder
+
+
+class OrderRef(NamedTuple):
+    venue_type: VenueType
+    order_id: uuid.UUID
+
+
+def to_amount(value: float | Decimal) -> Decimal:
+    """
+    A money amount rounded to the cent. Floats go through their shortest
+    repr, so a stored 12.1 stays 12.10.
+    """
+    return Decimal(str(value)).quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+async def resolve_order_venue(
+    db: AsyncSession, venue_id: uuid.UUID
+) -> tuple[VenueType, uuid.UUID]:
+    """
+    The type of venue ``venue_id`` and the ID of its nightclub, restaurant or
+    QSR row, which orders reference, in one query.
+    """
+    statement = union_all(
+        *(
+            select(VENUE_TYPE_MODELS[venue_type].id, literal(venue_type.value)).where(
+                VENUE_TYPE_MODELS[venue_type].venue_id == venue_id
+            )
+            for venue_type in ORDER_MODELS
+        )
+    )
+    row = (await db.execute(statement)).first()
+    if row is None:
+        raise HTTPException(
+            status_code=404, detail="Venue not found or does not take orders."
+        )
+    subtype_id, venue_type = row
+    return VenueType(venue_type), subtype_id
+
+
+async def menu_prices(
+    db: AsyncSession, venue_id: uuid.UUID, item_ids: list[uuid.UUID]
+) -> dict[uuid.UUID, Decimal]:
+    """
+    Current price of each of ``item_ids`` on the venue's menus, in one query.
+    Items of other venues are left out.
+    """
+    statement = (
+        select(MenuItem.id, MenuItem.price)
+        .join(MenuSubCategory)
+        .join(MenuCategory)
+        .join(Menu)
+        .where(MenuItem.id.in_(item_ids), Menu.venue_id == venue_id)
+    )
+    rows = await db.execute(statement)
+    return {item_id: to_amount(price) for item_id, price in rows}
+
+
+async def check_pickup_location(
+    db: AsyncSession, venue_id: uuid.UUID, pickup_location_id: uuid.UUID
+) -> None:
+    """
+    Reject a pickup location that does not exist or is at another venue, so
+    that an order never lands on another venue's pickup feed.
+    """
+    location_venue_id = (
+        await db.execute(
+            select(PickupLocation.venue_id).where(
+                PickupLocation.id == pickup_location_id
+            )
+        )
+    ).scalar_one_or_none()
+    if location_venue_id is None:
+        raise HTTPException(status_code=404, detail="Pickup location not found.")
+    if location_venue_id != venue_id:
+        raise HTTPException(
+            status_code=400, detail="Pickup location is not at this venue."
+        )
+
+
+async def find_order_by_key(
+    db: AsyncSession, user_id: uuid.UUID, idempotency_key: str
+) -> OrderRef | None:
+    key = await db.get(OrderIdempotencyKey, (user_id, idempotency_key))
+    if key is None:
+        return None
+    return OrderRef(VenueType(key.venue_type), key.order_id)
+
+
+async def get_order(
+    db: AsyncSession,
+    user_id: uuid.UUID | None,
+    venue_type: VenueType,
+    order_id: uuid.UUID,
+) -> OrderRead | None:
+    """
+    The order with its items, or None if there is no such order. With a
+    ``user_id``, only that user's orders are found.
+    """
+    model = ORDER_MODELS[venue_type]
+    venue_model = VENUE_TYPE_MODELS[venue_type]
+    statement = (
+        select(model, venue_model.venue_id)
+        .join(venue_model, venue_model.id == model.venue_id)
+        .where(model.id == order_id)
+        .options(selectinload(model.order_items))
+    )
+    if user_id is not None:
+        statement = statement.where(model.user_id == user_id)
+    row = (await db.execute(statement)).first()
+    if row is None:
+        return None
+    order, venue_id = row
+    return order_read(order, order.order_items, venue_type, venue_id)
+
+
+def order_read(
+    order: Order,
+    lines: list[OrderItem],
+    venue_type: VenueType,
+    venue_id: uuid.UUID,
+) -> OrderRead:
+    taxes = to_amount(order.taxes_and_charges or 0)
+    total = to_amount(order.total_amount)
+    return OrderRead(
+        id=order.id,
+        venue_type=venue_type,
+        venue_id=venue_id,
+        status=OrderStatus(order.status),
+        order_time=order.order_time,
+        note=order.note,
+        pickup_location_id=order.pickup_location_id,
+        service_type=order.service_type,
+        items=[
+            OrderItemRead(
+                item_id=line.item_id,
+                quantity=line.quantity,
+                unit_price=to_amount(line.unit_price or 0),
+            )
+            for line in lines
+        ],
+        subtotal=total - taxes,
+        taxes_and_charges=taxes,
+        total_amount=total,
+    )
+
+
+async def order_history(
+    db: AsyncSession, user_id: uuid.UUID, cursor: str | None, limit: int
+) -> tuple[list[OrderSummary], str | None]:
+    """
+    A page of the user's orders at every venue type, newest first, with
+    their venue and payment status, in one query. Returns the orders and the
+    cursor of the next page, if any.
+
+    Each order table gives its own newest ``limit + 1`` orders after the
+    cursor, read off its (user_id, order_time, id) index, and the UNION ALL
+    of those is sorted once more. A page therefore costs the same however
+    many orders the user has and however deep it is.
+    """
+    branches = []
+    for venue_type, model in ORDER_MODELS.items():
+        venue_model = VENUE_TYPE_MODELS[venue_type]
+        payment_model = ORDER_PAYMENT_MODELS[venue_type]
+        position = tuple_(model.order_time, model.id)
+        branch = (
+            select(
+                model.id,
+                literal(venue_type.value).label("venue_type"),
+                Venue.id.label("venue_id"),
+                Venue.name.label("venue_name"),
+                model.status,
+                model.order_time,
+                model.total_amount,
+                payment_model.status.label("payment_status"),
+            )
+            .join(venue_model, venue_model.id == model.venue_id)
+            .join(Venue, Venue.id == venue_model.venue_id)
+            .outerjoin(payment_model, payment_model.id == model.payment_id)
+            .where(model.user_id == user_id)
+            .order_by(model.order_time.desc(), model.id.desc())
+            .limit(limit + 1)
+        )
+        if cursor is not None:
+            branch = branch.where(position < tuple_(*decode_cursor(cursor)))
+        # Wrapped, so that each branch keeps its own ORDER BY and LIMIT
+        branches.append(select(branch.subquery()))
+    orders = union_all(*branches).subquery()
+    statement = (
+        select(orders)
+        .order_by(orders.c.order_time.desc(), orders.c.id.desc())
+        .limit(limit + 1)
+    )
+    rows = (await db.execute(statement)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_position(rows[-1].order_time, rows[-1].id)
+    summaries = [
+        OrderSummary(
+            id=row.id,
+            venue_type=VenueType(row.venue_type),
+            venue_id=row.venue_id,
+            venue_name=row.venue_name,
+            status=OrderStatus(row.status),
+            order_time=row.order_time,
+            total_amount=to_amount(row.total_amount),
+            payment_status=(
+                PaymentStatus(row.payment_status) if row.payment_status else None
+            ),
+        )
+        for row in rows
+    ]
+    return summaries, next_cursor
+
+
+async def _replay(
+    db: AsyncSession, user_id: uuid.UUID, ref: OrderRef, order_in: OrderCreate
+) -> OrderRead:
+    """
+    The order first placed with an idempotency key, provided the retry asks
+    for the same thing.
+    """
+    order = await get_order(db, user_id, ref.venue_type, ref.order_id)
+    assert order is not None
+    placed = {line.item_id: line.quantity for line in order.items}
+    if order.venue_id != order_in.venue_id or placed != order_in.quantities():
+        raise HTTPException(
+            status_code=409,
+            detail="Idempotency-Key was already used for a different order.",
+        )
+    return order
+
+
+async def place_order(
+    db: AsyncSession, user_id: uuid.UUID, order_in: OrderCreate, idempotency_key: str
+) -> tuple[OrderRead, bool]:
+    """
+    Price ``order_in`` against the venue's menu and insert the order and all
+    its items in one transaction. Returns the order and whether it was created.
+
+    A retry with the same key returns the order placed by the first request
+    instead of placing another, at any venue type; concurrent requests with
+    one key are settled by the primary key of order_idempotency_key.
+    """
+    ref = await find_order_by_key(db, user_id, idempotency_key)
+    if ref is not None:
+        return await _replay(db, user_id, ref, order_in), False
+
+    venue_type, subtype_id = await resolve_order_venue(db, order_in.venue_id)
+    if order_in.pickup_location_id is not None:
+        await check_pickup_location(db, order_in.venue_id, order_in.pickup_location_id)
+    quantities = order_in.quantities()
+    prices = await menu_prices(db, order_in.venue_id, list(quantities))
+    unknown = [str(item_id) for item_id in quantities if item_id not in prices]
+    if unknown:
+        raise HTTPException(
+            status_code=422,
+            detail={"message": "Items not on this venue's menu.", "items": unknown},
+        )
+
+    subtotal = sum(
+        (prices[item_id] * quantity for item_id, quantity in quantities.items()),
+        Decimal(0),
+    )
+    taxes = to_amount(subtotal * Decimal(str(settings.ORDER_TAX_RATE)))
+    total = subtotal + taxes
+
+    model = ORDER_MODELS[venue_type]
+    order = model(
+        user_id=user_id,
+        venue_id=subtype_id,
+        pickup_location_id=order_in.pickup_location_id,
+        note=order_in.note,
+        order_time=utcnow(),
+        total_amount=float(total),
+        taxes_and_charges=float(taxes),
+        status=OrderStatus.PLACED.value,
+        service_type=order_in.service_type,
+        idempotency_key=idempotency_key,
+    )
+    order_column = ORDER_ITEM_COLUMNS[venue_type]
+    lines = [
+        OrderItem(
+            item_id=item_id,
+            quantity=quantity,
+            unit_price=float(prices[item_id]),
+            **{order_column: order.id},
+        )
+        for item_id, quantity in quantities.items()
+    ]
+    try:
+        await db.execute(
+            insert(OrderIdempotencyKey).values(
+                user_id=user_id,
+                idempotency_key=idempotency_key,
+                venue_type=venue_type.value,
+                order_id=order.id,
+                created_at=utcnow(),
+            )
+        )
+        await db.execute(insert(model).values(**order.model_dump(exclude_none=True)))
+        await db.execute(
+            insert(OrderItem).values(
+                [line.model_dump(exclude_none=True) for line in lines]
+            )
+        )
+        await get_order_broker().publish(
+            db,
+            OrderEvent(
+                order_id=order.id,
+                venue_type=venue_type,
+                venue_id=order_in.venue_id,
+                pickup_location_id=order.pickup_location_id,
+                status=OrderStatus.PLACED,
+                order_time=order.order_time,
+            ),
+        )
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        ref = await find_order_by_key(db, user_id, idempotency_key)
+        if ref is None:
+            raise HTTPException(
+                status_code=422, detail="Order references a record that does not exist."
+            )
+        # A concurrent request with the same key won the race
+        return await _replay(db, user_id, ref, order_in), False
+
+    logger.info(
+        "Placed order order_id=%s venue_type=%s items=%d total=%s",
+        order.id,
+        venue_type.value,
+        len(lines),
+        total,
+    )
+    return order_read(order, lines, venue_type, order_in.venue_id), True
+
+
+async def order_venue_id(
+    db: AsyncSession, venue_type: VenueType, order_id: uuid.UUID
+) -> uuid.UUID | None:
+    """
+    The ID of the Venue an order was placed at, or None if there is no such
+    order.
+    """
+    model = ORDER_MODELS[venue_type]
+    venue_model = VENUE_TYPE_MODELS[venue_type]
+    statement = (
+        select(venue_model.venue_id)
+        .join(model, model.venue_id == venue_model.id)
+        .where(model.id == order_id)
+    )
+    return (await db.execute(statement)).scalar_one_or_none()
+
+
+async def update_order_status(
+    db: AsyncSession,
+    venue_type: VenueType,
+    order_id: uuid.UUID,
+    venue_id: uuid.UUID,
+    status: OrderStatus,
+) -> None:
+    """
+    Set the status of an order and publish the change, in one transaction.
+    Setting the status it already has publishes nothing; a move TRANSITIONS
+    does not allow is refused with a 409.
+    """
+    model = ORDER_MODELS[venue_type]
+    allowed = [previous.value for previous in TRANSITIONS[status]]
+    row = None
+    if allowed:
+        statement = (
+            update(model)
+            .where(model.id == order_id, model.status.in_(allowed))
+            .values(status=status.value)
+            .returning(model.pickup_location_id, model.order_time)
+        )
+        row = (await db.execute(statement)).first()
+    if row is None:
+        current = (
+            await db.execute(select(model.status).where(model.id == order_id))
+        ).scalar_one_or_none()
+        if current != status.value:
+            await db.rollback()
+            raise HTTPException(
+                status_code=409,
+                detail=f"Order cannot go from {current} to {status.value}.",
+            )
+    else:
+        pickup_location_id, order_time = row
+        await get_order_broker().publish(
+            db,
+            OrderEvent(
+                order_id=order_id,
+                venue_type=venue_type,
+                venue_id=venue_id,
+                pickup_location_id=pickup_location_id,
+                status=status,
+                order_time=order_time,
+            ),
+        )
+    await db.commit()
@@ -0,0 +1,256 @@
+import asyncio
+import logging
+import uuid
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from collections.abc import AsyncIterator, Iterable
+from datetime import datetime
+from functools import lru_cache
+from typing import Any
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import event as sa_event
+from sqlalchemy import func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.constants import OrderStatus, VenueType
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Postgres NOTIFY channel shared by all workers
+ORDER_EVENTS_CHANNEL = "order_events"
+
+# Key in Session.info of the events waiting for the session's commit
+PENDING_EVENTS_KEY = "pending_order_events"
+
+
+def venue_topic(venue_id: uuid.UUID) -> str:
+    return f"venue:{venue_id}"
+
+
+def pickup_location_topic(pickup_location_id: uuid.UUID) -> str:
+    return f"pickup-location:{pickup_location_id}"
+
+
+class OrderEvent(BaseModel):
+    """
+    An order was placed or changed status. Kept small: a NOTIFY payload is
+    capped at 8000 bytes, and clients fetch the full order when they need it.
+    """
+
+    order_id: uuid.UUID
+    venue_type: VenueType
+    venue_id: uuid.UUID  # ID of the Venue
+    pickup_location_id: uuid.UUID | None = None
+    status: OrderStatus
+    order_time: datetime
+
+    def topics(self) -> list[str]:
+        topics = [venue_topic(self.venue_id)]
+        if self.pickup_location_id is not None:
+            topics.append(pickup_location_topic(self.pickup_location_id))
+        return topics
+
+
+class Subscription:
+    """
+    One client's bounded queue of order events. A client that falls behind
+    is ended rather than buffered without limit; it reconnects and reloads.
+    """
+
+    def __init__(
+        self, broker: "OrderEventBroker", topics: Iterable[str], max_size: int
+    ) -> None:
+        self.broker = broker
+        self.topics = frozenset(topics)
+        self.ended = False
+        self._queue: asyncio.Queue[OrderEvent | None] = asyncio.Queue(max_size)
+
+    def deliver(self, event: OrderEvent) -> None:
+        if self.ended:
+            return
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            logger.warning("Ending slow order event subscriber topics=%s", self.topics)
+            self.ended = True
+
+    def end(self) -> None:
+        self.ended = True
+        try:
+            # Wake the consumer now rather than at its next heartbeat
+            self._queue.put_nowait(None)
+        except asyncio.QueueFull:
+            pass
+
+    async def next_event(self, timeout: float) -> OrderEvent | None:
+        """
+        The next event, or None if none arrived within ``timeout`` seconds.
+        """
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self) -> None:
+        self.broker.unsubscribe(self)
+
+
+class OrderEventBroker(ABC):
+    """
+    Fans order events out to the subscriptions of this worker, by venue and
+    by pickup location. Events are published as part of the writing
+    transaction and delivered only once it commits.
+    """
+
+    def __init__(self) -> None:
+        self._subscriptions: defaultdict[str, set[Subscription]] = defaultdict(set)
+
+    @abstractmethod
+    async def publish(self, db: AsyncSession, event: OrderEvent) -> None:
+        """Publish ``event`` when the transaction of ``db`` commits."""
+
+    async def start(self) -> None:  # noqa: B027
+        """Start receiving events, if this broker needs to."""
+
+    async def subscribe(self, topics: Iterable[str]) -> Subscription:
+        await self.start()
+        subscription = Subscription(self, topics, settings.ORDER_EVENTS_QUEUE_SIZE)
+        for topic in subscription.topics:
+            self._subscriptions[topic].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        for topic in subscription.topics:
+            subscribers = self._subscriptions.get(topic)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscriptions[topic]
+
+    def dispatch(self, event: OrderEvent) -> None:
+        """
+        Hand ``event`` to every subscription of one of its topics, once each.
+        """
+        subscriptions: set[Subscription] = set()
+        for topic in event.topics():
+            subscriptions.update(self._subscriptions.get(topic, ()))
+        for subscription in subscriptions:
+            subscription.deliver(event)
+
+    def end_all(self) -> None:
+        for subscribers in list(self._subscriptions.values()):
+            for subscription in list(subscribers):
+                subscription.end()
+
+
+class InProcessOrderBroker(OrderEventBroker):
+    """
+    Delivers events to subscribers of the same worker only, for development
+    and tests.
+    """
+
+    async def publish(self, db: AsyncSession, event: OrderEvent) -> None:
+        session = db.sync_session
+        if PENDING_EVENTS_KEY not in session.info:
+            session.info[PENDING_EVENTS_KEY] = []
+            sa_event.listen(session, "after_commit", self._after_commit)
+            sa_event.listen(session, "after_soft_rollback", _discard_pending)
+        session.info[PENDING_EVENTS_KEY].append(event)
+
+    def _after_commit(self, session: Any) -> None:
+        events = session.info.get(PENDING_EVENTS_KEY, [])
+        session.info[PENDING_EVENTS_KEY] = []
+        for event in events:
+            self.dispatch(event)
+
+
+def _discard_pending(session: Any, _previous_transaction: Any) -> None:
+    session.info[PENDING_EVENTS_KEY] = []
+
+
+class PostgresOrderBroker(OrderEventBroker):
+    """
+    Publishes with ``pg_notify`` inside the writing transaction, which
+    Postgres delivers on commit, and receives on a single LISTEN connection
+    per worker shared by all of its subscribers.
+
+    If the connection drops, every subscription is ended so that clients
+    reconnect and reload what they missed; the next subscribe reconnects.
+    """
+
+    def __init__(self, dsn: str) -> None:
+        super().__init__()
+        self.dsn = dsn
+        self._connection: Any = None
+        self._lock = asyncio.Lock()
+
+    async def publish(self, db: AsyncSession, event: OrderEvent) -> None:
+        await db.execute(
+            select(func.pg_notify(ORDER_EVENTS_CHANNEL, event.model_dump_json()))
+        )
+
+    async def start(self) -> None:
+        if self._connection is not None:
+            return
+        async with self._lock:
+            if self._connection is not None:
+                return
+            import asyncpg
+
+            connection = await asyncpg.connect(self.dsn)
+            await connection.add_listener(ORDER_EVENTS_CHANNEL, self._on_notify)
+            connection.add_termination_listener(self._on_terminate)
+            self._connection = connection
+            logger.info("Listening for order events channel=%s", ORDER_EVENTS_CHANNEL)
+
+    def _on_notify(self, connection: Any, pid: int, channel: str, payload: str) -> None:
+        try:
+            event = OrderEvent.model_validate_json(payload)
+        except ValidationError:
+            logger.exception("Dropping malformed order event payload=%r", payload)
+            return
+        self.dispatch(event)
+
+    def _on_terminate(self, connection: Any) -> None:
+        logger.warning("Order event listener connection closed")
+        self._connection = None
+        self.end_all()
+
+
+@lru_cache(maxsize=1)
+def get_order_broker() -> OrderEventBroker:
+    if settings.ORDER_EVENTS_BROKER == "memory":
+        return InProcessOrderBroker()
+    if settings.POSTGRES_PGBOUNCER and not settings.ORDER_EVENTS_DATABASE_URL:
+        logger.warning(
+            "LISTEN does not work through PgBouncer and ORDER_EVENTS_DATABASE_URL "
+            "is not set; order events will only reach subscribers of this worker"
+        )
+        return InProcessOrderBroker()
+    dsn = settings.ORDER_EVENTS_DATABASE_URL or settings.SQLALCHEMY_ASYNC_DATABASE_URI
+    return PostgresOrderBroker(dsn.replace("postgresql+asyncpg://", "postgresql://"))
+
+
+async def stream_order_events(subscription: Subscription) -> AsyncIterator[bytes]:
+    """
+    Server-sent events for ``subscription``, with a comment line as heartbeat
+    so that proxies keep the connection open and dead clients are noticed.
+    """
+    try:
+        yield b"retry: 3000\n\n"
+        while not subscription.ended:
+            event = await subscription.next_event(
+                settings.ORDER_EVENTS_HEARTBEAT_SECONDS
+            )
+            if event is None:
+                if not subscription.ended:
+                    yield b": keep-alive\n\n"
+                continue
+            yield (
+                f"id: {event.order_id}\nevent: order\n"
+                f"data: {event.model_dump_json()}\n\n"
+            ).encode()
+    finally:
+        subscription.close()
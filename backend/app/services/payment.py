@@ -0,0 +1,368 @@
+import asyncio
+import hashlib
+import hmac
+import logging
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+import httpx
+from sqlalchemy import and_, or_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlmodel import SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.constants import PaymentSource, PaymentStatus, WebhookOutcome
+from app.core.config import settings
+from app.core.db import get_async_session_maker
+from app.models.base_model import utcnow
+from app.models.payment import (
+    PaymentEvent,
+    PaymentOrderNightclub,
+    PaymentOrderQSR,
+    PaymentOrderRestaurant,
+)
+from app.models.payment_webhook_event import PaymentWebhookEvent
+from app.schema.payment import PaymentWebhook
+
+logger = logging.getLogger(__name__)
+
+PAYMENT_MODELS: dict[PaymentSource, type[SQLModel]] = {
+    PaymentSource.NIGHTCLUB: PaymentOrderNightclub,
+    PaymentSource.QSR: PaymentOrderQSR,
+    PaymentSource.RESTAURANT: PaymentOrderRestaurant,
+    PaymentSource.EVENT: PaymentEvent,
+}
+
+# The statuses a payment may be in to move to each status. A payment never
+# goes back to pending, so late or repeated gateway events change nothing.
+TRANSITIONS: dict[PaymentStatus, tuple[PaymentStatus, ...]] = {
+    PaymentStatus.PENDING: (),
+    PaymentStatus.FAILED: (PaymentStatus.PENDING,),
+    PaymentStatus.PAID: (PaymentStatus.PENDING, PaymentStatus.FAILED),
+    PaymentStatus.REFUNDED: (PaymentStatus.PAID,),
+}
+# Within a batch, earlier statuses are applied first
+STATUS_ORDER = list(TRANSITIONS)
+
+MAX_BACKOFF_SECONDS = 60 * 60
+
+# Concurrent status requests to the gateway per retry run
+GATEWAY_CONCURRENCY = 10
+
+
+def sign_webhook(body: bytes, secret: str) -> str:
+    return hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+def verify_signature(body: bytes, signature: str) -> bool:
+    secret = settings.PAYMENT_WEBHOOK_SECRET
+    if secret is None:
+        return False
+    return hmac.compare_digest(sign_webhook(body, secret), signature)
+
+
+def backoff_seconds(attempt: int) -> int:
+    """
+    Delay before retry number ``attempt + 1``: doubling from
+    PAYMENT_RETRY_BASE_SECONDS, capped at an hour.
+    """
+    return min(settings.PAYMENT_RETRY_BASE_SECONDS * 2**attempt, MAX_BACKOFF_SECONDS)
+
+
+async def store_webhook(db: AsyncSession, webhook: PaymentWebhook) -> bool:
+    """
+    Queue a webhook for the worker with a single INSERT. Returns False if
+    the gateway had already delivered the event.
+    """
+    statement = (
+        pg_insert(PaymentWebhookEvent)
+        .values(
+            **PaymentWebhookEvent(
+                gateway_event_id=webhook.event_id,
+                source_type=webhook.source_type.value,
+                gateway_transaction_id=webhook.transaction_id,
+                status=webhook.status.value,
+            ).model_dump()
+        )
+        .on_conflict_do_nothing(index_elements=["gateway_event_id"])
+    )
+    result = await db.execute(statement)
+    await db.commit()
+    return result.rowcount == 1
+
+
+async def _apply_statuses(
+    db: AsyncSession,
+    source: PaymentSource,
+    status: PaymentStatus,
+    transaction_ids: set[uuid.UUID],
+) -> dict[uuid.UUID, WebhookOutcome]:
+    """
+    Move the payments with ``transaction_ids`` to ``status`` where allowed,
+    with one UPDATE. Transaction IDs of no payment are left out.
+    """
+    model = PAYMENT_MODELS[source]
+    applied: set[uuid.UUID] = set()
+    allowed = [previous.value for previous in TRANSITIONS[status]]
+    if allowed:
+        rows = await db.execute(
+            update(model)
+            .where(
+                model.gateway_transaction_id.in_(transaction_ids),
+                model.status.in_(allowed),
+            )
+            .values(status=status.value)
+            .returning(model.gateway_transaction_id)
+        )
+        applied = set(rows.scalars())
+    outcomes = dict.fromkeys(applied, WebhookOutcome.APPLIED)
+    others = transaction_ids - applied
+    if others:
+        rows = await db.execute(
+            select(model.gateway_transaction_id).where(
+                model.gateway_transaction_id.in_(others)
+            )
+        )
+        outcomes.update(dict.fromkeys(rows.scalars(), WebhookOutcome.IGNORED))
+    return outcomes
+
+
+async def process_webhook_batch(db: AsyncSession, batch_size: int) -> int:
+    """
+    Apply up to ``batch_size`` due webhooks to their payments in one
+    transaction, with one UPDATE per payment table and status. Returns how
+    many webhooks were claimed.
+
+    Webhooks claimed by another worker are skipped. A webhook whose payment
+    does not exist yet is retried with backoff, and given up on after
+    PAYMENT_RETRY_MAX_ATTEMPTS.
+    """
+    now = utcnow()
+    claimed = (
+        await db.execute(
+            select(
+                PaymentWebhookEvent.id,
+                PaymentWebhookEvent.source_type,
+                PaymentWebhookEvent.gateway_transaction_id,
+                PaymentWebhookEvent.status,
+                PaymentWebhookEvent.attempts,
+            )
+            .where(
+                PaymentWebhookEvent.processed_at.is_(None),
+                PaymentWebhookEvent.next_attempt_at <= now,
+            )
+            .order_by(PaymentWebhookEvent.next_attempt_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+    ).all()
+    if not claimed:
+        await db.commit()
+        return 0
+
+    groups: defaultdict[tuple[PaymentSource, PaymentStatus], set[uuid.UUID]]
+    groups = defaultdict(set)
+    for event in claimed:
+        key = (PaymentSource(event.source_type), PaymentStatus(event.status))
+        groups[key].add(event.gateway_transaction_id)
+
+    outcomes: dict[tuple[PaymentSource, PaymentStatus, uuid.UUID], WebhookOutcome]
+    outcomes = {}
+    for source, status in sorted(groups, key=lambda key: STATUS_ORDER.index(key[1])):
+        applied = await _apply_statuses(db, source, status, groups[source, status])
+        for transaction_id, outcome in applied.items():
+            outcomes[source, status, transaction_id] = outcome
+
+    changes = []
+    for event in claimed:
+        key = (
+            PaymentSource(event.source_type),
+            PaymentStatus(event.status),
+            event.gateway_transaction_id,
+        )
+        outcome = outcomes.get(key)
+        attempts = event.attempts + 1
+        if outcome is None and attempts >= settings.PAYMENT_RETRY_MAX_ATTEMPTS:
+            outcome = WebhookOutcome.UNMATCHED
+            logger.warning(
+                "Giving up on payment webhook event_id=%s transaction_id=%s",
+                event.id,
+                event.gateway_transaction_id,
+            )
+        if outcome is None:
+            changes.append(
+                {
+                    "id": event.id,
+                    "attempts": attempts,
+                    "next_attempt_at": now
+                    + timedelta(seconds=backoff_seconds(event.attempts)),
+                }
+            )
+        else:
+            changes.append(
+                {
+                    "id": event.id,
+                    "attempts": attempts,
+                    "processed_at": now,
+                    "outcome": outcome.value,
+                }
+            )
+    await db.execute(update(PaymentWebhookEvent), changes)
+    await db.commit()
+    return len(claimed)
+
+
+async def process_webhook_events() -> int:
+    """
+    Periodic job applying every due webhook, batch by batch.
+    """
+    processed = 0
+    async with get_async_session_maker()() as db:
+        while True:
+            count = await process_webhook_batch(db, settings.PAYMENT_WEBHOOK_BATCH)
+            processed += count
+            if count < settings.PAYMENT_WEBHOOK_BATCH:
+                break
+    if processed:
+        logger.info("Processed payment webhooks count=%d", processed)
+    return processed
+
+
+class PaymentGatewayClient:
+    """
+    Reads the status of a transaction from the payment gateway.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        timeout: float,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self._client = httpx.AsyncClient(
+            base_url=base_url, timeout=timeout, transport=transport
+        )
+
+    async def fetch_status(self, transaction_id: uuid.UUID) -> PaymentStatus:
+        response = await self._client.get(f"/transactions/{transaction_id}")
+        response.raise_for_status()
+        return PaymentStatus(response.json()["status"])
+
+
+@lru_cache(maxsize=1)
+def get_gateway_client() -> PaymentGatewayClient | None:
+    if settings.PAYMENT_GATEWAY_URL is None:
+        return None
+    return PaymentGatewayClient(
+        settings.PAYMENT_GATEWAY_URL, settings.PAYMENT_GATEWAY_TIMEOUT_SECONDS
+    )
+
+
+def _retry_due(model: type[SQLModel], now: datetime):  # type: ignore[no-untyped-def]
+    """
+    Pending payments due for a gateway poll: ``backoff_seconds(retry_count)``
+    after the last poll, or after the payment itself for the first one.
+    """
+    return and_(
+        model.status == PaymentStatus.PENDING.value,
+        model.gateway_transaction_id.is_not(None),
+        or_(
+            and_(
+                model.last_attempt_time.is_(None),
+                model.payment_time <= now - timedelta(seconds=backoff_seconds(0)),
+            ),
+            *(
+                and_(
+                    model.retry_count == attempt,
+                    model.last_attempt_time
+                    <= now - timedelta(seconds=backoff_seconds(attempt)),
+                )
+                for attempt in range(settings.PAYMENT_RETRY_MAX_ATTEMPTS)
+            ),
+        ),
+    )
+
+
+async def _poll(
+    client: PaymentGatewayClient,
+    semaphore: asyncio.Semaphore,
+    transaction_id: uuid.UUID,
+) -> PaymentStatus | None:
+    async with semaphore:
+        try:
+            return await client.fetch_status(transaction_id)
+        except (httpx.HTTPError, KeyError, ValueError):
+            logger.warning(
+                "Gateway status poll failed transaction_id=%s", transaction_id
+            )
+            return None
+
+
+async def retry_pending_payments_of(
+    db: AsyncSession, client: PaymentGatewayClient, source: PaymentSource
+) -> int:
+    """
+    Poll the gateway for the due pending payments of one table and apply
+    what it reports. Returns how many payments were polled.
+
+    Payments are claimed first, by counting the attempt in a committed
+    UPDATE, so workers never poll the same payment at once and no lock is
+    held while the gateway answers.
+    """
+    model = PAYMENT_MODELS[source]
+    now = utcnow()
+    due = (
+        select(model.id)
+        .where(_retry_due(model, now))
+        .limit(settings.PAYMENT_WEBHOOK_BATCH)
+        .with_for_update(skip_locked=True)
+    )
+    claimed = (
+        await db.execute(
+            update(model)
+            .where(model.id.in_(due.scalar_subquery()))
+            .values(retry_count=model.retry_count + 1, last_attempt_time=now)
+            .returning(model.id, model.gateway_transaction_id, model.retry_count)
+        )
+    ).all()
+    await db.commit()
+    if not claimed:
+        return 0
+
+    semaphore = asyncio.Semaphore(GATEWAY_CONCURRENCY)
+    statuses = await asyncio.gather(
+        *(_poll(client, semaphore, transaction_id) for _, transaction_id, _ in claimed)
+    )
+    for (payment_id, _, retry_count), status in zip(claimed, statuses, strict=True):
+        if status in (None, PaymentStatus.PENDING):
+            if retry_count < settings.PAYMENT_RETRY_MAX_ATTEMPTS:
+                continue
+            status = PaymentStatus.FAILED
+        await db.execute(
+            update(model)
+            .where(
+                model.id == payment_id,
+                model.status.in_([previous.value for previous in TRANSITIONS[status]]),
+            )
+            .values(status=status.value)
+        )
+    await db.commit()
+    return len(claimed)
+
+
+async def retry_pending_payments() -> int:
+    """
+    Periodic job polling the gateway for payments no webhook has settled.
+    """
+    client = get_gateway_client()
+    if client is None:
+        return 0
+    polled = 0
+    async with get_async_session_maker()() as db:
+        for source in PAYMENT_MODELS:
+            polled += await retry_pending_payments_of(db, client, source)
+    if polled:
+        logger.info("Polled pending payments count=%d", polled)
+    return polled
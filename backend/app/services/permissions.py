@@ -0,0 +1,104 @@
+import json
+import uuid
+from functools import lru_cache
+
+from sqlmodel import SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.cache import CacheBackend, get_cache_backend
+from app.core.config import settings
+from app.models.menu import Menu, MenuCategory, MenuItem, MenuSubCategory
+from app.models.user import UserBusiness, UserVenueAssociation
+
+# Joins from each menu entity up to its Menu, whose venue_id owns it
+MENU_VENUE_JOINS: dict[type[SQLModel], tuple[type[SQLModel], ...]] = {
+    Menu: (),
+    MenuCategory: (MenuCategory,),
+    MenuSubCategory: (MenuSubCategory, MenuCategory),
+    MenuItem: (MenuItem, MenuSubCategory, MenuCategory),
+}
+
+
+async def venue_of(
+    db: AsyncSession, model: type[SQLModel], record_id: uuid.UUID
+) -> uuid.UUID | None:
+    """
+    The venue owning a menu, category, subcategory or item, read with one
+    joined query that selects only the venue ID. None if the record does
+    not exist.
+    """
+    joins = MENU_VENUE_JOINS[model]
+    statement = select(Menu.venue_id)
+    if joins:
+        statement = statement.select_from(joins[0])
+        for child in joins[1:]:
+            statement = statement.join(child)
+        statement = statement.join(Menu)
+    statement = statement.where(model.id == record_id)  # type: ignore[attr-defined]
+    return (await db.execute(statement)).scalar_one_or_none()
+
+
+class VenuePermissionCache:
+    """
+    Short-TTL cache of the set of venues each business user manages, so a
+    burst of writes costs one association query instead of one per write.
+
+    Creating an association invalidates the user's entry, and a venue missing
+    from an entry is re-read before access is denied; the TTL bounds how long
+    a removed association can still be honoured.
+    """
+
+    def __init__(self, backend: CacheBackend, ttl: int | None = None):
+        self.backend = backend
+        self.ttl = ttl
+
+    @staticmethod
+    def _key(user_id: uuid.UUID) -> str:
+        return f"venues-of:{user_id}"
+
+    def get(self, user_id: uuid.UUID) -> frozenset[uuid.UUID] | None:
+        raw = self.backend.get(self._key(user_id))
+        if raw is None:
+            return None
+        return frozenset(uuid.UUID(venue_id) for venue_id in json.loads(raw))
+
+    def store(self, user_id: uuid.UUID, venue_ids: frozenset[uuid.UUID]) -> None:
+        payload = json.dumps(sorted(str(venue_id) for venue_id in venue_ids))
+        self.backend.set(self._key(user_id), payload.encode(), ttl=self.ttl)
+
+    def invalidate(self, user_id: uuid.UUID) -> None:
+        self.backend.delete(self._key(user_id))
+
+
+@lru_cache(maxsize=1)
+def get_venue_permission_cache() -> VenuePermissionCache:
+    return VenuePermissionCache(
+        get_cache_backend(), ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS
+    )
+
+
+async def _read_managed_venue_ids(
+    db: AsyncSession, user: UserBusiness
+) -> frozenset[uuid.UUID]:
+    rows = await db.execute(
+        select(UserVenueAssociation.venue_id).where(
+            UserVenueAssociation.user_id == user.id
+        )
+    )
+    venue_ids = frozenset(rows.scalars().all())
+    get_venue_permission_cache().store(user.id, venue_ids)
+    return venue_ids
+
+
+async def manages_venue(
+    db: AsyncSession, user: UserBusiness, venue_id: uuid.UUID
+) -> bool:
+    """
+    Whether the user manages the venue. A cached set without the venue is
+    re-read before answering no, since the association may have been made
+    on another worker whose invalidation this one never saw.
+    """
+    venue_ids = get_venue_permission_cache().get(user.id)
+    if venue_ids is not None and venue_id in venue_ids:
+        return True
+    return venue_id in await _read_managed_venue_ids(db, user)
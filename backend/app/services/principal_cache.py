@@ -0,0 +1,50 @@
+import uuid
+from functools import lru_cache
+
+from app.core.cache import CacheBackend, get_cache_backend
+from app.core.config import settings
+from app.models.auth import CachedPrincipal
+from app.models.user import UserBusiness, UserPublic
+
+
+class PrincipalCache:
+    """
+    Short-TTL cache of authenticated principals keyed by the token subject.
+
+    Keyed by user ID rather than by token ``jti`` so that a single invalidation
+    covers every token issued to the user.
+    """
+
+    def __init__(self, backend: CacheBackend, ttl: int | None = None):
+        self.backend = backend
+        self.ttl = ttl
+
+    @staticmethod
+    def _key(user_id: uuid.UUID | str) -> str:
+        return f"principal:{user_id}"
+
+    def get(self, user_id: uuid.UUID | str) -> CachedPrincipal | None:
+        raw = self.backend.get(self._key(user_id))
+        if raw is None:
+            return None
+        return CachedPrincipal.model_validate_json(raw)
+
+    def store(self, user: UserPublic | UserBusiness) -> CachedPrincipal:
+        principal = CachedPrincipal(
+            id=user.id,
+            user_type="business" if isinstance(user, UserBusiness) else "public",
+            is_active=user.is_active,
+            is_superuser=user.is_superuser,
+        )
+        self.backend.set(
+            self._key(user.id), principal.model_dump_json().encode(), ttl=self.ttl
+        )
+        return principal
+
+    def invalidate(self, user_id: uuid.UUID | str) -> None:
+        self.backend.delete(self._key(user_id))
+
+
+@lru_cache(maxsize=1)
+def get_principal_cache() -> PrincipalCache:
+    return PrincipalCache(get_cache_backend(), ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS)
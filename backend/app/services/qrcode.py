@@ -0,0 +1,220 @@
+import asyncio
+import io
+import json
+import logging
+import re
+import uuid
+import zipfile
+from collections.abc import AsyncIterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import NamedTuple
+
+from jinja2 import Template
+from sqlalchemy import insert, literal, union_all
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.constants import VenueType
+from app.core.cache import CachedPayload, get_versioned_cache
+from app.core.config import settings
+from app.models.qrcode import QRCode
+from app.schema.qrcode import QRCodeBulkCreate
+from app.services.venue import VENUE_TYPE_MODELS
+
+logger = logging.getLogger(__name__)
+
+LANDING_PAGE_PATH = Path(__file__).parent.parent / "static" / "landing_page.html"
+
+# Compiled once; a missing template fails at import rather than on every scan.
+LANDING_PAGE_TEMPLATE = Template(LANDING_PAGE_PATH.read_text())
+
+# The scan index is valid for one version of this scope. QR code writes bump
+# it, so every worker reloads its index on the next scan.
+SCAN_CACHE_SCOPE = "scan"
+
+
+class ScanTarget(NamedTuple):
+    venue_type: VenueType
+    venue_id: uuid.UUID
+
+
+class QRScanIndex:
+    """
+    In-memory map of QR code ID to the venue it opens, loaded from the
+    ``qrcode`` table in one query and reloaded when the QR codes change.
+
+    The landing page rendered for each QR code is kept alongside, so a scan
+    of a known code needs neither the database nor the template.
+    """
+
+    def __init__(self) -> None:
+        self._targets: dict[uuid.UUID, ScanTarget] = {}
+        self._pages: dict[uuid.UUID, CachedPayload] = {}
+        self._version: int | None = None
+        self._lock = asyncio.Lock()
+
+    async def load(self, db: AsyncSession) -> None:
+        """
+        Reload the map if the QR codes changed since it was last loaded.
+        """
+        version = get_versioned_cache("qrcode").version(SCAN_CACHE_SCOPE)
+        if version == self._version:
+            return
+        async with self._lock:
+            if version == self._version:
+                return
+            self._targets = await load_scan_targets(db)
+            self._pages = {}
+            self._version = version
+            logger.info(
+                "Loaded QR scan index qr_codes=%d version=%d",
+                len(self._targets),
+                version,
+            )
+
+    async def landing_page(
+        self, db: AsyncSession, qr_id: uuid.UUID
+    ) -> CachedPayload | None:
+        """
+        The rendered landing page for ``qr_id``, or None if no QR code with
+        that ID is linked to a venue.
+        """
+        await self.load(db)
+        page = self._pages.get(qr_id)
+        if page is None:
+            target = self._targets.get(qr_id)
+            if target is None:
+                return None
+            html = LANDING_PAGE_TEMPLATE.render(
+                venueId=str(target.venue_id), venueType=target.venue_type.value
+            )
+            page = self._pages[qr_id] = CachedPayload.from_payload(html.encode())
+        return page
+
+
+async def load_scan_targets(db: AsyncSession) -> dict[uuid.UUID, ScanTarget]:
+    """
+    Map every QR code to its venue and venue type in a single query.
+    """
+    statement = union_all(
+        *(
+            select(QRCode.id, QRCode.venue_id, literal(venue_type.value)).join(
+                model, model.venue_id == QRCode.venue_id
+            )
+            for venue_type, model in VENUE_TYPE_MODELS.items()
+        )
+    )
+    rows = await db.execute(statement)
+    return {
+        qr_id: ScanTarget(VenueType(venue_type), venue_id)
+        for qr_id, venue_id, venue_type in rows
+    }
+
+
+qr_scan_index = QRScanIndex()
+
+
+def invalidate_qr_scans() -> None:
+    get_versioned_cache("qrcode").invalidate(SCAN_CACHE_SCOPE)
+
+
+async def create_qr_codes(db: AsyncSession, bulk: QRCodeBulkCreate) -> list[QRCode]:
+    """
+    Create one QR code per requested table with a single multi-row INSERT,
+    committed as one transaction.
+    """
+    qr_codes = [
+        QRCode(venue_id=bulk.venue_id, table_number=table_number)
+        for table_number in bulk.tables()
+    ]
+    await db.execute(
+        insert(QRCode).values([qr_code.model_dump() for qr_code in qr_codes])
+    )
+    await db.commit()
+    invalidate_qr_scans()
+    return qr_codes
+
+
+def scan_url(qr_id: uuid.UUID) -> str:
+    return f"{settings.server_host}{settings.API_V1_STR}/scan/{qr_id}"
+
+
+def render_qr_png(url: str) -> bytes:
+    """
+    Render ``url`` as a printable QR code PNG. Runs in a worker process.
+    """
+    import segno
+
+    buffer = io.BytesIO()
+    segno.make(url, error="m").save(buffer, kind="png", scale=10, border=4)
+    return buffer.getvalue()
+
+
+@lru_cache(maxsize=1)
+def get_qr_image_pool() -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(max_workers=settings.QR_IMAGE_WORKERS)
+
+
+class _ChunkWriter(io.RawIOBase):
+    """
+    Write-only sink that hands out what has been written since the last
+    drain, so a ZIP can be streamed while it is being built.
+    """
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:  # type: ignore[no-untyped-def]
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _archive_name(qr_code: QRCode) -> str:
+    label = re.sub(r"[^A-Za-z0-9._-]+", "_", qr_code.table_number or "") or "venue"
+    return f"table-{label}-{str(qr_code.id)[:8]}.png"
+
+
+async def stream_qr_archive(qr_codes: Sequence[QRCode]) -> AsyncIterator[bytes]:
+    """
+    Stream a ZIP with one PNG per QR code, plus a ``qrcodes.json`` manifest
+    of the records.
+
+    The images are rendered in parallel in the worker pool and written to the
+    archive in order, each one sent as soon as it is ready.
+    """
+    loop = asyncio.get_running_loop()
+    pool = get_qr_image_pool()
+    renders = [
+        loop.run_in_executor(pool, render_qr_png, scan_url(qr_code.id))
+        for qr_code in qr_codes
+    ]
+
+    sink = _ChunkWriter()
+    try:
+        with zipfile.ZipFile(sink, mode="w") as archive:
+            manifest = [
+                qr_code.to_read_schema().model_dump(mode="json") for qr_code in qr_codes
+            ]
+            archive.writestr("qrcodes.json", json.dumps(manifest, indent=2))
+            yield sink.drain()
+            for qr_code, render in zip(qr_codes, renders, strict=True):
+                # PNGs are already compressed
+                archive.writestr(
+                    _archive_name(qr_code), await render, zipfile.ZIP_STORED
+                )
+                yield sink.drain()
+        yield sink.drain()
+    finally:
+        # Drop renders still queued if the client went away
+        for render in renders:
+            render.cancel()
@@ -0,0 +1,150 @@
+import uuid
+from collections.abc import Sequence
+from datetime import datetime, time
+from zoneinfo import ZoneInfo
+
+import h3
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import joinedload, selectinload
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.constants import VenueType
+from app.core.config import settings
+from app.models.user import UserVenueAssociation
+from app.models.venue import QSR, Foodcourt, Nightclub, Restaurant, Venue
+from app.schema.venue import VenueListResponse
+from app.utils import get_h3_index, haversine_m, resolution_for_radius
+
+# Loader options for each venue type's to_read_schema: every type embeds its
+# Venue, and a Foodcourt also embeds its QSRs together with their venues.
+VENUE_READ_OPTIONS = {
+    Foodcourt: (
+        selectinload(Foodcourt.venue),
+        selectinload(Foodcourt.qsrs).selectinload(QSR.venue),
+    ),
+    QSR: (selectinload(QSR.venue),),
+    Restaurant: (selectinload(Restaurant.venue),),
+    Nightclub: (selectinload(Nightclub.venue),),
+}
+
+# A Venue with whichever subtype row it has, joined in the same query, and a
+# Foodcourt's QSRs with their venues in one more. A subtype's own ``venue`` is
+# the Venue already in the identity map, so reading it needs no query.
+MANAGED_VENUE_OPTIONS = (
+    joinedload(Venue.nightclub),
+    joinedload(Venue.qsr),
+    joinedload(Venue.restaurant),
+    joinedload(Venue.foodcourt).selectinload(Foodcourt.qsrs).joinedload(QSR.venue),
+)
+
+VENUE_TYPE_MODELS = {
+    VenueType.FOODCOURT: Foodcourt,
+    VenueType.QSR: QSR,
+    VenueType.RESTAURANT: Restaurant,
+    VenueType.NIGHTCLUB: Nightclub,
+}
+
+
+def venue_local_time() -> time:
+    return datetime.now(ZoneInfo(settings.VENUE_TIMEZONE)).time()
+
+
+def open_at(now: time):
+    """
+    SQL condition for venues open at ``now``. A closing time earlier than the
+    opening time means the venue closes after midnight.
+    """
+    return or_(
+        and_(
+            Venue.opening_time <= Venue.closing_time,
+            Venue.opening_time <= now,
+            Venue.closing_time > now,
+        ),
+        and_(
+            Venue.opening_time > Venue.closing_time,
+            or_(Venue.opening_time <= now, Venue.closing_time > now),
+        ),
+    )
+
+
+async def find_nearby_venues(
+    db: AsyncSession,
+    latitude: float,
+    longitude: float,
+    radius_m: float,
+    venue_type: VenueType | None = None,
+    open_now: bool = False,
+    min_price: float | None = None,
+    max_price: float | None = None,
+    limit: int = 20,
+) -> list[tuple[Venue, float]]:
+    """
+    Find venues within ``radius_m`` of a point, nearest first.
+
+    Candidates are prefetched through the indexed H3 cell column at the
+    finest resolution whose k-ring covers the radius, with the type, open-now
+    and price filters applied in the same query. The candidates are then
+    ranked by exact haversine distance, and those outside the radius dropped.
+
+    :param db: The active async database session.
+    :param latitude: Latitude of the search centre.
+    :param longitude: Longitude of the search centre.
+    :param radius_m: Search radius in metres.
+    :param venue_type: Only return venues of this type.
+    :param open_now: Only return venues open at the current local time.
+    :param min_price: Minimum average expense for two.
+    :param max_price: Maximum average expense for two.
+    :param limit: Maximum number of venues to return.
+    :return: (venue, distance in metres) pairs, nearest first.
+    """
+    resolution, k = resolution_for_radius(radius_m)
+    origin = get_h3_index(latitude, longitude, resolution)
+    cells = list(h3.k_ring(origin, k))
+
+    statement = select(Venue).where(getattr(Venue, f"h3_res{resolution}").in_(cells))
+    if venue_type is not None:
+        type_model = VENUE_TYPE_MODELS[venue_type]
+        statement = statement.where(Venue.id.in_(select(type_model.venue_id)))
+    if open_now:
+        statement = statement.where(open_at(venue_local_time()))
+    if min_price is not None:
+        statement = statement.where(Venue.avg_expense_for_two >= min_price)
+    if max_price is not None:
+        statement = statement.where(Venue.avg_expense_for_two <= max_price)
+
+    candidates: Sequence[Venue] = (await db.execute(statement)).scalars().all()
+
+    ranked = sorted(
+        (
+            (venue, haversine_m(latitude, longitude, venue.latitude, venue.longitude))
+            for venue in candidates
+        ),
+        key=lambda pair: pair[1],
+    )
+    nearby = [(venue, distance) for venue, distance in ranked if distance <= radius_m]
+    return nearby[:limit]
+
+
+async def load_managed_venues(
+    db: AsyncSession, user_id: uuid.UUID
+) -> VenueListResponse:
+    """
+    The venues a user manages, grouped by type, in two queries however many
+    venues there are: the venues joined to their subtype rows, and the QSRs
+    of any foodcourts among them.
+    """
+    statement = (
+        select(Venue)
+        .join(UserVenueAssociation)
+        .where(UserVenueAssociation.user_id == user_id)
+        .options(*MANAGED_VENUE_OPTIONS)
+    )
+    venues = (await db.execute(statement)).unique().scalars().all()
+
+    return VenueListResponse(
+        nightclubs=[v.nightclub.to_read_schema() for v in venues if v.nightclub],
+        qsrs=[v.qsr.to_read_schema() for v in venues if v.qsr],
+        foodcourts=[v.foodcourt.to_read_schema() for v in venues if v.foodcourt],
+        restaurants=[v.restaurant.to_read_schema() for v in venues if v.restaurant],
+    )
@@ -0,0 +1,181 @@
+import logging
+import uuid
+from decimal import ROUND_HALF_UP, Decimal
+from typing import NamedTuple
+
+from sqlalchemy import func, insert, update
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.constants import WalletEntryKind
+from app.core.db import get_async_session_maker
+from app.models.group_wallet import GroupWallet
+from app.models.group_wallet_ledger import GroupWalletLedgerEntry
+
+logger = logging.getLogger(__name__)
+
+CENT = Decimal("0.01")
+
+
+class WalletError(Exception):
+    pass
+
+
+class WalletNotFoundError(WalletError):
+    pass
+
+
+class InsufficientFundsError(WalletError):
+    def __init__(self, wallet_id: uuid.UUID, amount: Decimal) -> None:
+        super().__init__(f"Wallet {wallet_id} cannot cover {amount}")
+        self.wallet_id = wallet_id
+        self.amount = amount
+
+
+class WalletDiscrepancy(NamedTuple):
+    wallet_id: uuid.UUID
+    balance: Decimal
+    ledger_total: Decimal
+
+
+def to_amount(amount: Decimal | int | str) -> Decimal:
+    """
+    A positive amount rounded to the cent.
+    """
+    value = Decimal(amount).quantize(CENT, rounding=ROUND_HALF_UP)
+    if value <= 0:
+        raise ValueError("Wallet amounts must be positive.")
+    return value
+
+
+async def _record(
+    db: AsyncSession,
+    wallet_id: uuid.UUID,
+    kind: WalletEntryKind,
+    amount: Decimal,
+    balance_after: Decimal,
+    reference_id: uuid.UUID | None,
+) -> GroupWalletLedgerEntry:
+    entry = GroupWalletLedgerEntry(
+        group_wallet_id=wallet_id,
+        kind=kind.value,
+        amount=amount,
+        balance_after=balance_after,
+        reference_id=reference_id,
+    )
+    await db.execute(insert(GroupWalletLedgerEntry).values(**entry.model_dump()))
+    return entry
+
+
+async def _wallet_exists(db: AsyncSession, wallet_id: uuid.UUID) -> bool:
+    statement = select(GroupWallet.id).where(GroupWallet.id == wallet_id)
+    return (await db.execute(statement)).first() is not None
+
+
+async def top_up(
+    db: AsyncSession,
+    wallet_id: uuid.UUID,
+    amount: Decimal,
+    reference_id: uuid.UUID | None = None,
+) -> GroupWalletLedgerEntry:
+    """
+    Add ``amount`` to the wallet and record it in the ledger, in one
+    transaction.
+    """
+    amount = to_amount(amount)
+    statement = (
+        update(GroupWallet)
+        .where(GroupWallet.id == wallet_id)
+        .values(balance=GroupWallet.balance + amount)
+        .returning(GroupWallet.balance)
+    )
+    balance = (await db.execute(statement)).scalar_one_or_none()
+    if balance is None:
+        await db.rollback()
+        raise WalletNotFoundError(f"Wallet {wallet_id} not found")
+    entry = await _record(
+        db, wallet_id, WalletEntryKind.TOPUP, amount, balance, reference_id
+    )
+    await db.commit()
+    return entry
+
+
+async def debit(
+    db: AsyncSession,
+    wallet_id: uuid.UUID,
+    amount: Decimal,
+    reference_id: uuid.UUID | None = None,
+) -> GroupWalletLedgerEntry:
+    """
+    Take ``amount`` from the wallet and record it in the ledger, in one
+    transaction.
+
+    The balance is checked and decremented by a single conditional UPDATE,
+    never read first, so concurrent debits queue only for that row's lock
+    and can neither overdraw the wallet nor lose one another's updates.
+    Raises InsufficientFundsError, leaving the wallet untouched, if the
+    balance does not cover the amount.
+    """
+    amount = to_amount(amount)
+    statement = (
+        update(GroupWallet)
+        .where(GroupWallet.id == wallet_id, GroupWallet.balance >= amount)
+        .values(balance=GroupWallet.balance - amount)
+        .returning(GroupWallet.balance)
+    )
+    balance = (await db.execute(statement)).scalar_one_or_none()
+    if balance is None:
+        exists = await _wallet_exists(db, wallet_id)
+        await db.rollback()
+        if not exists:
+            raise WalletNotFoundError(f"Wallet {wallet_id} not found")
+        raise InsufficientFundsError(wallet_id, amount)
+    entry = await _record(
+        db, wallet_id, WalletEntryKind.SPEND, -amount, balance, reference_id
+    )
+    await db.commit()
+    return entry
+
+
+async def find_wallet_discrepancies(db: AsyncSession) -> list[WalletDiscrepancy]:
+    """
+    Wallets whose balance differs from the sum of their ledger entries, in
+    one aggregate query.
+    """
+    ledger_totals = (
+        select(
+            GroupWalletLedgerEntry.group_wallet_id,
+            func.sum(GroupWalletLedgerEntry.amount).label("total"),
+        )
+        .group_by(GroupWalletLedgerEntry.group_wallet_id)
+        .subquery()
+    )
+    ledger_total = func.coalesce(ledger_totals.c.total, 0)
+    statement = (
+        select(GroupWallet.id, GroupWallet.balance, ledger_total)
+        .outerjoin(ledger_totals, ledger_totals.c.group_wallet_id == GroupWallet.id)
+        .where(GroupWallet.balance != ledger_total)
+    )
+    rows = await db.execute(statement)
+    return [
+        WalletDiscrepancy(wallet_id, Decimal(balance), Decimal(total))
+        for wallet_id, balance, total in rows
+    ]
+
+
+async def reconcile_wallets() -> list[WalletDiscrepancy]:
+    """
+    Periodic check that every wallet balance equals its ledger total.
+    Discrepancies are logged for investigation, never corrected here.
+    """
+    async with get_async_session_maker()() as db:
+        discrepancies = await find_wallet_discrepancies(db)
+    for discrepancy in discrepancies:
+        logger.error(
+            "Wallet balance does not match ledger wallet_id=%s balance=%s ledger_total=%s",
+            discrepancy.wallet_id,
+            discrepancy.balance,
+            discrepancy.ledger_total,
+        )
+    logger.info("Reconciled wallets discrepancies=%d", len(discrepancies))
+    return discrepancies
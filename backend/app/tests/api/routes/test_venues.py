@@ -0,0 +1,76 @@
+import uuid
+from collections.abc import Generator
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.models.venue import QSR, Foodcourt, Nightclub, Restaurant
+from app.tests.utils.db import count_statements
+from app.tests.utils.user import (
+    business_token_headers,
+    create_business_user,
+    delete_business_user,
+    manage_venues,
+)
+from app.tests.utils.venue import create_venue, delete_venues
+
+
+def create_typed_venues(
+    session: Session, count: int
+) -> tuple[list[uuid.UUID], list[uuid.UUID]]:
+    """
+    ``count`` venues cycling through foodcourt, nightclub, QSR and restaurant,
+    each foodcourt with two QSRs of its own. Returns the IDs of the venues
+    and of the foodcourts' QSR venues.
+    """
+    venue_ids, foodcourt_qsr_ids = [], []
+    for i in range(count):
+        venue = create_venue(session)
+        venue_ids.append(venue.id)
+        if i % 4 == 0:
+            foodcourt = Foodcourt(venue_id=venue.id)
+            session.add(foodcourt)
+            session.flush()
+            for _ in range(2):
+                qsr_venue = create_venue(session)
+                foodcourt_qsr_ids.append(qsr_venue.id)
+                session.add(QSR(venue_id=qsr_venue.id, foodcourt_id=foodcourt.id))
+        else:
+            session.add([Nightclub, QSR, Restaurant][i % 4 - 1](venue_id=venue.id))
+        session.commit()
+    return venue_ids, foodcourt_qsr_ids
+
+
+@pytest.fixture
+def managers(db: Session) -> Generator[list[tuple[uuid.UUID, int]], None, None]:
+    """A business user managing one venue and another managing 50."""
+    users, created = [], []
+    for count in (1, 50):
+        user = create_business_user(db)
+        venue_ids, foodcourt_qsr_ids = create_typed_venues(db, count)
+        manage_venues(db, user.id, venue_ids)
+        users.append((user.id, count))
+        created.extend(venue_ids + foodcourt_qsr_ids)
+    yield users
+    for user_id, _ in users:
+        delete_business_user(db, user_id)
+    delete_venues(db, created)
+
+
+def test_my_venues_served_in_constant_statements(
+    client: TestClient, managers: list[tuple[uuid.UUID, int]]
+) -> None:
+    counts = []
+    for user_id, venue_count in managers:
+        headers = business_token_headers(user_id)
+        # Caches the principal, which the first request loads
+        client.get(f"{settings.API_V1_STR}/venue/my-venues/", headers=headers)
+        with count_statements() as statements:
+            r = client.get(f"{settings.API_V1_STR}/venue/my-venues/", headers=headers)
+        assert r.status_code == 200
+        assert sum(len(venues) for venues in r.json().values()) == venue_count
+        counts.append(len(statements))
+
+    assert counts[0] == counts[1]
@@ -0,0 +1,39 @@
+from collections.abc import AsyncGenerator, Generator
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.core.db import get_async_engine, get_async_session_maker, get_engine
+from app.main import app
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+@pytest.fixture
+def db() -> Generator[Session, None, None]:
+    with Session(get_engine()) as session:
+        yield session
+
+
+@pytest.fixture
+async def async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with get_async_session_maker()() as session:
+        yield session
+    # Pooled connections belong to this test's event loop
+    await get_async_engine().dispose()
+
+
+@pytest.fixture(scope="module")
+def client() -> Generator[TestClient, None, None]:
+    # Periodic jobs would add their own statements to the ones tests count
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(settings, "BACKGROUND_JOBS_ENABLED", False)
+        with TestClient(app) as c:
+            yield c
+            c.portal.call(get_async_engine().dispose)
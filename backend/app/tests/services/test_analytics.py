@@ -0,0 +1,63 @@
+from collections.abc import Generator
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import delete
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.constants import RollupGranularity
+from app.models.order import RestaurantOrder
+from app.models.sales_rollup import MenuItemSalesRollup, VenueSalesRollup
+from app.models.user import UserPublic
+from app.models.venue import Restaurant
+from app.services.analytics import rollup_orders
+from app.tests.utils.utils import random_lower_string
+from app.tests.utils.venue import create_venue, delete_venues
+
+pytestmark = pytest.mark.anyio
+
+# Well before any real order, so the rollups only see the order made here
+ORDER_TIME = datetime(2001, 1, 1, 12, 30)
+
+
+@pytest.fixture
+def restaurant_order(db: Session) -> Generator[RestaurantOrder, None, None]:
+    venue = create_venue(db)
+    restaurant = Restaurant(venue_id=venue.id)
+    user = UserPublic(phone_number=random_lower_string())
+    db.add_all([restaurant, user])
+    db.flush()
+    order = RestaurantOrder(
+        user_id=user.id,
+        venue_id=restaurant.id,
+        order_time=ORDER_TIME,
+        total_amount=120,
+        status="placed",
+    )
+    db.add(order)
+    db.commit()
+    yield order
+    for model in (VenueSalesRollup, MenuItemSalesRollup):
+        db.execute(delete(model).where(model.venue_id == venue.id))
+    db.execute(delete(RestaurantOrder).where(RestaurantOrder.id == order.id))
+    db.execute(delete(UserPublic).where(UserPublic.id == user.id))
+    db.commit()
+    delete_venues(db, [venue.id])
+
+
+async def test_order_at_the_watermark_is_rolled_up_once(
+    async_db: AsyncSession, restaurant_order: RestaurantOrder
+) -> None:
+    # The first run ends exactly at the order and the next starts from there
+    await rollup_orders(async_db, ORDER_TIME - timedelta(hours=1), ORDER_TIME)
+    await rollup_orders(async_db, ORDER_TIME, ORDER_TIME + timedelta(hours=1))
+    await async_db.commit()
+
+    rows = await async_db.exec(
+        select(VenueSalesRollup)
+        .join(Restaurant, Restaurant.venue_id == VenueSalesRollup.venue_id)
+        .where(Restaurant.id == restaurant_order.venue_id)
+    )
+    counts = {row.granularity: row.order_count for row in rows}
+    assert counts == {granularity.value: 1 for granularity in RollupGranularity}
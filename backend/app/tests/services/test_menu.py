@@ -0,0 +1,63 @@
+from collections.abc import Generator
+
+import pytest
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models.venue import Venue
+from app.services.menu import load_menu, load_venue_menus
+from app.tests.utils.db import count_statements
+from app.tests.utils.venue import create_menu_tree, create_venue, delete_venues
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def small_and_large_venues(db: Session) -> Generator[tuple[Venue, Venue], None, None]:
+    small, large = create_venue(db), create_venue(db)
+    create_menu_tree(db, small.id, 1)
+    create_menu_tree(db, large.id, 4)
+    yield small, large
+    delete_venues(db, [small.id, large.id])
+
+
+async def test_venue_menu_tree_loads_in_constant_statements(
+    async_db: AsyncSession, small_and_large_venues: tuple[Venue, Venue]
+) -> None:
+    counts, items = [], []
+    for venue in small_and_large_venues:
+        with count_statements() as statements:
+            menus = [
+                menu.to_read_schema()
+                for menu in await load_venue_menus(async_db, venue.id)
+            ]
+        counts.append(len(statements))
+        items.append(
+            sum(
+                len(subcategory.menu_items or [])
+                for menu in menus
+                for category in menu.categories
+                for subcategory in category.sub_categories
+            )
+        )
+        async_db.expunge_all()
+
+    assert items == [1, 4**4]
+    assert counts[0] == counts[1]
+
+
+async def test_menu_tree_loads_in_constant_statements(
+    async_db: AsyncSession, small_and_large_venues: tuple[Venue, Venue]
+) -> None:
+    counts = []
+    for venue in small_and_large_venues:
+        (menu, *_) = await load_venue_menus(async_db, venue.id)
+        async_db.expunge_all()
+        with count_statements() as statements:
+            loaded = await load_menu(async_db, menu.id)
+            assert loaded is not None
+            loaded.to_read_schema()
+        counts.append(len(statements))
+        async_db.expunge_all()
+
+    assert counts[0] == counts[1]
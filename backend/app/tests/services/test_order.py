@@ -0,0 +1,63 @@
+from collections.abc import Generator
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import delete
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.constants import OrderStatus, VenueType
+from app.models.base_model import utcnow
+from app.models.order import RestaurantOrder
+from app.models.user import UserPublic
+from app.models.venue import Restaurant
+from app.services.order import update_order_status
+from app.tests.utils.utils import random_lower_string
+from app.tests.utils.venue import create_venue, delete_venues
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def restaurant_order(db: Session) -> Generator[RestaurantOrder, None, None]:
+    venue = create_venue(db)
+    restaurant = Restaurant(venue_id=venue.id)
+    user = UserPublic(phone_number=random_lower_string())
+    db.add_all([restaurant, user])
+    db.flush()
+    order = RestaurantOrder(
+        user_id=user.id,
+        venue_id=restaurant.id,
+        order_time=utcnow(),
+        total_amount=120,
+        status=OrderStatus.PLACED.value,
+    )
+    db.add(order)
+    db.commit()
+    yield order
+    db.execute(delete(RestaurantOrder).where(RestaurantOrder.id == order.id))
+    db.execute(delete(UserPublic).where(UserPublic.id == user.id))
+    db.commit()
+    delete_venues(db, [venue.id])
+
+
+async def test_completed_order_cannot_be_placed_again(
+    db: Session, async_db: AsyncSession, restaurant_order: RestaurantOrder
+) -> None:
+    order_id, venue_id = restaurant_order.id, restaurant_order.venue_id
+    await update_order_status(
+        async_db, VenueType.RESTAURANT, order_id, venue_id, OrderStatus.COMPLETED
+    )
+    # Repeating the current status is not an error
+    await update_order_status(
+        async_db, VenueType.RESTAURANT, order_id, venue_id, OrderStatus.COMPLETED
+    )
+    for status in (OrderStatus.PLACED, OrderStatus.CANCELLED):
+        with pytest.raises(HTTPException) as exc_info:
+            await update_order_status(
+                async_db, VenueType.RESTAURANT, order_id, venue_id, status
+            )
+        assert exc_info.value.status_code == 409
+
+    db.refresh(restaurant_order)
+    assert restaurant_order.status == OrderStatus.COMPLETED.value
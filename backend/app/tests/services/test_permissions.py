@@ -0,0 +1,46 @@
+from collections.abc import Generator
+
+import pytest
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models.user import UserBusiness
+from app.models.venue import Venue
+from app.services.permissions import get_venue_permission_cache, manages_venue
+from app.tests.utils.user import (
+    create_business_user,
+    delete_business_user,
+    manage_venues,
+)
+from app.tests.utils.venue import create_venue, delete_venues
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def manager(db: Session) -> Generator[tuple[UserBusiness, Venue], None, None]:
+    user, venue = create_business_user(db), create_venue(db)
+    yield user, venue
+    get_venue_permission_cache().invalidate(user.id)
+    delete_business_user(db, user.id)
+    delete_venues(db, [venue.id])
+
+
+async def test_venue_missing_from_cache_is_read_again(
+    db: Session, async_db: AsyncSession, manager: tuple[UserBusiness, Venue]
+) -> None:
+    user, venue = manager
+    # Cached before the association was made, as on a worker that never saw
+    # the invalidation
+    get_venue_permission_cache().store(user.id, frozenset())
+    manage_venues(db, user.id, [venue.id])
+
+    assert await manages_venue(async_db, user, venue.id)
+    assert get_venue_permission_cache().get(user.id) == {venue.id}
+
+
+async def test_venue_not_managed_is_refused(
+    async_db: AsyncSession, manager: tuple[UserBusiness, Venue]
+) -> None:
+    user, venue = manager
+    assert not await manages_venue(async_db, user, venue.id)
@@ -0,0 +1,34 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from sqlalchemy import event
+
+from app.core.db import get_async_engine, get_engine
+
+
+@contextmanager
+def count_statements() -> Iterator[list[str]]:
+    """
+    Collect the SQL statements either engine sends while the block runs.
+    """
+    statements: list[str] = []
+
+    def record(
+        conn: Any,  # noqa: ARG001
+        cursor: Any,  # noqa: ARG001
+        statement: str,
+        parameters: Any,  # noqa: ARG001
+        context: Any,  # noqa: ARG001
+        executemany: bool,  # noqa: ARG001
+    ) -> None:
+        statements.append(statement)
+
+    engines = [get_engine(), get_async_engine().sync_engine]
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        for engine in engines:
+            event.remove(engine, "before_cursor_execute", record)
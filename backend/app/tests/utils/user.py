@@ -0,0 +1,39 @@
+import uuid
+
+from sqlalchemy import delete
+from sqlmodel import Session
+
+from app.constants import PrincipalKind
+from app.core.security import create_access_token
+from app.models.user import UserBusiness, UserVenueAssociation
+from app.tests.utils.utils import random_email, random_lower_string
+
+
+def create_business_user(session: Session) -> UserBusiness:
+    user = UserBusiness(email=random_email(), full_name=random_lower_string())
+    session.add(user)
+    session.commit()
+    return user
+
+
+def manage_venues(
+    session: Session, user_id: uuid.UUID, venue_ids: list[uuid.UUID]
+) -> None:
+    session.add_all(
+        UserVenueAssociation(user_id=user_id, venue_id=venue_id)
+        for venue_id in venue_ids
+    )
+    session.commit()
+
+
+def delete_business_user(session: Session, user_id: uuid.UUID) -> None:
+    session.execute(
+        delete(UserVenueAssociation).where(UserVenueAssociation.user_id == user_id)
+    )
+    session.execute(delete(UserBusiness).where(UserBusiness.id == user_id))
+    session.commit()
+
+
+def business_token_headers(user_id: uuid.UUID) -> dict[str, str]:
+    token = create_access_token(str(user_id), PrincipalKind.BUSINESS).token
+    return {"Authorization": f"Bearer {token}"}
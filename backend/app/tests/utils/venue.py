@@ -0,0 +1,69 @@
+import uuid
+from collections.abc import Sequence
+
+from sqlalchemy import delete, select
+from sqlmodel import Session
+
+from app.models.menu import Menu, MenuCategory, MenuItem, MenuSubCategory
+from app.models.user import UserVenueAssociation
+from app.models.venue import QSR, Foodcourt, Nightclub, Restaurant, Venue
+from app.tests.utils.utils import random_lower_string
+
+
+def create_venue(session: Session) -> Venue:
+    venue = Venue(name=random_lower_string(), latitude=0, longitude=0)
+    session.add(venue)
+    session.commit()
+    return venue
+
+
+def create_menu_tree(session: Session, venue_id: uuid.UUID, size: int) -> None:
+    """
+    ``size`` menus for the venue, each with ``size`` categories of ``size``
+    subcategories of ``size`` items.
+    """
+    for m in range(size):
+        menu = Menu(venue_id=venue_id, name=f"Menu {m}")
+        session.add(menu)
+        session.flush()
+        for c in range(size):
+            category = MenuCategory(menu_id=menu.id, name=f"Category {c}")
+            session.add(category)
+            session.flush()
+            for s in range(size):
+                subcategory = MenuSubCategory(
+                    category_id=category.id, name=f"Subcategory {s}"
+                )
+                session.add(subcategory)
+                session.flush()
+                session.add_all(
+                    MenuItem(
+                        subcategory_id=subcategory.id, name=f"Item {i}", price=100 + i
+                    )
+                    for i in range(size)
+                )
+    session.commit()
+
+
+def delete_venues(session: Session, venue_ids: Sequence[uuid.UUID]) -> None:
+    """
+    Delete the venues with their menu trees, subtype rows and managers.
+    """
+    menus = select(Menu.id).where(Menu.venue_id.in_(venue_ids))
+    categories = select(MenuCategory.id).where(MenuCategory.menu_id.in_(menus))
+    subcategories = select(MenuSubCategory.id).where(
+        MenuSubCategory.category_id.in_(categories)
+    )
+    session.execute(delete(MenuItem).where(MenuItem.subcategory_id.in_(subcategories)))
+    session.execute(
+        delete(MenuSubCategory).where(MenuSubCategory.category_id.in_(categories))
+    )
+    session.execute(delete(MenuCategory).where(MenuCategory.menu_id.in_(menus)))
+    session.execute(delete(Menu).where(Menu.venue_id.in_(venue_ids)))
+    session.execute(
+        delete(UserVenueAssociation).where(UserVenueAssociation.venue_id.in_(venue_ids))
+    )
+    for model in (QSR, Foodcourt, Nightclub, Restaurant):
+        session.execute(delete(model).where(model.venue_id.in_(venue_ids)))
+    session.execute(delete(Venue).where(Venue.id.in_(venue_ids)))
+    session.commit()
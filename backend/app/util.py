@@ -1,39 +1,90 @@
+import base64
+import json
 import logging
 import uuid
+from collections.abc import Sequence
+from datetime import datetime
 from typing import TypeVar
 
-from fastapi import HTTPException
+from fastapi import HTTPException, Request, Response
 from pydantic import BaseModel
+from sqlalchemy import tuple_
+from sqlalchemy.orm.interfaces import ORMOption
 from sqlmodel import Session, SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.core.cache import CachedPayload
 from app.models.user import UserBusiness, UserVenueAssociation
+from app.services.permissions import manages_venue
 
 # Generic CRUD function to get all records with pagination
 T = TypeVar("T", bound=SQLModel)
 
 
+def encode_cursor(record: SQLModel) -> str:
+    """
+    Opaque cursor pointing just after ``record`` in (created_at, id) order.
+    """
+    created_at, record_id = record.created_at, record.id  # type: ignore[attr-defined]
+    return encode_position(created_at, record_id)
+
+
+def encode_position(at: datetime, record_id: uuid.UUID) -> str:
+    """
+    Opaque cursor for a (timestamp, id) keyset position.
+    """
+    position = json.dumps([at.isoformat(), str(record_id)])
+    return base64.urlsafe_b64encode(position.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    """
+    Parse a cursor made by ``encode_cursor`` or ``encode_position``; a
+    malformed one is a 400.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, record_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), uuid.UUID(record_id)
+    except (ValueError, TypeError) as e:
+        raise HTTPException(status_code=400, detail="Invalid cursor.") from e
+
+
+def keyset_page_statement(model: type[T], cursor: str | None, limit: int):
+    """
+    Select the page of ``model`` after ``cursor`` in (created_at, id) order,
+    with one extra row to tell whether another page follows. The row-value
+    comparison walks the table's (created_at, id) index, so every page costs
+    the same however deep it is.
+    """
+    position = tuple_(model.created_at, model.id)  # type: ignore[attr-defined]
+    statement = select(model).order_by(*position.clauses).limit(limit + 1)
+    if cursor is not None:
+        statement = statement.where(position > tuple_(*decode_cursor(cursor)))
+    return statement
+
+
+def split_page(records: Sequence[T], limit: int) -> tuple[Sequence[T], str | None]:
+    if len(records) <= limit:
+        return records, None
+    records = records[:limit]
+    return records, encode_cursor(records[-1])
+
+
 def get_all_records(
-    session: Session, model: type[T], skip: int = 0, limit: int = 10
-) -> list[SQLModel]:
+    session: Session, model: type[T], cursor: str | None = None, limit: int = 10
+) -> tuple[Sequence[T], str | None]:
     """
-    Retrieve a paginated list of records as schemas.
+    Retrieve a page of records, oldest first.
     - **session**: Database session
     - **model**: SQLModel class (e.g., Nightclub, Restaurant, QSR, Foodcourt)
-    - **skip**: Number of records to skip
+    - **cursor**: ``next_cursor`` of the previous page, or None for the first page
     - **limit**: Number of records to return
-    """
 
-    try:
-        # Fetch raw model instances
-        statement = select(model).offset(skip).limit(limit)
-        result = session.execute(statement).scalars().all()
-
-        # Convert each record to its read schema
-        return result
-    except ValueError as ve:
-        # Handle errors (optional, add specific error handling as needed)
-        print(f"Error fetching records: {ve}")
-        return []
+    Returns the records and the cursor of the next page, if any.
+    """
+    statement = keyset_page_statement(model, cursor, limit)
+    return split_page(session.execute(statement).scalars().all(), limit)
 
 
 def get_record_by_id(db: Session, model: type[T], record_id: uuid.UUID) -> T | None:
@@ -169,3 +220,183 @@ def check_user_permission(db: Session, current_user: UserBusiness, venue_id: uui
         )
 
     return user_venue_association
+
+
+# Async counterparts of the CRUD helpers above, for handlers running on an
+# AsyncSession. Relationships are never lazy-loaded under asyncio, so callers
+# that read related objects pass the loader options they need.
+
+
+async def get_all_records_async(
+    session: AsyncSession,
+    model: type[T],
+    cursor: str | None = None,
+    limit: int = 10,
+    options: Sequence[ORMOption] = (),
+) -> tuple[Sequence[T], str | None]:
+    """
+    Retrieve a page of records, oldest first.
+    - **session**: Async database session
+    - **model**: SQLModel class (e.g., Nightclub, Restaurant, QSR, Foodcourt)
+    - **cursor**: ``next_cursor`` of the previous page, or None for the first page
+    - **limit**: Number of records to return
+    - **options**: Loader options for the relationships the caller reads
+
+    Returns the records and the cursor of the next page, if any.
+    """
+    statement = keyset_page_statement(model, cursor, limit).options(*options)
+    result = await session.execute(statement)
+    return split_page(result.scalars().all(), limit)
+
+
+async def get_record_by_id_async(
+    db: AsyncSession,
+    model: type[T],
+    record_id: uuid.UUID,
+    options: Sequence[ORMOption] = (),
+) -> T:
+    """
+    Retrieve a record by its ID.
+
+    Args:
+        db (AsyncSession): The async database session.
+        model (Type[T]): The SQLModel class representing the table.
+        record_id (uuid.UUID): The ID of the record to retrieve.
+        options (Sequence[ORMOption]): Loader options for the relationships the
+            caller reads. With options the row is always re-read, so they also
+            apply to an instance already in the session.
+
+    Returns:
+        T: The retrieved record.
+
+    Raises:
+        HTTPException: If the record is not found, raises a 404 error.
+    """
+    record = await db.get(
+        model, record_id, options=options, populate_existing=bool(options)
+    )
+    if not record:
+        raise HTTPException(
+            status_code=404, detail=f"{model.__name__} with ID {record_id} not found."
+        )
+    return record
+
+
+async def create_record_async(db: AsyncSession, instance: T) -> T:
+    """
+    Create a new record in the database.
+
+    :param db: The active async database session.
+    :param instance: An instance of the model to be persisted.
+    :return: The created instance with updated attributes.
+    """
+    db.add(instance)
+    await db.commit()
+    await db.refresh(instance)
+    return instance
+
+
+async def update_record_async(
+    db: AsyncSession, instance: T, update_data: BaseModel
+) -> T:
+    """
+    Update an existing record, applying only the fields set on a Pydantic model.
+
+    :param db: Active async database session.
+    :param instance: Existing model instance to be updated.
+    :param update_data: Pydantic model containing the fields to update.
+    :return: The updated model instance with changes committed.
+    """
+    try:
+        update_dict = update_data.model_dump(exclude_unset=True)
+
+        for key, value in update_dict.items():
+            if hasattr(instance, key):
+                setattr(instance, key, value)
+            else:
+                raise ValueError(f"Field '{key}' does not exist on the model.")
+
+        db.add(instance)
+        await db.commit()
+        await db.refresh(instance)
+
+        return instance
+
+    except ValueError as ve:
+        logging.error("Validation error: %s", ve)
+        await db.rollback()
+        raise HTTPException(status_code=400, detail=str(ve))
+
+    except Exception as e:
+        logging.error("Unexpected error during record update: %s", e)
+        await db.rollback()
+        raise HTTPException(
+            status_code=500,
+            detail="An internal error occurred while updating the record.",
+        ) from e
+
+
+async def delete_record_async(db: AsyncSession, instance: SQLModel) -> None:
+    """
+    Delete a record from the database.
+
+    :param db: The active async database session.
+    :param instance: The instance of the model to be deleted.
+    :return: None
+    """
+    await db.delete(instance)
+    await db.commit()
+
+
+async def check_user_permission_async(
+    db: AsyncSession, current_user: UserBusiness, venue_id: uuid.UUID
+) -> None:
+    """
+    Check if the user has permission to manage the specified venue.
+
+    The user's managed venues are read once and cached briefly, so repeated
+    checks by the same user need no query. A venue missing from the cache
+    is looked up again before permission is refused.
+
+    Args:
+        db: Async database session.
+        current_user: The current user object.
+        venue_id: The ID of the venue to check permissions for.
+
+    Raises:
+        HTTPException: If the user does not have permission.
+    """
+    if not await manages_venue(db, current_user, venue_id):
+        raise HTTPException(
+            status_code=403,
+            detail="User does not have permission to manage this venue.",
+        )
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Check the request's If-None-Match header against an ETag.
+
+    Uses the weak comparison RFC 9110 prescribes for If-None-Match, so a
+    ``W/`` prefix on the client's tag is ignored.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag in candidates
+
+
+def cached_json_response(request: Request, cached: CachedPayload) -> Response:
+    """
+    Build the response for a cached JSON payload: 304 Not Modified without a
+    body when the client already holds this version, otherwise the payload.
+    """
+    headers = {"ETag": cached.etag, "Cache-Control": "no-cache"}
+    if etag_matches(request, cached.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(
+        content=cached.payload, media_type="application/json", headers=headers
+    )
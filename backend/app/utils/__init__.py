@@ -1 +1,15 @@
-from .h3_utils import get_h3_index, is_within_radius
\ No newline at end of file
+from .h3_utils import (
+    get_h3_index,
+    haversine_m,
+    is_within_radius,
+    k_ring_size,
+    resolution_for_radius,
+)
+
+__all__ = [
+    "get_h3_index",
+    "haversine_m",
+    "is_within_radius",
+    "k_ring_size",
+    "resolution_for_radius",
+]
@@ -1,8 +1,69 @@
+import math
+
 import h3
 
+# Resolutions persisted on every venue. Nearby search picks the finest one
+# whose k-ring for the requested radius stays small.
+VENUE_H3_RESOLUTIONS = (5, 7, 9)
+
+# Largest k-ring searched; k=8 is 217 cells.
+MAX_K_RING = 8
+
+# H3 cells at one resolution differ in size across the globe; shrinking the
+# mean edge length by this factor keeps the k-ring estimate conservative.
+H3_EDGE_DISTORTION = 1.2
+
+EARTH_RADIUS_M = 6_371_008.8
+
 
 def get_h3_index(latitude: float, longitude: float, resolution: int = 9) -> str:
     return h3.geo_to_h3(latitude, longitude, resolution)
 
 def is_within_radius(user_h3_index: str, poster_h3_index: str, radius: int) -> bool:
     return h3.h3_distance(user_h3_index, poster_h3_index) <= radius
+
+
+def k_ring_size(radius_m: float, resolution: int) -> int:
+    """
+    Smallest k whose k-ring around a point's cell contains every cell holding
+    a point within ``radius_m`` of it.
+
+    Successive rings are at least 1.5 edge lengths apart, and two more edges
+    cover the offset of both points from their cell centres.
+    """
+    edge = h3.edge_length(resolution, unit="m") / H3_EDGE_DISTORTION
+    return math.ceil((radius_m + 2 * edge) / (1.5 * edge))
+
+
+def resolution_for_radius(
+    radius_m: float,
+    resolutions: tuple[int, ...] = VENUE_H3_RESOLUTIONS,
+    max_k: int = MAX_K_RING,
+) -> tuple[int, int]:
+    """
+    Pick the finest of ``resolutions`` whose k-ring for ``radius_m`` is at
+    most ``max_k``, falling back to the coarsest one.
+
+    Returns:
+        tuple[int, int]: The resolution and the k-ring size to search.
+    """
+    for resolution in sorted(resolutions, reverse=True):
+        k = k_ring_size(radius_m, resolution)
+        if k <= max_k:
+            return resolution, k
+    coarsest = min(resolutions)
+    return coarsest, k_ring_size(radius_m, coarsest)
+
+
+def haversine_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """
+    Great-circle distance in metres between two points given in degrees.
+    """
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = (
+        math.sin(d_phi / 2) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(a))
@@ -0,0 +1,187 @@
+"""
+Simulate a rush of buyers on one event offering and check for oversells.
+
+Thousands of concurrent buyers each try to hold one pass of an offering
+with a limited number of passes. Exactly that many holds must succeed,
+availability must end at zero, and once the holds lapse the sweeper must
+return every pass. The venue, event, offering and user are created for the
+run and deleted afterwards.
+
+Needs the database from the environment's settings. Usage, from the
+backend directory:
+
+    python scripts/benchmark_event_holds.py --buyers 5000 --passes 100
+
+Exits with status 1 if any check fails.
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi import HTTPException  # noqa: E402
+from sqlalchemy import delete, func, select, update  # noqa: E402
+
+from app.constants import BookingStatus  # noqa: E402
+from app.core.db import get_async_session_maker  # noqa: E402
+from app.models.base_model import utcnow  # noqa: E402
+from app.models.event import Event  # noqa: E402
+from app.models.event_booking import EventBooking  # noqa: E402
+from app.models.event_offering import EventOffering  # noqa: E402
+from app.models.user import UserPublic  # noqa: E402
+from app.models.venue import Venue  # noqa: E402
+from app.services.event_booking import hold_passes, sweep_expired_holds  # noqa: E402
+
+
+async def create_offering(passes: int) -> dict[str, uuid.UUID]:
+    async with get_async_session_maker()() as db:
+        user = UserPublic(phone_number=f"bench-{uuid.uuid4().hex[:12]}")
+        venue = Venue(name="Benchmark venue", latitude=0, longitude=0)
+        db.add_all([user, venue])
+        await db.flush()
+        start = datetime.now() + timedelta(days=1)
+        event = Event(
+            venue_id=venue.id,
+            title="Benchmark event",
+            start_time=start,
+            end_time=start + timedelta(hours=4),
+        )
+        db.add(event)
+        await db.flush()
+        offering = EventOffering(
+            event_id=event.id,
+            offering_type="stag",
+            description="Benchmark pass",
+            price=999,
+            total_guests_per_pass=1,
+            availability=passes,
+        )
+        db.add(offering)
+        await db.commit()
+        return {
+            "user": user.id,
+            "venue": venue.id,
+            "event": event.id,
+            "offering": offering.id,
+        }
+
+
+async def delete_offering(ids: dict[str, uuid.UUID]) -> None:
+    async with get_async_session_maker()() as db:
+        await db.execute(
+            delete(EventBooking).where(EventBooking.offering_id == ids["offering"])
+        )
+        await db.execute(
+            delete(EventOffering).where(EventOffering.id == ids["offering"])
+        )
+        await db.execute(delete(Event).where(Event.id == ids["event"]))
+        await db.execute(delete(Venue).where(Venue.id == ids["venue"]))
+        await db.execute(delete(UserPublic).where(UserPublic.id == ids["user"]))
+        await db.commit()
+
+
+async def offering_state(offering_id: uuid.UUID) -> tuple[int, int]:
+    """
+    The offering's availability and its number of held passes.
+    """
+    async with get_async_session_maker()() as db:
+        availability = (
+            await db.execute(
+                select(EventOffering.availability).where(
+                    EventOffering.id == offering_id
+                )
+            )
+        ).scalar_one()
+        held = (
+            await db.execute(
+                select(func.coalesce(func.sum(EventBooking.quantity), 0)).where(
+                    EventBooking.offering_id == offering_id,
+                    EventBooking.status == BookingStatus.HELD.value,
+                )
+            )
+        ).scalar_one()
+        return availability, held
+
+
+async def run(buyers: int, passes: int, concurrency: int) -> int:
+    ids = await create_offering(passes)
+    try:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def buy() -> bool:
+            async with semaphore, get_async_session_maker()() as db:
+                try:
+                    await hold_passes(db, ids["user"], ids["offering"], 1)
+                except HTTPException as exc:
+                    if exc.status_code != 409:
+                        raise
+                    return False
+                return True
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*(buy() for _ in range(buyers)))
+        elapsed = time.perf_counter() - start
+        sold = sum(results)
+        availability, held = await offering_state(ids["offering"])
+        print(
+            f"buyers={buyers} passes={passes} concurrency={concurrency} "
+            f"held={sold} turned_away={buyers - sold} elapsed={elapsed:.2f}s "
+            f"rate={buyers / elapsed:.0f}/s availability={availability}"
+        )
+
+        failures = []
+        if sold > passes or held > passes:
+            failures.append(f"oversold: {sold} holds for {passes} passes")
+        if sold != passes or held != passes or availability != 0:
+            failures.append(
+                f"expected {passes} held passes and none left, got held={held} "
+                f"availability={availability}"
+            )
+
+        # Let every hold lapse, then sweep
+        async with get_async_session_maker()() as db:
+            await db.execute(
+                update(EventBooking)
+                .where(EventBooking.offering_id == ids["offering"])
+                .values(hold_expires_at=utcnow() - timedelta(seconds=1))
+            )
+            await db.commit()
+        start = time.perf_counter()
+        expired = await sweep_expired_holds()
+        sweep_elapsed = time.perf_counter() - start
+        availability, held = await offering_state(ids["offering"])
+        print(
+            f"swept={expired} elapsed={sweep_elapsed:.3f}s availability={availability}"
+        )
+        if availability != passes or held != 0:
+            failures.append(
+                f"sweep left availability={availability} held={held}, "
+                f"expected {passes} and 0"
+            )
+
+        for failure in failures:
+            print(failure, file=sys.stderr)
+        return 1 if failures else 0
+    finally:
+        await delete_offering(ids)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--buyers", type=int, default=5000, help="concurrent buyers")
+    parser.add_argument("--passes", type=int, default=100, help="passes on sale")
+    parser.add_argument(
+        "--concurrency", type=int, default=100, help="buyers in flight at once"
+    )
+    args = parser.parse_args()
+    return asyncio.run(run(args.buyers, args.passes, args.concurrency))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,277 @@
+"""
+Measure menu search latency on a venue with tens of thousands of items.
+
+Creates one synthetic venue with --items items (beers, cocktails and dishes
+with ingredients, prices, ABV and IBU) spread over two menus, then runs
+--queries searches the way the API does, one session per search: single
+words, phrases, ingredients, misspelt names, text with price and ABV ranges,
+and ranges alone. Prints p50/p95/p99 latency per kind of search and overall,
+and checks that misspelt names still find their items and that results stay
+within the ranges asked for. Everything created is deleted afterwards.
+
+Needs the menu search migration applied. Usage, from the backend directory:
+
+    python scripts/benchmark_menu_search.py --items 50000 --target-ms 20
+
+Exits with status 1 if the overall p95 exceeds the target or a check fails.
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+import uuid
+from collections import defaultdict
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import delete, insert, select, text  # noqa: E402
+
+from app.core.db import get_async_session_maker  # noqa: E402
+from app.models.menu import Menu, MenuCategory, MenuItem, MenuSubCategory  # noqa: E402
+from app.models.venue import Venue  # noqa: E402
+from app.services.menu import search_venue_menu  # noqa: E402
+
+BATCH = 5_000
+
+DRINKS = [
+    "Hefeweizen",
+    "Pilsner",
+    "Hazy IPA",
+    "West Coast IPA",
+    "Oatmeal Stout",
+    "Porter",
+    "Saison",
+    "Lager",
+    "Gose",
+    "Amber Ale",
+    "Doppelbock",
+    "Tripel",
+    "Old Fashioned",
+    "Negroni",
+    "Margarita",
+    "Mojito",
+]
+DISHES = [
+    "Margherita Pizza",
+    "Paneer Tikka",
+    "Chicken Wings",
+    "Caesar Salad",
+    "Mushroom Risotto",
+    "Fish Tacos",
+    "Butter Chicken",
+    "Falafel Wrap",
+    "Loaded Nachos",
+    "Tiramisu",
+    "Pad Thai",
+    "Lamb Biryani",
+]
+ADJECTIVES = ["House", "Classic", "Smoked", "Spicy", "Double", "Wild", "Golden"]
+INGREDIENTS = [
+    "mango",
+    "basil",
+    "citra hops",
+    "mosaic hops",
+    "wheat",
+    "barley",
+    "lime",
+    "mint",
+    "tequila",
+    "bourbon",
+    "mozzarella",
+    "cottage cheese",
+    "chicken",
+    "saffron",
+    "coriander",
+    "chilli",
+    "coffee",
+    "vanilla",
+]
+
+WORDS = ["stout", "pizza", "negroni", "biryani", "wings", "saison", "tacos"]
+PHRASES = ["hazy ipa", "butter chicken", '"old fashioned"', "risotto -mushroom"]
+TYPOS = {
+    "hefeweisen": "Hefeweizen",
+    "margaritta": "Margarita",
+    "tiramisoo": "Tiramisu",
+    "doppelbok": "Doppelbock",
+    "paner tika": "Paneer Tikka",
+}
+
+
+def synthetic_item(subcategory_id: uuid.UUID, i: int, drink: bool) -> dict[str, Any]:
+    base = random.choice(DRINKS if drink else DISHES)
+    ingredients = ", ".join(random.sample(INGREDIENTS, 3))
+    return {
+        "id": uuid.uuid4(),
+        "subcategory_id": subcategory_id,
+        "name": f"{random.choice(ADJECTIVES)} {base} {i}",
+        "price": float(random.randrange(90, 1500, 10)),
+        "description": f"Our {base.lower()} made with {ingredients}.",
+        "ingredients": ingredients,
+        "is_veg": None if drink else random.random() < 0.5,
+        "abv": round(random.uniform(3.5, 12), 1) if drink else None,
+        "ibu": random.randint(5, 90) if drink else None,
+    }
+
+
+async def create_venue(items: int) -> dict[str, Any]:
+    async with get_async_session_maker()() as db:
+        venue = Venue(name="Benchmark menu search", latitude=0, longitude=0)
+        db.add(venue)
+        await db.flush()
+        subcategories = []
+        for menu_name in ("Drinks", "Food"):
+            menu = Menu(venue_id=venue.id, name=menu_name)
+            db.add(menu)
+            await db.flush()
+            for c in range(10):
+                category = MenuCategory(menu_id=menu.id, name=f"{menu_name} {c}")
+                db.add(category)
+                await db.flush()
+                for s in range(10):
+                    subcategory = MenuSubCategory(
+                        category_id=category.id,
+                        name=f"{menu_name} {c}.{s}",
+                        is_alcoholic=menu_name == "Drinks",
+                    )
+                    db.add(subcategory)
+                    await db.flush()
+                    subcategories.append((subcategory.id, menu_name == "Drinks"))
+        await db.commit()
+        ids = {"venue": venue.id}
+
+        for offset in range(0, items, BATCH):
+            rows = []
+            for i in range(offset, min(offset + BATCH, items)):
+                subcategory_id, drink = subcategories[i % len(subcategories)]
+                rows.append(synthetic_item(subcategory_id, i, drink))
+            await db.execute(insert(MenuItem), rows)
+            await db.commit()
+        for table in ("menu", "menu_category", "menu_subcategory", "menu_item"):
+            await db.execute(text(f"ANALYZE {table}"))
+        await db.commit()
+        return ids
+
+
+async def delete_venue(ids: dict[str, Any]) -> None:
+    async with get_async_session_maker()() as db:
+        menus = MenuCategory.menu_id.in_(
+            select(Menu.id).where(Menu.venue_id == ids["venue"])
+        )
+        categories = select(MenuCategory.id).where(menus)
+        subcategories = select(MenuSubCategory.id).where(
+            MenuSubCategory.category_id.in_(categories)
+        )
+        await db.execute(
+            delete(MenuItem).where(MenuItem.subcategory_id.in_(subcategories))
+        )
+        await db.execute(
+            delete(MenuSubCategory).where(MenuSubCategory.category_id.in_(categories))
+        )
+        await db.execute(delete(MenuCategory).where(menus))
+        await db.execute(delete(Menu).where(Menu.venue_id == ids["venue"]))
+        await db.execute(delete(Venue).where(Venue.id == ids["venue"]))
+        await db.commit()
+
+
+def synthetic_search() -> tuple[str, dict[str, Any]]:
+    kind = random.choice(
+        ["word", "phrase", "ingredient", "typo", "text+ranges", "ranges"]
+    )
+    if kind == "word":
+        return kind, {"text": random.choice(WORDS)}
+    if kind == "phrase":
+        return kind, {"text": random.choice(PHRASES)}
+    if kind == "ingredient":
+        return kind, {"text": random.choice(INGREDIENTS)}
+    if kind == "typo":
+        return kind, {"text": random.choice(list(TYPOS))}
+    low = float(random.randrange(100, 800, 50))
+    ranges = {"min_price": low, "max_price": low + 300, "min_abv": 5.0}
+    if kind == "text+ranges":
+        return kind, {"text": random.choice(["ipa", "stout", "saison"]), **ranges}
+    return kind, {**ranges, "min_ibu": 20, "max_ibu": 60}
+
+
+def check(kind: str, search: dict[str, Any], results: list[Any]) -> list[str]:
+    failures = []
+    if kind == "typo" and not any(
+        TYPOS[search["text"]] in result.item.name for result in results[:5]
+    ):
+        failures.append(f"{search['text']!r} did not find {TYPOS[search['text']]!r}")
+    for result in results:
+        item = result.item
+        if not (
+            search.get("min_price", 0) <= item.price <= search.get("max_price", 1e9)
+            and (item.abv or 0) >= search.get("min_abv", 0)
+            and search.get("min_ibu", 0)
+            <= (item.ibu or 0)
+            <= search.get("max_ibu", 1e9)
+        ):
+            failures.append(f"{item.name!r} is outside the ranges of {search}")
+            break
+    return failures
+
+
+def percentiles(samples: list[float]) -> str:
+    cuts = statistics.quantiles(samples, n=100)
+    return f"p50={cuts[49]:.1f}ms p95={cuts[94]:.1f}ms p99={cuts[98]:.1f}ms"
+
+
+async def run(items: int, queries: int, target_ms: float) -> int:
+    start = time.perf_counter()
+    ids = await create_venue(items)
+    print(f"created items={items} elapsed={time.perf_counter() - start:.1f}s")
+    failures: list[str] = []
+    latencies: dict[str, list[float]] = defaultdict(list)
+    try:
+        # Warm the connection pool and the indexes
+        for _ in range(20):
+            _, search = synthetic_search()
+            async with get_async_session_maker()() as db:
+                await search_venue_menu(db, ids["venue"], **search)
+
+        for _ in range(queries):
+            kind, search = synthetic_search()
+            start = time.perf_counter()
+            async with get_async_session_maker()() as db:
+                results = await search_venue_menu(db, ids["venue"], **search)
+            latencies[kind].append((time.perf_counter() - start) * 1000)
+            failures.extend(check(kind, search, results))
+    finally:
+        await delete_venue(ids)
+
+    for kind, samples in sorted(latencies.items()):
+        if len(samples) > 1:
+            print(f"{kind:<12} searches={len(samples)} {percentiles(samples)}")
+    overall = [sample for samples in latencies.values() for sample in samples]
+    print(f"{'overall':<12} searches={len(overall)} {percentiles(overall)}")
+    p95 = statistics.quantiles(overall, n=100)[94]
+    if p95 > target_ms:
+        failures.append(f"p95 of {p95:.1f}ms is over the {target_ms:.0f}ms target")
+
+    for failure in sorted(set(failures)):
+        print(failure, file=sys.stderr)
+    return 1 if failures else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--items", type=int, default=50_000, help="items on the venue's menus"
+    )
+    parser.add_argument("--queries", type=int, default=1000, help="searches to run")
+    parser.add_argument(
+        "--target-ms", type=float, default=20.0, help="maximum p95 latency"
+    )
+    args = parser.parse_args()
+    return asyncio.run(run(args.items, args.queries, args.target_ms))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
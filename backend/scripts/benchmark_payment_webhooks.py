@@ -0,0 +1,207 @@
+"""
+Fire a burst of signed payment webhooks at the API and time their ingestion
+and application, then check the retry scheduler against the stand-in gateway.
+
+Creates pending payments, delivers one webhook per payment plus repeated
+deliveries of some, runs the webhook worker until the queue is empty and
+checks that every payment is paid exactly once. Then leaves a second set of
+payments without webhooks and checks that polling the stand-in gateway
+settles them. Everything created is deleted afterwards.
+
+Without --api-url the webhooks go to the app in-process, which measures the
+endpoint without the network. Needs the database from the environment's
+settings and PAYMENT_WEBHOOK_SECRET. Usage, from the backend directory:
+
+    python scripts/benchmark_payment_webhooks.py --webhooks 5000 --concurrency 100
+
+Exits with status 1 if any check fails.
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+from datetime import timedelta
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import delete, func, insert, select  # noqa: E402
+from stand_in_gateway import StandInGateway  # noqa: E402
+
+from app.constants import PaymentSource, PaymentStatus  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.db import get_async_session_maker  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.base_model import utcnow  # noqa: E402
+from app.models.payment import PaymentOrderRestaurant  # noqa: E402
+from app.models.payment_webhook_event import PaymentWebhookEvent  # noqa: E402
+from app.models.user import UserPublic  # noqa: E402
+from app.schema.payment import PaymentWebhook  # noqa: E402
+from app.services.payment import (  # noqa: E402
+    PaymentGatewayClient,
+    backoff_seconds,
+    process_webhook_events,
+    retry_pending_payments_of,
+)
+
+WEBHOOK_PATH = f"{settings.API_V1_STR}/payments/webhook"
+
+
+async def create_payments(
+    user_id: uuid.UUID, count: int, age: timedelta
+) -> list[uuid.UUID]:
+    """
+    ``count`` pending payments made ``age`` ago; returns their transaction IDs.
+    """
+    transaction_ids = [uuid.uuid4() for _ in range(count)]
+    payment_time = utcnow() - age
+    async with get_async_session_maker()() as db:
+        await db.execute(
+            insert(PaymentOrderRestaurant),
+            [
+                PaymentOrderRestaurant(
+                    user_id=user_id,
+                    source_type=PaymentSource.RESTAURANT.value,
+                    gateway_transaction_id=transaction_id,
+                    payment_time=payment_time,
+                    amount=100,
+                    status=PaymentStatus.PENDING.value,
+                ).model_dump()
+                for transaction_id in transaction_ids
+            ],
+        )
+        await db.commit()
+    return transaction_ids
+
+
+async def count_status(transaction_ids: list[uuid.UUID], status: PaymentStatus) -> int:
+    async with get_async_session_maker()() as db:
+        return (
+            await db.execute(
+                select(func.count()).where(
+                    PaymentOrderRestaurant.gateway_transaction_id.in_(transaction_ids),
+                    PaymentOrderRestaurant.status == status.value,
+                )
+            )
+        ).scalar_one()
+
+
+async def ingest(
+    api_url: str | None, webhooks: list[PaymentWebhook], concurrency: int
+) -> tuple[float, list[int]]:
+    transport = httpx.ASGITransport(app=app) if api_url is None else None
+    semaphore = asyncio.Semaphore(concurrency)
+    async with httpx.AsyncClient(
+        base_url=api_url or "http://api", transport=transport, timeout=30
+    ) as client:
+
+        async def deliver(webhook: PaymentWebhook) -> int:
+            async with semaphore:
+                response = await StandInGateway.deliver(
+                    client, WEBHOOK_PATH, webhook, settings.PAYMENT_WEBHOOK_SECRET or ""
+                )
+                return response.status_code
+
+        start = time.perf_counter()
+        codes = await asyncio.gather(*(deliver(webhook) for webhook in webhooks))
+        return time.perf_counter() - start, list(codes)
+
+
+async def run(count: int, concurrency: int, api_url: str | None) -> int:
+    if settings.PAYMENT_WEBHOOK_SECRET is None:
+        print("PAYMENT_WEBHOOK_SECRET must be set", file=sys.stderr)
+        return 1
+    async with get_async_session_maker()() as db:
+        user = UserPublic(phone_number=f"bench-{uuid.uuid4().hex[:12]}")
+        db.add(user)
+        await db.commit()
+    transaction_ids = await create_payments(user.id, count, timedelta(0))
+    # Due for a gateway poll straight away
+    unsettled_ids = await create_payments(
+        user.id, 100, timedelta(seconds=backoff_seconds(0) + 1)
+    )
+    failures = []
+    try:
+        webhooks = [
+            PaymentWebhook(
+                event_id=f"bench-{transaction_id}",
+                source_type=PaymentSource.RESTAURANT,
+                transaction_id=transaction_id,
+                status=PaymentStatus.PAID,
+            )
+            for transaction_id in transaction_ids
+        ]
+        # Gateways deliver at least once; repeat a tenth of the events
+        webhooks += webhooks[: count // 10]
+        elapsed, codes = await ingest(api_url, webhooks, concurrency)
+        print(
+            f"ingest webhooks={len(webhooks)} concurrency={concurrency} "
+            f"elapsed={elapsed:.2f}s rate={len(webhooks) / elapsed:.0f}/s"
+        )
+        if any(code != 202 for code in codes):
+            failures.append(f"non-202 answers: {sorted(set(codes))}")
+
+        start = time.perf_counter()
+        processed = await process_webhook_events()
+        elapsed = time.perf_counter() - start
+        paid = await count_status(transaction_ids, PaymentStatus.PAID)
+        print(
+            f"apply webhooks={processed} elapsed={elapsed:.2f}s "
+            f"rate={processed / elapsed:.0f}/s paid={paid}"
+        )
+        if processed != count:
+            failures.append(f"worker processed {processed} webhooks, expected {count}")
+        if paid != count:
+            failures.append(f"{paid} of {count} payments paid")
+
+        gateway = StandInGateway(PaymentStatus.PAID)
+        client = PaymentGatewayClient(
+            "http://gateway", 10, transport=httpx.ASGITransport(app=gateway.app())
+        )
+        async with get_async_session_maker()() as db:
+            polled = await retry_pending_payments_of(
+                db, client, PaymentSource.RESTAURANT
+            )
+        settled = await count_status(unsettled_ids, PaymentStatus.PAID)
+        print(f"retry polled={polled} gateway_polls={gateway.polls} settled={settled}")
+        if settled != len(unsettled_ids):
+            failures.append(
+                f"{settled} of {len(unsettled_ids)} unsettled payments paid"
+            )
+    finally:
+        async with get_async_session_maker()() as db:
+            await db.execute(
+                delete(PaymentWebhookEvent).where(
+                    PaymentWebhookEvent.gateway_transaction_id.in_(transaction_ids)
+                )
+            )
+            await db.execute(
+                delete(PaymentOrderRestaurant).where(
+                    PaymentOrderRestaurant.user_id == user.id
+                )
+            )
+            await db.execute(delete(UserPublic).where(UserPublic.id == user.id))
+            await db.commit()
+
+    for failure in failures:
+        print(failure, file=sys.stderr)
+    return 1 if failures else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--webhooks", type=int, default=5000, help="payments to settle")
+    parser.add_argument(
+        "--concurrency", type=int, default=100, help="webhooks in flight at once"
+    )
+    parser.add_argument("--api-url", help="base URL of a running API")
+    args = parser.parse_args()
+    return asyncio.run(run(args.webhooks, args.concurrency, args.api_url))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
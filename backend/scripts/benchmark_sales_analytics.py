@@ -0,0 +1,306 @@
+"""
+Compare venue sales reports read from the rollups with the same figures
+computed from the raw orders, on millions of synthetic orders.
+
+Places the orders at one synthetic restaurant over the last --days days and
+times, in turn: the raw hourly aggregation over the orders, the first
+rollup of every order, the hourly and daily reports from the rollups, and
+an incremental rollup of a few new orders. The reports must agree with the
+raw totals. Everything created, the rollup watermark included, is deleted
+afterwards.
+
+The rollup job rolls up every order in the database, so run this against a
+scratch database whose rollups have never been refreshed. Usage, from the
+backend directory:
+
+    python scripts/benchmark_sales_analytics.py --orders 2000000 --days 90
+
+Exits with status 1 if any check fails.
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+import uuid
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import delete, func, insert, select  # noqa: E402
+
+from app.constants import RollupGranularity  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.db import get_async_session_maker  # noqa: E402
+from app.models.base_model import utcnow  # noqa: E402
+from app.models.menu import Menu, MenuCategory, MenuItem, MenuSubCategory  # noqa: E402
+from app.models.order import RestaurantOrder  # noqa: E402
+from app.models.order_item import OrderItem  # noqa: E402
+from app.models.sales_rollup import (  # noqa: E402
+    MenuItemSalesRollup,
+    SalesRollupWatermark,
+    VenueSalesRollup,
+)
+from app.models.user import UserPublic  # noqa: E402
+from app.models.venue import Restaurant, Venue  # noqa: E402
+from app.services.analytics import (  # noqa: E402
+    WATERMARK,
+    refresh_sales_rollups,
+    sales_report,
+)
+from app.services.order import to_amount  # noqa: E402
+
+BATCH = 10_000
+
+
+async def create_restaurant(items: int) -> dict[str, Any]:
+    async with get_async_session_maker()() as db:
+        user = UserPublic(phone_number=f"bench-{uuid.uuid4().hex[:12]}")
+        venue = Venue(name="Benchmark restaurant", latitude=0, longitude=0)
+        db.add_all([user, venue])
+        await db.flush()
+        restaurant = Restaurant(venue_id=venue.id)
+        menu = Menu(venue_id=venue.id, name="Benchmark menu")
+        db.add_all([restaurant, menu])
+        await db.flush()
+        category = MenuCategory(menu_id=menu.id, name="Benchmark")
+        db.add(category)
+        await db.flush()
+        subcategory = MenuSubCategory(category_id=category.id, name="Benchmark")
+        db.add(subcategory)
+        await db.flush()
+        menu_items = [
+            MenuItem(subcategory_id=subcategory.id, name=f"Item {i}", price=50 + 10 * i)
+            for i in range(items)
+        ]
+        db.add_all(menu_items)
+        await db.commit()
+        return {
+            "user": user.id,
+            "venue": venue.id,
+            "restaurant": restaurant.id,
+            "menu": menu.id,
+            "category": category.id,
+            "subcategory": subcategory.id,
+            "items": [(item.id, item.price) for item in menu_items],
+        }
+
+
+async def place_orders(
+    ids: dict[str, Any], count: int, order_time: Callable[[int], datetime]
+) -> tuple[int, Decimal]:
+    """
+    Insert ``count`` one-line orders, order ``i`` placed at ``order_time(i)``;
+    returns their number and revenue.
+    """
+    revenue = Decimal(0)
+    async with get_async_session_maker()() as db:
+        for offset in range(0, count, BATCH):
+            orders, lines = [], []
+            for i in range(offset, min(offset + BATCH, count)):
+                item_id, price = random.choice(ids["items"])
+                quantity = random.randint(1, 3)
+                order_id = uuid.uuid4()
+                orders.append(
+                    {
+                        "id": order_id,
+                        "user_id": ids["user"],
+                        "venue_id": ids["restaurant"],
+                        "order_time": order_time(i),
+                        "total_amount": price * quantity,
+                        "status": "placed",
+                    }
+                )
+                lines.append(
+                    {
+                        "id": uuid.uuid4(),
+                        "restaurant_order_id": order_id,
+                        "item_id": item_id,
+                        "quantity": quantity,
+                        "unit_price": price,
+                    }
+                )
+                revenue += to_amount(price * quantity)
+            await db.execute(insert(RestaurantOrder), orders)
+            await db.execute(insert(OrderItem), lines)
+            await db.commit()
+    return count, revenue
+
+
+async def raw_hourly(ids: dict[str, Any], days: int) -> tuple[float, int, Decimal]:
+    """
+    The hourly report computed from the orders, as it would be without
+    rollups: elapsed time, order count and revenue.
+    """
+    bucket = func.date_trunc("hour", RestaurantOrder.order_time)
+    start = time.perf_counter()
+    async with get_async_session_maker()() as db:
+        rows = (
+            await db.execute(
+                select(bucket, func.count(), func.sum(RestaurantOrder.total_amount))
+                .join(Restaurant, Restaurant.id == RestaurantOrder.venue_id)
+                .where(
+                    Restaurant.venue_id == ids["venue"],
+                    RestaurantOrder.order_time >= utcnow() - timedelta(days=days),
+                )
+                .group_by(bucket)
+            )
+        ).all()
+    elapsed = time.perf_counter() - start
+    return (
+        elapsed,
+        sum(count for _, count, _ in rows),
+        sum((to_amount(revenue) for _, _, revenue in rows), Decimal(0)),
+    )
+
+
+async def delete_restaurant(ids: dict[str, Any]) -> None:
+    async with get_async_session_maker()() as db:
+        orders = select(RestaurantOrder.id).where(
+            RestaurantOrder.venue_id == ids["restaurant"]
+        )
+        await db.execute(
+            delete(OrderItem).where(OrderItem.restaurant_order_id.in_(orders))
+        )
+        await db.execute(
+            delete(RestaurantOrder).where(RestaurantOrder.venue_id == ids["restaurant"])
+        )
+        for model in (VenueSalesRollup, MenuItemSalesRollup):
+            await db.execute(delete(model).where(model.venue_id == ids["venue"]))
+        await db.execute(delete(SalesRollupWatermark))
+        await db.execute(
+            delete(MenuItem).where(MenuItem.subcategory_id == ids["subcategory"])
+        )
+        await db.execute(
+            delete(MenuSubCategory).where(MenuSubCategory.id == ids["subcategory"])
+        )
+        await db.execute(delete(MenuCategory).where(MenuCategory.id == ids["category"]))
+        await db.execute(delete(Menu).where(Menu.id == ids["menu"]))
+        await db.execute(delete(Restaurant).where(Restaurant.id == ids["restaurant"]))
+        await db.execute(delete(Venue).where(Venue.id == ids["venue"]))
+        await db.execute(delete(UserPublic).where(UserPublic.id == ids["user"]))
+        await db.commit()
+
+
+async def run(orders: int, days: int, items: int) -> int:
+    async with get_async_session_maker()() as db:
+        if await db.get(SalesRollupWatermark, WATERMARK) is not None:
+            print(
+                "The sales rollups have been refreshed in this database; "
+                "run against a scratch database",
+                file=sys.stderr,
+            )
+            return 1
+    ids = await create_restaurant(items)
+    failures = []
+    try:
+        # Within the reported range, and old enough for the first rollup to
+        # take every order
+        oldest = utcnow() - timedelta(days=days) + timedelta(minutes=1)
+        newest = utcnow() - timedelta(
+            seconds=settings.ANALYTICS_ROLLUP_LAG_SECONDS + 60
+        )
+        span = (newest - oldest).total_seconds()
+        start = time.perf_counter()
+        count, revenue = await place_orders(
+            ids, orders, lambda _: oldest + timedelta(seconds=random.uniform(0, span))
+        )
+        print(f"placed orders={count} elapsed={time.perf_counter() - start:.1f}s")
+
+        raw_elapsed, raw_count, raw_revenue = await raw_hourly(ids, days)
+        print(f"raw hourly aggregation elapsed={raw_elapsed * 1000:.0f}ms")
+
+        start = time.perf_counter()
+        async with get_async_session_maker()() as db:
+            watermark = await refresh_sales_rollups(db)
+        print(f"first rollup elapsed={time.perf_counter() - start:.1f}s")
+
+        for granularity, span_days in (
+            (RollupGranularity.HOUR, min(days, 30)),
+            (RollupGranularity.DAY, days),
+        ):
+            end = utcnow()
+            start = time.perf_counter()
+            async with get_async_session_maker()() as db:
+                report = await sales_report(
+                    db,
+                    ids["venue"],
+                    granularity,
+                    end - timedelta(days=span_days),
+                    end,
+                    10,
+                )
+            elapsed = time.perf_counter() - start
+            print(
+                f"{granularity.value} report buckets={len(report.buckets)} "
+                f"elapsed={elapsed * 1000:.1f}ms orders={report.order_count} "
+                f"revenue={report.revenue} average_ticket={report.average_ticket}"
+            )
+            if granularity is RollupGranularity.DAY and (
+                report.order_count != count or report.revenue != revenue
+            ):
+                failures.append(
+                    f"daily report has {report.order_count} orders and "
+                    f"{report.revenue} revenue, expected {count} and {revenue}"
+                )
+        if raw_count != count or raw_revenue != revenue:
+            failures.append(f"raw aggregation found {raw_count} orders, {raw_revenue}")
+
+        # New orders just after the watermark, rolled up on the next refresh
+        assert watermark is not None
+        new_count, new_revenue = await place_orders(
+            ids, 1000, lambda i: watermark + timedelta(microseconds=i + 1)
+        )
+        start = time.perf_counter()
+        async with get_async_session_maker()() as db:
+            await refresh_sales_rollups(db)
+        print(
+            f"incremental rollup orders={new_count} "
+            f"elapsed={(time.perf_counter() - start) * 1000:.0f}ms"
+        )
+        async with get_async_session_maker()() as db:
+            end = utcnow()
+            report = await sales_report(
+                db,
+                ids["venue"],
+                RollupGranularity.DAY,
+                end - timedelta(days=days),
+                end,
+                10,
+            )
+        if report.order_count != count + new_count:
+            failures.append(
+                f"after the incremental rollup the report has {report.order_count} "
+                f"orders, expected {count + new_count}"
+            )
+        if report.revenue != revenue + new_revenue:
+            failures.append(
+                f"after the incremental rollup the report has {report.revenue} "
+                f"revenue, expected {revenue + new_revenue}"
+            )
+    finally:
+        await delete_restaurant(ids)
+
+    for failure in failures:
+        print(failure, file=sys.stderr)
+    return 1 if failures else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--orders", type=int, default=1_000_000, help="synthetic orders to place"
+    )
+    parser.add_argument("--days", type=int, default=90, help="days the orders span")
+    parser.add_argument("--items", type=int, default=50, help="items on the menu")
+    args = parser.parse_args()
+    return asyncio.run(run(args.orders, args.days, args.items))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+"""
+Measure cold-start time: how long a fresh interpreter takes to import app.main.
+
+Each sample runs in its own subprocess so nothing is cached between runs.
+Importing the app must not need a database, so this runs without one.
+
+Usage, from the backend directory:
+
+    python scripts/benchmark_startup.py --runs 10 --budget 1.5
+
+Exits with status 1 when the median import time exceeds the budget.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+MEASURE = (
+    "import time; start = time.perf_counter(); import app.main; "
+    "print(time.perf_counter() - start)"
+)
+
+
+def measure_import_seconds() -> float:
+    result = subprocess.run(
+        [sys.executable, "-c", MEASURE],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        sys.exit(f"importing app.main failed:\n{result.stderr}")
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="number of samples")
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=2.0,
+        help="maximum median import time in seconds",
+    )
+    args = parser.parse_args()
+
+    # The first run warms the bytecode cache and the OS page cache
+    measure_import_seconds()
+    samples = [measure_import_seconds() for _ in range(args.runs)]
+    median = statistics.median(samples)
+
+    print(
+        f"import app.main: median={median:.3f}s min={min(samples):.3f}s "
+        f"max={max(samples):.3f}s runs={args.runs} budget={args.budget:.3f}s"
+    )
+    if median > args.budget:
+        print("cold start is over budget", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
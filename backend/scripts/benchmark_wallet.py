@@ -0,0 +1,140 @@
+"""
+Fire many simultaneous debits at one group wallet and check that none is
+lost and the wallet is never overdrawn.
+
+The wallet is topped up with less than the debits ask for in total, so some
+debits must be refused. Afterwards the balance must equal the top-up minus
+the accepted debits and the wallet's ledger total. The wallet, its group
+and user are created for the run and deleted afterwards.
+
+Needs the database from the environment's settings. Usage, from the
+backend directory:
+
+    python scripts/benchmark_wallet.py --debits 2000 --concurrency 50
+
+Exits with status 1 if any check fails.
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import delete  # noqa: E402
+
+from app.core.db import get_async_session_maker  # noqa: E402
+from app.models.group import Group  # noqa: E402
+from app.models.group_wallet import GroupWallet  # noqa: E402
+from app.models.group_wallet_ledger import GroupWalletLedgerEntry  # noqa: E402
+from app.models.user import UserPublic  # noqa: E402
+from app.services.wallet import (  # noqa: E402
+    InsufficientFundsError,
+    debit,
+    find_wallet_discrepancies,
+    top_up,
+)
+
+
+async def create_wallet() -> tuple[uuid.UUID, uuid.UUID, uuid.UUID]:
+    async with get_async_session_maker()() as db:
+        user = UserPublic(phone_number=f"bench-{uuid.uuid4().hex[:12]}")
+        db.add(user)
+        await db.flush()
+        group = Group(admin_user_id=user.id)
+        db.add(group)
+        await db.flush()
+        wallet = GroupWallet(group_id=group.id)
+        db.add(wallet)
+        await db.commit()
+        return user.id, group.id, wallet.id
+
+
+async def delete_wallet(
+    user_id: uuid.UUID, group_id: uuid.UUID, wallet_id: uuid.UUID
+) -> None:
+    async with get_async_session_maker()() as db:
+        await db.execute(
+            delete(GroupWalletLedgerEntry).where(
+                GroupWalletLedgerEntry.group_wallet_id == wallet_id
+            )
+        )
+        await db.execute(delete(GroupWallet).where(GroupWallet.id == wallet_id))
+        await db.execute(delete(Group).where(Group.id == group_id))
+        await db.execute(delete(UserPublic).where(UserPublic.id == user_id))
+        await db.commit()
+
+
+async def run(debits: int, concurrency: int, amount: Decimal) -> int:
+    user_id, group_id, wallet_id = await create_wallet()
+    try:
+        # Enough for only three quarters of the debits
+        funded = amount * (debits * 3 // 4)
+        async with get_async_session_maker()() as db:
+            await top_up(db, wallet_id, funded)
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one_debit() -> bool:
+            async with semaphore, get_async_session_maker()() as db:
+                try:
+                    await debit(db, wallet_id, amount)
+                except InsufficientFundsError:
+                    return False
+                return True
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*(one_debit() for _ in range(debits)))
+        elapsed = time.perf_counter() - start
+
+        accepted = sum(results)
+        async with get_async_session_maker()() as db:
+            wallet = await db.get(GroupWallet, wallet_id)
+            assert wallet is not None
+            balance = Decimal(wallet.balance)
+            discrepancies = [
+                discrepancy
+                for discrepancy in await find_wallet_discrepancies(db)
+                if discrepancy.wallet_id == wallet_id
+            ]
+
+        print(
+            f"debits={debits} concurrency={concurrency} accepted={accepted} "
+            f"refused={debits - accepted} elapsed={elapsed:.2f}s "
+            f"rate={debits / elapsed:.0f}/s balance={balance}"
+        )
+        failures = []
+        if balance < 0:
+            failures.append(f"wallet overdrawn: {balance}")
+        if balance != funded - amount * accepted:
+            failures.append(
+                f"lost update: balance {balance} != {funded} - {accepted} x {amount}"
+            )
+        if accepted != debits * 3 // 4:
+            failures.append(f"expected {debits * 3 // 4} debits to be accepted")
+        if discrepancies:
+            failures.append(f"balance does not match ledger: {discrepancies}")
+        for failure in failures:
+            print(failure, file=sys.stderr)
+        return 1 if failures else 0
+    finally:
+        await delete_wallet(user_id, group_id, wallet_id)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--debits", type=int, default=1000, help="number of debits")
+    parser.add_argument(
+        "--concurrency", type=int, default=50, help="debits in flight at once"
+    )
+    parser.add_argument("--amount", type=Decimal, default=Decimal("12.50"))
+    args = parser.parse_args()
+    return asyncio.run(run(args.debits, args.concurrency, args.amount))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""
+A stand-in for the payment gateway, for local development and benchmarks.
+
+It answers the transaction status polls of the payment retry scheduler and
+delivers webhooks signed the way the gateway signs them. Run it with:
+
+    python scripts/stand_in_gateway.py --port 8100 --status paid
+
+and set PAYMENT_GATEWAY_URL=http://localhost:8100 for the API.
+"""
+
+import argparse
+import sys
+import uuid
+from pathlib import Path
+
+import httpx
+from fastapi import FastAPI, HTTPException
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.constants import PaymentStatus  # noqa: E402
+from app.schema.payment import PaymentWebhook  # noqa: E402
+from app.services.payment import sign_webhook  # noqa: E402
+
+
+class StandInGateway:
+    """
+    Reports ``statuses`` for known transactions and ``default_status`` for
+    any other, or 404 without a default.
+    """
+
+    def __init__(self, default_status: PaymentStatus | None = None) -> None:
+        self.default_status = default_status
+        self.statuses: dict[uuid.UUID, PaymentStatus] = {}
+        self.polls = 0
+
+    def app(self) -> FastAPI:
+        app = FastAPI(title="Stand-in payment gateway")
+
+        @app.get("/transactions/{transaction_id}")
+        async def transaction_status(transaction_id: uuid.UUID) -> dict[str, str]:
+            self.polls += 1
+            status = self.statuses.get(transaction_id, self.default_status)
+            if status is None:
+                raise HTTPException(status_code=404, detail="Unknown transaction")
+            return {"id": str(transaction_id), "status": status.value}
+
+        return app
+
+    @staticmethod
+    async def deliver(
+        client: httpx.AsyncClient, url: str, webhook: PaymentWebhook, secret: str
+    ) -> httpx.Response:
+        """
+        POST ``webhook`` to ``url`` with the gateway's signature.
+        """
+        body = webhook.model_dump_json().encode()
+        return await client.post(
+            url,
+            content=body,
+            headers={
+                "Content-Type": "application/json",
+                "X-Signature": sign_webhook(body, secret),
+            },
+        )
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument(
+        "--status",
+        type=PaymentStatus,
+        default=PaymentStatus.PAID,
+        help="status reported for every transaction",
+    )
+    args = parser.parse_args()
+    uvicorn.run(StandInGateway(args.status).app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()